@@ -0,0 +1,103 @@
+# app/core/admission.py
+
+"""
+Admission control for expensive endpoints.
+
+An AdmissionController caps concurrent work per worker. Requests beyond
+the cap wait in a short queue; when the queue is full, or the wait times
+out, they are rejected with 429 + Retry-After instead of piling up CPU
+work and pooled DB connections.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout_seconds: float,
+        retry_after_seconds: int,
+    ) -> None:
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+
+        self._semaphore: asyncio.Semaphore | None = None
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    def _reject(self) -> HTTPException:
+        self.rejected += 1
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent requests, retry shortly",
+            headers={"Retry-After": str(self.retry_after_seconds)},
+        )
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold one admission slot for the duration of the block.
+        Raises 429 if no slot frees up in time.
+        """
+        semaphore = self._get_semaphore()
+
+        if semaphore.locked():
+            if self.waiting >= self.max_queue:
+                raise self._reject()
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), self.queue_timeout_seconds)
+            except asyncio.TimeoutError:
+                raise self._reject()
+            finally:
+                self.waiting -= 1
+        else:
+            await semaphore.acquire()
+
+        self.in_flight += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+login_admission = AdmissionController(
+    name="login",
+    max_in_flight=settings.LOGIN_MAX_IN_FLIGHT,
+    max_queue=settings.LOGIN_MAX_QUEUE,
+    queue_timeout_seconds=settings.LOGIN_QUEUE_TIMEOUT_SECONDS,
+    retry_after_seconds=settings.LOGIN_RETRY_AFTER_SECONDS,
+)
@@ -1,7 +1,7 @@
-import httpx
 from jose import jwt
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.jwks import jwks_store
 
 
 class TokenVerifier:
@@ -41,32 +41,15 @@ class TokenVerifier:
         """
         Verifies RS256 tokens from Auth0/Okta/Keycloak using JWKS.
         """
-        jwks_url = f"https://{settings.AUTH_DOMAIN}/.well-known/jwks.json"
-
         try:
-            # 1. Fetch JWKS (Public Keys)
-            # Optimization: In prod, cache this response!
-            async with httpx.AsyncClient() as client:
-                response = await client.get(jwks_url)
-                jwks = response.json()
-
-            # 2. Get Key ID (kid) from Header
+            # 1. Resolve the signing key by kid (cached, see app/core/jwks.py)
             unverified_header = jwt.get_unverified_header(token)
-            rsa_key = {}
-            for key in jwks["keys"]:
-                if key["kid"] == unverified_header["kid"]:
-                    rsa_key = {
-                        "kty": key["kty"],
-                        "kid": key["kid"],
-                        "use": key["use"],
-                        "n": key["n"],
-                        "e": key["e"]
-                    }
+            rsa_key = await jwks_store.get_key(unverified_header.get("kid"))
 
-            if not rsa_key:
+            if rsa_key is None:
                 raise Exception("Public key not found for token")
 
-            # 3. Verify Signature
+            # 2. Verify Signature
             payload = jwt.decode(
                 token,
                 rsa_key,
@@ -75,7 +58,7 @@ class TokenVerifier:
                 issuer=f"https://{settings.AUTH_DOMAIN}/"
             )
 
-            # 4. Map External Claims to Internal Context
+            # 3. Map External Claims to Internal Context
             # Auth0 stores user_id in 'sub', but Tenant ID usually in a custom claim
             # e.g. "https://qlaws.com/tid"
 
@@ -13,6 +13,8 @@ class Cache:
     - connect() / close() manage the client lifecycle.
     - ping() used by /health and startup checks.
     - get / set / delete for general caching.
+    - set_if_absent for seeding values other writers may race on.
+    - incr / ttl for expiring counters (rate limits, lockouts).
     """
 
     def __init__(self) -> None:
@@ -53,10 +55,44 @@ class Cache:
             await self.connect()
         await self.redis.set(key, value, ex=ttl)
 
+    async def set_if_absent(self, key: str, value: str, ttl: int = 3600) -> bool:
+        """
+        SET NX: store `value` only if `key` does not exist. True if stored.
+        """
+        if self.redis is None:
+            await self.connect()
+        return bool(await self.redis.set(key, value, ex=ttl, nx=True))
+
     async def delete(self, key: str) -> None:
         if self.redis is None:
             await self.connect()
         await self.redis.delete(key)
 
+    async def exists(self, key: str) -> bool:
+        if self.redis is None:
+            await self.connect()
+        return bool(await self.redis.exists(key))
+
+    async def incr(self, key: str, ttl: int) -> int:
+        """
+        Increment a counter and (re)set its expiry in one round trip.
+        """
+        if self.redis is None:
+            await self.connect()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, ttl)
+            count, _ = await pipe.execute()
+        return int(count)
+
+    async def ttl(self, key: str) -> int:
+        """
+        Remaining lifetime in seconds; negative if the key is missing
+        or has no expiry.
+        """
+        if self.redis is None:
+            await self.connect()
+        return int(await self.redis.ttl(key))
+
 
 cache = Cache()
@@ -2,7 +2,7 @@
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import computed_field
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -23,6 +23,92 @@ class Settings(BaseSettings):
     DATABASE_PASSWORD: str = "postgres"
     DATABASE_NAME: str = "qlaws"
 
+    # asyncpg pool (per worker). Checkouts that wait longer than
+    # DB_POOL_ACQUIRE_TIMEOUT_SECONDS fail with 503. Connections are
+    # recycled after DB_POOL_MAX_QUERIES queries or when idle for
+    # DB_POOL_MAX_INACTIVE_SECONDS.
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_ACQUIRE_TIMEOUT_SECONDS: float = 5.0
+    DB_POOL_MAX_QUERIES: int = 50000
+    DB_POOL_MAX_INACTIVE_SECONDS: float = 300.0
+
+    # Registered statements (app.core.statements) prepared per connection at
+    # creation; ad-hoc SQL still uses asyncpg's own cache of
+    # DB_STATEMENT_CACHE_SIZE entries.
+    DB_PREPARED_STATEMENT_LIMIT: int = 256
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Query instrumentation: statements slower than SLOW_QUERY_MS are logged
+    # (params redacted). Requests running more than their route's budget of
+    # statements are flagged; QUERY_BUDGETS overrides per route, keyed
+    # "METHOD /path/template", e.g. {"GET /api/v1/users/": 5}. 0 disables.
+    SLOW_QUERY_MS: float = 200.0
+    QUERY_BUDGET_DEFAULT: int = 25
+    QUERY_BUDGETS: Dict[str, int] = {}
+
+    # Adaptive mode: the checkout limit starts at DB_POOL_MIN_SIZE and moves
+    # within [MIN, MAX] every DB_POOL_ADJUST_INTERVAL_SECONDS, growing while
+    # checkouts wait longer than DB_POOL_TARGET_WAIT_MS.
+    DB_POOL_ADAPTIVE: bool = False
+    DB_POOL_TARGET_WAIT_MS: float = 10.0
+    DB_POOL_ADJUST_INTERVAL_SECONDS: float = 10.0
+
+    # Read replicas: comma-separated postgresql:// DSNs (empty = primary only).
+    # Replicas lagging more than REPLICA_MAX_LAG_SECONDS behind the primary
+    # are skipped; lag is sampled every REPLICA_LAG_CHECK_INTERVAL_SECONDS.
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 1.0
+
+    # Streaming reads (Accept: application/x-ndjson): rows come from a
+    # server-side cursor STREAM_PREFETCH_ROWS per round trip and are flushed
+    # to the client every STREAM_CHUNK_ROWS rows.
+    STREAM_PREFETCH_ROWS: int = 1000
+    STREAM_CHUNK_ROWS: int = 500
+
+    # Audit write-behind (app.modules.audit.buffer): committed events are
+    # buffered in-process (at most AUDIT_BUFFER_MAX_EVENTS) and written on a
+    # dedicated connection in batches of AUDIT_BATCH_SIZE or every
+    # AUDIT_FLUSH_INTERVAL_SECONDS. When the buffer is full, producers wait up
+    # to AUDIT_ENQUEUE_TIMEOUT_SECONDS, then write their event directly.
+    # A batch that fails AUDIT_FLUSH_MAX_ATTEMPTS times is retried row by
+    # row and rows the database rejects are dead-lettered to the log.
+    # AUDIT_WRITE_BEHIND=False keeps the inline INSERT.
+    AUDIT_WRITE_BEHIND: bool = True
+    AUDIT_BUFFER_MAX_EVENTS: int = 50000
+    AUDIT_BATCH_SIZE: int = 1000
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 0.5
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = 1.0
+    AUDIT_FLUSH_MAX_ATTEMPTS: int = 3
+
+    # Audit partitions (app.modules.audit.partitions), when audit_logs is
+    # range-partitioned: keep AUDIT_PARTITION_PRECREATE future partitions of
+    # AUDIT_PARTITION_INTERVAL ("month" or "day"), move rows out of the
+    # default partition and drop partitions past retention. Checked every
+    # AUDIT_PARTITION_CHECK_INTERVAL_SECONDS by one instance at a time; DDL
+    # gives up after AUDIT_PARTITION_LOCK_TIMEOUT_MS rather than block traffic.
+    # Retention is per tenant plan, in days.
+    AUDIT_PARTITIONING: bool = True
+    AUDIT_PARTITION_INTERVAL: str = "month"
+    AUDIT_PARTITION_PRECREATE: int = 3
+    AUDIT_PARTITION_CHECK_INTERVAL_SECONDS: float = 3600.0
+    AUDIT_PARTITION_LOCK_TIMEOUT_MS: int = 5000
+    AUDIT_RETENTION_DAYS_BY_PLAN: Dict[str, int] = {
+        "free": 90,
+        "startup": 365,
+        "pro": 730,
+        "enterprise": 2555,
+    }
+
+    # Audit export (GET /audit/export): COPY output waits once this many
+    # compressed chunks are queued for a slow client.
+    AUDIT_EXPORT_QUEUE_CHUNKS: int = 16
+
+    # Audit rollups (GET /audit/rollups): default and maximum time range.
+    AUDIT_ROLLUP_DEFAULT_DAYS: int = 7
+    AUDIT_ROLLUP_MAX_RANGE_DAYS: int = 400
+
     # -------------------------------------------------
     # Redis / Cache
     # -------------------------------------------------
@@ -37,11 +123,56 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 10080  # (e.g., 7 days)
 
+    # In-process cache of verified JWT payloads (0 disables it)
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+
+    # Effective-permission cache (in-process LRU + Redis), invalidated by a
+    # per-tenant version counter on role changes.
+    PERMISSION_CACHE_LOCAL_SIZE: int = 10000
+    PERMISSION_CACHE_TTL_SECONDS: int = 300
+
+    # "local" (HS256, JWT_SECRET_KEY) or "external" (IdP-issued, JWKS)
+    AUTH_MODE: str = "local"
+
+    # External IdP (used only if AUTH_MODE="external")
+    AUTH_DOMAIN: Optional[str] = None
+    AUTH_AUDIENCE: Optional[str] = None
+    AUTH_ALGORITHM: str = "RS256"
+    AUTH_JWKS_URL: Optional[str] = None  # defaults to https://{AUTH_DOMAIN}/.well-known/jwks.json
+    JWKS_CACHE_TTL_SECONDS: int = 3600  # used when the IdP sends no Cache-Control max-age
+    JWKS_REFRESH_AHEAD_SECONDS: int = 300
+    JWKS_MIN_REFETCH_INTERVAL_SECONDS: int = 30  # unknown-kid refetch rate limit
+    JWKS_HTTP_TIMEOUT_SECONDS: float = 5.0
+
     # Optional “pepper” for password hashing (extra static secret)
     # You can override this in .env:
     #   PASSWORD_PEPPER=some-very-long-random-string
     PASSWORD_PEPPER: str = "CHANGE_ME_TO_A_RANDOM_LONG_STRING"
 
+    # bcrypt runs in a process pool off the event loop.
+    # PASSWORD_HASH_WORKERS=0 uses the loop's default thread executor instead;
+    # PASSWORD_HASH_MAX_CONCURRENCY=0 means 2 x workers.
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 0
+
+    # Login admission control (per worker): concurrent logins beyond
+    # LOGIN_MAX_IN_FLIGHT wait up to LOGIN_QUEUE_TIMEOUT_SECONDS in a queue of
+    # LOGIN_MAX_QUEUE; overflow gets 429 + Retry-After.
+    LOGIN_MAX_IN_FLIGHT: int = 8
+    LOGIN_MAX_QUEUE: int = 32
+    LOGIN_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    LOGIN_RETRY_AFTER_SECONDS: int = 1
+
+    # Brute-force lockout (Redis). After LOGIN_LOCKOUT_THRESHOLD failures for
+    # a (tenant, email) within LOGIN_FAILURE_WINDOW_SECONDS, each further
+    # failure locks it for BASE * 2^n seconds, capped at MAX. Same for an IP
+    # at LOGIN_IP_LOCKOUT_THRESHOLD.
+    LOGIN_FAILURE_WINDOW_SECONDS: int = 900
+    LOGIN_LOCKOUT_THRESHOLD: int = 5
+    LOGIN_IP_LOCKOUT_THRESHOLD: int = 50
+    LOGIN_LOCKOUT_BASE_SECONDS: int = 30
+    LOGIN_LOCKOUT_MAX_SECONDS: int = 900
+
     # -------------------------------------------------
     # Email Settings (adjust or override in .env)
     # -------------------------------------------------
@@ -1,9 +1,57 @@
 # app/core/database.py
 
 import asyncpg
-from typing import AsyncGenerator, Optional
+import functools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable, List, Optional, Union
+from uuid import UUID
 
 from app.core.config import settings
+from app.core.db_pool import PoolGovernor
+from app.core.query_log import call_site, instrumented, query_metrics
+from app.core.replicas import Replica, ReplicaSet
+from app.core.statements import statements
+
+
+# IMPORTANT: do not use "SET LOCAL app.current_tenant_id = $1" with a
+# parameter; Postgres can't parameterize that syntax. Use set_config().
+SET_TENANT_SQL = "SELECT set_config('app.current_tenant_id', $1, true)"
+
+
+def _begin_tenant_sql(tenant_id: str, read_only: bool = False) -> str:
+    """
+    BEGIN plus the tenant context as one simple-query message, so both cost
+    a single round trip. Only a canonical UUID is ever interpolated.
+    """
+    return (
+        ("BEGIN READ ONLY; " if read_only else "BEGIN; ")
+        + f"SELECT set_config('app.current_tenant_id', '{UUID(tenant_id)}', true)"
+    )
+
+
+# Set while a @read_only repository method runs
+_read_only: ContextVar[bool] = ContextVar("db_read_only", default=False)
+
+
+def read_only(method):
+    """
+    Mark a repository method as read-only: its queries may be served by a
+    read replica (same tenant context) when the request's connection has
+    not written anything yet and the replica has caught up with the
+    session's last write. Falls back to the primary otherwise.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = _read_only.set(True)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            _read_only.reset(token)
+
+    return wrapper
 
 
 class Database:
@@ -12,11 +60,45 @@ class Database:
 
     - connect() / disconnect() manage the pool lifecycle.
     - get_connection(tenant_id) yields a connection with RLS tenant context set.
+    - lazy_connection(tenant_id) provides a LazyTenantConnection that only
+      checks out a connection on its first query.
+    - acquire() checks out a plain connection (no tenant context).
     - ping() is used by /health and startup checks.
+    - stats() reports pool gauges and the acquire-wait histogram.
+    - replicas (DATABASE_REPLICA_URLS) serve @read_only repository methods.
+
+    Every checkout goes through a PoolGovernor, which measures wait time
+    and, with DB_POOL_ADAPTIVE, tunes the effective pool size.
     """
 
     def __init__(self) -> None:
         self.pool: Optional[asyncpg.Pool] = None
+        self.governor = PoolGovernor(
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            acquire_timeout_seconds=settings.DB_POOL_ACQUIRE_TIMEOUT_SECONDS,
+            adaptive=settings.DB_POOL_ADAPTIVE,
+            target_wait_seconds=settings.DB_POOL_TARGET_WAIT_MS / 1000,
+            adjust_interval_seconds=settings.DB_POOL_ADJUST_INTERVAL_SECONDS,
+        )
+        self.replicas = ReplicaSet(
+            dsns=[d.strip() for d in settings.DATABASE_REPLICA_URLS.split(",") if d.strip()],
+            max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+            check_interval_seconds=settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+            pool_options={
+                "min_size": settings.DB_POOL_MIN_SIZE,
+                "max_size": settings.DB_POOL_MAX_SIZE,
+                "max_queries": settings.DB_POOL_MAX_QUERIES,
+                "max_inactive_connection_lifetime": settings.DB_POOL_MAX_INACTIVE_SECONDS,
+                "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "init": statements.prepare_all,
+            },
+            governor_options={
+                "min_size": settings.DB_POOL_MIN_SIZE,
+                "max_size": settings.DB_POOL_MAX_SIZE,
+                "acquire_timeout_seconds": settings.DB_POOL_ACQUIRE_TIMEOUT_SECONDS,
+            },
+        )
 
     async def connect(self) -> None:
         if self.pool is not None:
@@ -28,11 +110,31 @@ class Database:
             user=settings.DATABASE_USER,
             password=settings.DATABASE_PASSWORD,
             database=settings.DATABASE_NAME,
-            min_size=2,
-            max_size=10,
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            max_queries=settings.DB_POOL_MAX_QUERIES,
+            max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_SECONDS,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+            init=statements.prepare_all,
+        )
+        await self.replicas.connect(self)
+
+    async def dedicated_connection(self) -> asyncpg.Connection:
+        """
+        A standalone connection outside the pool (and its governor), for
+        background writers that must not compete with requests.
+        """
+        return await asyncpg.connect(
+            host=settings.DATABASE_HOST,
+            port=settings.DATABASE_PORT,
+            user=settings.DATABASE_USER,
+            password=settings.DATABASE_PASSWORD,
+            database=settings.DATABASE_NAME,
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
         )
 
     async def disconnect(self) -> None:
+        await self.replicas.close()
         if self.pool is not None:
             await self.pool.close()
             self.pool = None
@@ -44,36 +146,342 @@ class Database:
         Returns True if the database responds to a simple query.
         """
         try:
-            if self.pool is None:
-                await self.connect()
-            async with self.pool.acquire() as conn:
+            async with self.acquire() as conn:
                 await conn.execute("SELECT 1")
             return True
         except Exception:
             return False
 
-    async def get_connection(self, tenant_id: str) -> AsyncGenerator[asyncpg.Connection, None]:
+    async def checkout(self) -> asyncpg.Connection:
+        """Take a connection from the pool; pair with checkin()."""
+        if self.pool is None:
+            await self.connect()
+        return await self.governor.acquire(self.pool)
+
+    async def checkin(self, conn: asyncpg.Connection) -> None:
+        await self.governor.release(self.pool, conn)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Plain pooled connection (no transaction, no tenant context), for
+        startup and background work outside a request.
         """
-        Acquire a connection and set RLS tenant context for the duration
-        of the transaction:
+        conn = await self.checkout()
+        try:
+            yield conn
+        finally:
+            await self.checkin(conn)
 
-            SELECT set_config('app.current_tenant_id', <tenant_id>, true);
+    def stats(self) -> dict:
+        stats = self.governor.stats(self.pool)
+        if self.replicas.enabled:
+            stats["replicas"] = self.replicas.stats()
+        return stats
 
-        This is used by the dependency layer to ensure tenant isolation.
+    async def get_connection(self, tenant_id: str) -> AsyncGenerator["LazyTenantConnection", None]:
         """
-        if self.pool is None:
-            await self.connect()
+        Yield a connection with RLS tenant context set for the duration of
+        the transaction. The context is applied together with BEGIN, in the
+        same round trip (see LazyTenantConnection).
+        """
+        async with self.lazy_connection(tenant_id) as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def lazy_connection(
+        self, tenant_id: str, session: Optional[str] = None
+    ) -> AsyncIterator["LazyTenantConnection"]:
+        """
+        Like get_connection(), but nothing is checked out until the first
+        query, and the connection goes back to the pool as soon as
+        release() is called or the request ends. Commits on success,
+        rolls back if the request raised.
+
+        `session` ("tenant:user") enables replica reads with
+        read-your-writes; without it everything goes to the primary.
+        """
+        conn = LazyTenantConnection(self, tenant_id, session)
+        try:
+            yield conn
+        except BaseException:
+            await conn.release(rollback=True)
+            raise
+        else:
+            await conn.release()
+
+
+class _LazyTransaction:
+    """
+    conn.transaction() for a LazyTenantConnection. The request already
+    runs inside a transaction, so this is always a savepoint (which is
+    what asyncpg's nested Transaction does too).
+    """
+
+    def __init__(self, owner: "LazyTenantConnection") -> None:
+        self._owner = owner
+        self._conn: Optional[asyncpg.Connection] = None
+        self._name = ""
+        self._hooks_mark = 0
+
+    async def __aenter__(self) -> "_LazyTransaction":
+        self._conn = await self._owner._write_conn()
+        self._owner._savepoints += 1
+        self._owner._tx_depth += 1
+        self._name = f"lazy_sp_{self._owner._savepoints}"
+        self._hooks_mark = len(self._owner._after_commit)
+        await self._conn.execute(f"SAVEPOINT {self._name}")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self._owner._tx_depth -= 1
+        if exc_type is not None:
+            await self._conn.execute(f"ROLLBACK TO SAVEPOINT {self._name}")
+            # Work rolled back to the savepoint must not fire its hooks
+            del self._owner._after_commit[self._hooks_mark:]
+        await self._conn.execute(f"RELEASE SAVEPOINT {self._name}")
+        return False
+
+
+class LazyTenantConnection:
+    """
+    Connection proxy handed to request handlers.
+
+    On the first query a pool connection is acquired and the transaction
+    opened with app.current_tenant_id already applied: BEGIN and
+    set_config() go out as one message, so tenant context costs no extra
+    round trip. Dependencies and handlers that never touch the database
+    (or do slow CPU work first) don't hold a pool slot. release() commits
+    and returns the connection early; a later query transparently checks
+    out a new one.
+
+    Reads from @read_only repository methods go to a replica (its own
+    lazily opened READ ONLY transaction, same tenant context) until this
+    request writes through the primary; from then on everything stays on
+    the primary so the request sees its own uncommitted changes.
+    """
+
+    def __init__(self, database: Database, tenant_id: str, session: Optional[str] = None) -> None:
+        self._db = database
+        self.tenant_id = str(tenant_id)
+        self.session = session
+        self._conn: Optional[asyncpg.Connection] = None
+        self._savepoints = 0
+        self._tx_depth = 0
+        self._dirty = False
+        self._after_commit: List[Callable[[], Awaitable[Any]]] = []
 
-        async with self.pool.acquire() as conn:
-            async with conn.transaction():
-                # IMPORTANT: do not use "SET LOCAL app.current_tenant_id = $1"
-                # with a parameter; Postgres can't parameterize that syntax.
-                # Use set_config() instead.
-                await conn.execute(
-                    "SELECT set_config('app.current_tenant_id', $1, true)",
-                    tenant_id,
-                )
-                yield conn
+        self._replica: Optional[Replica] = None
+        self._replica_conn: Optional[asyncpg.Connection] = None
+        self._replica_checked = False
+
+    @property
+    def acquired(self) -> bool:
+        return self._conn is not None
+
+    @property
+    def on_replica(self) -> bool:
+        return self._replica_conn is not None
+
+    async def _ensure(self) -> asyncpg.Connection:
+        if self._conn is not None:
+            return self._conn
+
+        conn = await self._db.checkout()
+        try:
+            await conn.execute(_begin_tenant_sql(self.tenant_id))
+        except BaseException:
+            await self._db.checkin(conn)
+            raise
+
+        self._conn = conn
+        return conn
+
+    async def _write_conn(self) -> asyncpg.Connection:
+        conn = await self._ensure()
+        self._dirty = True
+        return conn
+
+    async def _read_conn(self) -> asyncpg.Connection:
+        """Replica for @read_only calls when allowed, else the primary."""
+        if not _read_only.get():
+            return await self._write_conn()
+        if not self._dirty and self._tx_depth == 0 and self.session is not None:
+            replica_conn = await self._ensure_replica()
+            if replica_conn is not None:
+                return replica_conn
+        return await self._ensure()
+
+    async def _ensure_replica(self) -> Optional[asyncpg.Connection]:
+        if self._replica_conn is not None or self._replica_checked:
+            return self._replica_conn
+        self._replica_checked = True
+
+        replicas = self._db.replicas
+        replica = await replicas.pick(self.session)
+        if replica is None:
+            return None
+
+        try:
+            conn = await replica.governor.acquire(replica.pool)
+        except Exception:
+            replicas.fallbacks += 1
+            return None
+        try:
+            await conn.execute(_begin_tenant_sql(self.tenant_id, read_only=True))
+        except Exception:
+            await replica.governor.release(replica.pool, conn)
+            replica.healthy = False
+            replicas.fallbacks += 1
+            return None
+        except BaseException:
+            await replica.governor.release(replica.pool, conn)
+            raise
+
+        self._replica, self._replica_conn = replica, conn
+        return conn
+
+    async def _release_replica(self) -> None:
+        replica, conn = self._replica, self._replica_conn
+        self._replica = self._replica_conn = None
+        self._replica_checked = False
+        if conn is None:
+            return
+        try:
+            await conn.execute("ROLLBACK")
+        finally:
+            await replica.governor.release(replica.pool, conn)
+
+    async def set_tenant(self, tenant_id: Union[str, UUID]) -> None:
+        """
+        Switch the RLS tenant for the rest of this request. Free before the
+        first query (applied with BEGIN); one set_config() round trip after.
+        """
+        self.tenant_id = str(tenant_id)
+        if self._conn is not None:
+            await self._conn.execute(SET_TENANT_SQL, self.tenant_id)
+        if self._replica_conn is not None:
+            await self._replica_conn.execute(SET_TENANT_SQL, self.tenant_id)
+
+    async def release(self, rollback: bool = False) -> None:
+        """
+        End the transaction (commit unless rollback=True) and return the
+        connection to the pool. No-op if nothing was checked out. A
+        committed write is recorded for the session's read-your-writes,
+        then after_commit hooks run.
+        """
+        await self._release_replica()
+
+        hooks, self._after_commit = self._after_commit, []
+        conn, wrote = self._conn, self._dirty
+        if conn is not None:
+            self._conn = None
+            self._savepoints = self._tx_depth = 0
+            self._dirty = False
+            try:
+                await conn.execute("ROLLBACK" if rollback else "COMMIT")
+            finally:
+                await self._db.checkin(conn)
+
+            if wrote and not rollback and self.session is not None:
+                await self._db.replicas.note_write(self.session)
+
+        if not rollback:
+            for hook in hooks:
+                await hook()
+
+    def after_commit(self, hook: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Run `hook` once the current transaction commits (dropped on
+        rollback, including rollback to an enclosing savepoint).
+        """
+        self._after_commit.append(hook)
+
+    # ------------------------------------------------------------------
+    # asyncpg.Connection surface used by repositories. Registered
+    # statements (app.core.statements) run through the connection's
+    # prepared statement; every call is timed (app.core.query_log).
+    # ------------------------------------------------------------------
+    async def execute(self, query: str, *args: Any, **kwargs: Any) -> str:
+        conn = await self._write_conn()
+        return await instrumented("execute", query, args, statements.run(conn, "execute", query, args, kwargs))
+
+    async def executemany(self, command: str, args, **kwargs: Any):
+        conn = await self._write_conn()
+        return await instrumented("executemany", command, (), conn.executemany(command, args, **kwargs))
+
+    async def fetch(self, query: str, *args: Any, **kwargs: Any):
+        conn = await self._read_conn()
+        return await instrumented("fetch", query, args, statements.run(conn, "fetch", query, args, kwargs))
+
+    async def fetchrow(self, query: str, *args: Any, **kwargs: Any):
+        conn = await self._read_conn()
+        return await instrumented("fetchrow", query, args, statements.run(conn, "fetchrow", query, args, kwargs))
+
+    async def fetchval(self, query: str, *args: Any, **kwargs: Any):
+        conn = await self._read_conn()
+        return await instrumented("fetchval", query, args, statements.run(conn, "fetchval", query, args, kwargs))
+
+    async def copy_records_to_table(self, table_name: str, **kwargs: Any):
+        return await (await self._write_conn()).copy_records_to_table(table_name, **kwargs)
+
+    async def copy_from_query(self, query: str, *args: Any, **kwargs: Any):
+        return await (await self._read_conn()).copy_from_query(query, *args, **kwargs)
+
+    async def cursor(
+        self, query: str, *args: Any, prefetch: Optional[int] = None
+    ) -> AsyncIterator[asyncpg.Record]:
+        """
+        Iterate a server-side cursor inside the request transaction,
+        `prefetch` rows per round trip, so bulk reads never hold the whole
+        result in memory. Timed as one statement when iteration ends.
+        """
+        conn = await self._ensure()
+        site = call_site()
+        rows = 0
+        started = time.perf_counter()
+        try:
+            async for record in conn.cursor(
+                query, *args, prefetch=prefetch or settings.STREAM_PREFETCH_ROWS
+            ):
+                rows += 1
+                yield record
+        finally:
+            query_metrics.observe("cursor", query, args, time.perf_counter() - started, rows, site)
+
+    def transaction(self, **kwargs: Any) -> _LazyTransaction:
+        return _LazyTransaction(self)
+
+    async def connection(self) -> asyncpg.Connection:
+        """
+        The underlying connection (checked out if necessary), for APIs the
+        proxy does not wrap, e.g. cursors. It is already inside the request
+        transaction; use the proxy's transaction() for savepoints. Inside a
+        @read_only method this may be a replica connection.
+        """
+        return await self._read_conn()
+
+
+async def set_tenant_context(conn: Any, tenant_id: Union[str, UUID]) -> None:
+    """
+    Point RLS (app.current_tenant_id) at tenant_id for the rest of the
+    connection's transaction. On a request's lazy connection this is free
+    until the first query; on a plain asyncpg connection it is one
+    set_config() call.
+    """
+    if isinstance(conn, LazyTenantConnection):
+        await conn.set_tenant(tenant_id)
+    else:
+        await conn.execute(SET_TENANT_SQL, str(tenant_id))
+
+
+async def release_early(conn: Any) -> None:
+    """
+    Return a request's connection to the pool now if it is lazy; no-op for
+    plain asyncpg connections (e.g. in tests).
+    """
+    if isinstance(conn, LazyTenantConnection):
+        await conn.release()
 
 
 db = Database()
@@ -0,0 +1,219 @@
+# app/core/db_pool.py
+
+"""
+Pool telemetry and adaptive sizing for the asyncpg pool.
+
+PoolGovernor sits in front of pool.acquire():
+
+- records how long each checkout waited (histogram + running totals)
+- tracks callers currently waiting for a connection
+- in adaptive mode, caps concurrent checkouts at `limit`, which moves
+  between min_size and max_size: it grows while checkouts wait longer
+  than target_wait_seconds and shrinks when the pool sits mostly idle.
+  The asyncpg pool itself is created at max_size; connections above
+  the current limit are simply never requested and are closed by
+  max_inactive_connection_lifetime.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+
+# Upper bounds (seconds) of the acquire-wait histogram buckets
+WAIT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+class PoolExhausted(HTTPException):
+    def __init__(self, retry_after_seconds: int = 1) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database busy, retry shortly",
+            headers={"Retry-After": str(retry_after_seconds)},
+        )
+
+
+class PoolGovernor:
+    def __init__(
+        self,
+        min_size: int,
+        max_size: int,
+        acquire_timeout_seconds: float,
+        adaptive: bool = False,
+        target_wait_seconds: float = 0.01,
+        adjust_interval_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout_seconds = acquire_timeout_seconds
+        self.adaptive = adaptive
+        self.target_wait_seconds = target_wait_seconds
+        self.adjust_interval_seconds = adjust_interval_seconds
+        self._clock = clock
+
+        # Adaptive mode starts at the configured minimum and earns its way up
+        self.limit = min_size if adaptive else max_size
+        self._cond: Optional[asyncio.Condition] = None
+        self._admitted = 0
+
+        self.in_use = 0
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.bucket_counts = [0] * (len(WAIT_BUCKETS) + 1)
+        self.resizes = 0
+
+        # Current adjustment window
+        self._window_started = clock()
+        self._window_acquires = 0
+        self._window_slow = 0
+        self._window_peak = 0
+
+    def _get_cond(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    # ------------------------------------------------------------------
+    # CHECKOUT
+    # ------------------------------------------------------------------
+    async def acquire(self, pool: Any) -> Any:
+        """
+        pool.acquire() with accounting. Raises PoolExhausted (503) if no
+        connection is available within acquire_timeout_seconds.
+        """
+        started = self._clock()
+        self.waiting += 1
+        try:
+            if self.adaptive:
+                await self._admit(started)
+            try:
+                remaining = self.acquire_timeout_seconds - (self._clock() - started)
+                conn = await pool.acquire(timeout=max(remaining, 0.001))
+            except BaseException:
+                if self.adaptive:
+                    await self._leave()
+                raise
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._observe(self._clock() - started)
+            raise PoolExhausted()
+        finally:
+            self.waiting -= 1
+
+        self.in_use += 1
+        self.acquired += 1
+        self._window_peak = max(self._window_peak, self.in_use)
+        self._observe(self._clock() - started)
+        grown = self._maybe_adjust()
+        if grown > 0:
+            await self._wake(grown)
+        return conn
+
+    async def release(self, pool: Any, conn: Any) -> None:
+        try:
+            await pool.release(conn)
+        finally:
+            self.in_use -= 1
+            if self.adaptive:
+                await self._leave()
+
+    async def _admit(self, started: float) -> None:
+        cond = self._get_cond()
+        timeout = max(self.acquire_timeout_seconds - (self._clock() - started), 0.001)
+        async with cond:
+            await asyncio.wait_for(cond.wait_for(lambda: self._admitted < self.limit), timeout)
+            self._admitted += 1
+
+    async def _leave(self) -> None:
+        cond = self._get_cond()
+        async with cond:
+            self._admitted -= 1
+            cond.notify()
+
+    # ------------------------------------------------------------------
+    # MEASUREMENT / SIZING
+    # ------------------------------------------------------------------
+    def _observe(self, wait: float) -> None:
+        self.wait_seconds_total += wait
+        self.wait_seconds_max = max(self.wait_seconds_max, wait)
+        for i, bound in enumerate(WAIT_BUCKETS):
+            if wait <= bound:
+                self.bucket_counts[i] += 1
+                break
+        else:
+            self.bucket_counts[-1] += 1
+
+        self._window_acquires += 1
+        if wait > self.target_wait_seconds:
+            self._window_slow += 1
+
+    def _maybe_adjust(self) -> int:
+        """
+        Re-evaluate `limit` once per adjust interval. Returns how many
+        slots were added (so the caller can wake that many waiters).
+        """
+        if not self.adaptive:
+            return 0
+        now = self._clock()
+        if now - self._window_started < self.adjust_interval_seconds:
+            return 0
+
+        previous = self.limit
+        acquires, slow, peak = self._window_acquires, self._window_slow, self._window_peak
+
+        if acquires and slow * 10 > acquires:
+            # More than 10% of checkouts waited past target: grow by a quarter
+            self.limit = min(self.max_size, self.limit + max(1, self.limit // 4))
+        elif slow == 0 and peak < self.limit - 1:
+            # Never waited and never came close to the cap: give one back
+            self.limit = max(self.min_size, self.limit - 1)
+
+        if self.limit != previous:
+            self.resizes += 1
+
+        self._window_started = now
+        self._window_acquires = self._window_slow = 0
+        self._window_peak = self.in_use
+        return self.limit - previous
+
+    async def _wake(self, n: int) -> None:
+        cond = self._get_cond()
+        async with cond:
+            cond.notify(n)
+
+    def stats(self, pool: Any = None) -> Dict[str, Any]:
+        size = pool.get_size() if pool is not None else 0
+        idle = pool.get_idle_size() if pool is not None else 0
+        cumulative, buckets = 0, {}
+        for bound, count in zip(WAIT_BUCKETS, self.bucket_counts):
+            cumulative += count
+            buckets[f"{bound:g}"] = cumulative
+        buckets["+Inf"] = cumulative + self.bucket_counts[-1]
+
+        return {
+            "adaptive": self.adaptive,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "limit": self.limit,
+            "size": size,
+            "in_use": self.in_use,
+            "idle": idle,
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "resizes": self.resizes,
+            "wait_seconds": {
+                "count": buckets["+Inf"],
+                "sum": round(self.wait_seconds_total, 6),
+                "max": round(self.wait_seconds_max, 6),
+                "buckets": buckets,
+            },
+        }
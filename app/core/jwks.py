@@ -0,0 +1,200 @@
+# app/core/jwks.py
+
+"""
+JWKS key store for external (IdP-issued) tokens.
+
+- Keys are parsed once into jose Key objects and indexed by `kid`.
+- The document is refreshed in the background ahead of expiry
+  (Cache-Control max-age, else JWKS_CACHE_TTL_SECONDS).
+- An unknown `kid` triggers at most one refetch at a time (single-flight),
+  rate limited by JWKS_MIN_REFETCH_INTERVAL_SECONDS.
+- One pooled httpx.AsyncClient is reused for every fetch.
+
+If a refresh fails, the previous keys stay in use until the next attempt.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from jose import jwk
+from jose.exceptions import JWKError
+
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class JWKSKeyStore:
+    def __init__(
+        self,
+        jwks_url: Optional[str] = None,
+        algorithm: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        refresh_ahead_seconds: Optional[int] = None,
+        min_refetch_interval_seconds: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self._jwks_url = jwks_url
+        self.algorithm = algorithm or settings.AUTH_ALGORITHM
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.JWKS_CACHE_TTL_SECONDS
+        self.refresh_ahead_seconds = (
+            refresh_ahead_seconds
+            if refresh_ahead_seconds is not None
+            else settings.JWKS_REFRESH_AHEAD_SECONDS
+        )
+        self.min_refetch_interval_seconds = (
+            min_refetch_interval_seconds
+            if min_refetch_interval_seconds is not None
+            else settings.JWKS_MIN_REFETCH_INTERVAL_SECONDS
+        )
+        self.timeout_seconds = (
+            timeout_seconds if timeout_seconds is not None else settings.JWKS_HTTP_TIMEOUT_SECONDS
+        )
+        self._transport = transport
+
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._generation = 0
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.fetch_count = 0
+
+    @property
+    def jwks_url(self) -> str:
+        if self._jwks_url:
+            return self._jwks_url
+        if settings.AUTH_JWKS_URL:
+            return settings.AUTH_JWKS_URL
+        return f"https://{settings.AUTH_DOMAIN}/.well-known/jwks.json"
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                transport=self._transport,
+            )
+        return self._client
+
+    # ------------------------------------------------------------------
+    # FETCH
+    # ------------------------------------------------------------------
+    def _ttl_from_response(self, response: httpx.Response) -> int:
+        match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+        if match:
+            return int(match.group(1))
+        return self.ttl_seconds
+
+    def _parse_keys(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        keys: Dict[str, Any] = {}
+        for key_data in document.get("keys", []):
+            kid = key_data.get("kid")
+            if not kid or key_data.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[kid] = jwk.construct(key_data, key_data.get("alg") or self.algorithm)
+            except JWKError as ex:
+                logger.warning(f"Skipping unusable JWKS key {kid}: {ex}")
+        return keys
+
+    async def _fetch(self) -> None:
+        self._last_fetch = time.monotonic()
+        self.fetch_count += 1
+
+        response = await self._get_client().get(self.jwks_url)
+        response.raise_for_status()
+
+        self._keys = self._parse_keys(response.json())
+        self._expires_at = time.monotonic() + self._ttl_from_response(response)
+        self._generation += 1
+
+    async def refresh(self, force: bool = False) -> None:
+        """
+        Refetch the JWKS document. Concurrent callers share one request:
+        whoever waits on the lock returns if a fetch completed in the
+        meantime.
+        """
+        generation = self._generation
+        async with self._lock:
+            if not force and self._generation != generation:
+                return
+            await self._fetch()
+
+    # ------------------------------------------------------------------
+    # LOOKUP
+    # ------------------------------------------------------------------
+    async def get_key(self, kid: str):
+        """
+        Return the parsed key for `kid`, fetching the document on first use,
+        after expiry, or (rate limited) when `kid` is unknown.
+        Returns None if the IdP does not publish that key.
+        """
+        now = time.monotonic()
+
+        if not self._keys or now >= self._expires_at:
+            try:
+                await self.refresh()
+            except Exception as ex:
+                if not self._keys:
+                    raise
+                logger.warning(f"JWKS refresh failed, using cached keys: {ex}")
+
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        # Unknown kid: the IdP may have rotated keys.
+        if time.monotonic() - self._last_fetch >= self.min_refetch_interval_seconds:
+            await self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+    # ------------------------------------------------------------------
+    # BACKGROUND REFRESH
+    # ------------------------------------------------------------------
+    async def _refresh_loop(self) -> None:
+        while True:
+            delay = max(
+                self._expires_at - time.monotonic() - self.refresh_ahead_seconds,
+                self.min_refetch_interval_seconds,
+            )
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh(force=True)
+            except Exception as ex:
+                logger.warning(f"Background JWKS refresh failed: {ex}")
+
+    async def start(self) -> None:
+        """
+        Load the keys and keep them fresh in the background.
+        """
+        if self._refresh_task is not None:
+            return
+        try:
+            await self.refresh(force=True)
+        except Exception as ex:
+            logger.warning(f"Initial JWKS fetch failed: {ex}")
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+jwks_store = JWKSKeyStore()
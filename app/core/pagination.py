@@ -0,0 +1,150 @@
+# app/core/pagination.py
+
+"""
+Keyset (cursor) pagination shared by every list endpoint.
+
+List endpoints order by a unique key, e.g. (created_at, user_id), and page
+with `WHERE (created_at, user_id) > ($cursor_ts, $cursor_id)` instead of
+OFFSET, so every page costs the same no matter how deep the client is.
+
+The cursor handed to clients is the sort key of the last row on the page,
+JSON-encoded and base64url'd. It is opaque to clients; tampered or stale
+cursors are rejected with 400.
+
+Wiring for a list:
+
+- repository: `list_x(limit, after=None)` with a fixed-shape statement
+  `($1::timestamptz IS NULL OR (created_at, x_id) < ($1, $2)) ... LIMIT $3`
+- service: `return await fetch_page(self.repo.list_x, page, X_KEYSET)`
+- router: `page: PageParams = Depends(page_params)` and
+  `set_next_cursor(response, next_cursor)`; the body stays a plain list,
+  the next cursor travels in X-Next-Cursor.
+"""
+
+import base64
+import json
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, Query, Response, status
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], types: Sequence[Callable[[Any], Any]]) -> Optional[Tuple[Any, ...]]:
+    """
+    Inverse of encode_cursor; `types` converts each element back
+    (e.g. (datetime.fromisoformat, UUID)). None/empty means first page.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor shape")
+        return tuple(convert(v) for convert, v in zip(types, values))
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid pagination cursor")
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def parse_fields(fields: Optional[str], model: Any) -> Optional[Set[str]]:
+    """
+    `?fields=a,b` -> {"a", "b"}, validated against a Pydantic model's
+    fields. None means the full representation.
+    """
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(model.model_fields)
+    if unknown:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return requested or None
+
+
+class Keyset:
+    """
+    The unique sort key of a list: attribute/column names read off each
+    row (Record, dict or Pydantic model) and the decoders for the cursor.
+    """
+
+    def __init__(self, *columns: str, types: Sequence[Callable[[Any], Any]]) -> None:
+        if len(columns) != len(types):
+            raise ValueError("Keyset needs one decoder per column")
+        self.columns = columns
+        self.types = tuple(types)
+
+    def decode(self, cursor: Optional[str]) -> Optional[Tuple[Any, ...]]:
+        return decode_cursor(cursor, self.types)
+
+    def cursor_for(self, row: Any) -> str:
+        if isinstance(row, dict) or hasattr(row, "keys"):
+            return encode_cursor(*(row[c] for c in self.columns))
+        return encode_cursor(*(getattr(row, c) for c in self.columns))
+
+
+def created_keyset(id_column: str) -> Keyset:
+    """(created_at, <id>) - the sort key of most lists."""
+    return Keyset("created_at", id_column, types=(datetime.fromisoformat, UUID))
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int = DEFAULT_PAGE_SIZE
+    cursor: Optional[str] = None
+
+
+def page_params(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+) -> PageParams:
+    return PageParams(limit=limit, cursor=cursor)
+
+
+async def fetch_page(
+    fetch: Callable[[int, Optional[Tuple[Any, ...]]], Awaitable[List[Any]]],
+    page: PageParams,
+    keyset: Keyset,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Run `fetch(limit, after)` for one page. One row beyond the limit is
+    requested to learn whether a next page exists without a COUNT.
+    """
+    limit = clamp_limit(page.limit)
+    rows = await fetch(limit + 1, keyset.decode(page.cursor))
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = list(rows[:limit])
+    return rows, keyset.cursor_for(rows[-1])
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
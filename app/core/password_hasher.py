@@ -0,0 +1,109 @@
+# app/core/password_hasher.py
+
+"""
+Async password hashing.
+
+bcrypt costs a few hundred ms of CPU per call, so running it on the event
+loop stalls every other request in the worker. PasswordHasher runs
+app.core.security.verify_password / get_password_hash in a bounded
+process pool instead:
+
+- PASSWORD_HASH_WORKERS processes (0 = loop's default thread executor)
+- at most PASSWORD_HASH_MAX_CONCURRENCY jobs submitted at once; the rest
+  wait on a semaphore and show up as queue depth
+- stats() reports queue depth, in-flight jobs and latency
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core import security
+
+
+class PasswordHasher:
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        self.workers = workers if workers is not None else settings.PASSWORD_HASH_WORKERS
+        self.max_concurrency = (
+            max_concurrency
+            if max_concurrency is not None
+            else settings.PASSWORD_HASH_MAX_CONCURRENCY
+        ) or max(self.workers, 1) * 2
+
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.waiting = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self._executor is None and self.workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        queued = True
+        self.waiting += 1
+        try:
+            async with self._get_semaphore():
+                self.waiting -= 1
+                queued = False
+                self.in_flight += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self._get_executor(), fn, *args)
+                finally:
+                    self.in_flight -= 1
+        finally:
+            if queued:
+                # Cancelled before reaching the pool
+                self.waiting -= 1
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.completed += 1
+            self.total_latency_ms += elapsed_ms
+            self.max_latency_ms = max(self.max_latency_ms, elapsed_ms)
+
+    # ------------------------------------------------------------------
+    # PUBLIC API
+    # ------------------------------------------------------------------
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(security.verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(security.get_password_hash, password)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "avg_latency_ms": round(self.total_latency_ms / self.completed, 2)
+            if self.completed
+            else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 2),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
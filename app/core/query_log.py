@@ -0,0 +1,192 @@
+# app/core/query_log.py
+
+"""
+Query instrumentation for request connections.
+
+- Every statement run through a LazyTenantConnection is timed and
+  attributed to its call site (first frame in app/modules).
+- Statements slower than SLOW_QUERY_MS are logged with their parameters
+  redacted to type/length.
+- Per-request totals (count, DB time, queries per call site) live in a
+  RequestQueryStats bound by the request middleware; requests that run
+  more statements than their route's budget are flagged.
+- Aggregates per statement and over-budget counts per route are exposed
+  via query_metrics.stats() in /system/metrics.
+"""
+
+import hashlib
+import logging
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn")
+
+_APP_MODULES = "/app/modules/"
+
+
+class RequestQueryStats:
+    def __init__(self, request_id: str) -> None:
+        self.request_id = request_id
+        self.count = 0
+        self.db_seconds = 0.0
+        self.by_site: Dict[str, int] = {}
+
+    def record(self, site: str, seconds: float) -> None:
+        self.count += 1
+        self.db_seconds += seconds
+        self.by_site[site] = self.by_site.get(site, 0) + 1
+
+    def hottest_site(self) -> Tuple[str, int]:
+        if not self.by_site:
+            return "", 0
+        return max(self.by_site.items(), key=lambda kv: kv[1])
+
+
+current_request_queries: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "current_request_queries", default=None
+)
+
+
+def statement_key(query: str) -> str:
+    name = getattr(query, "name", None)
+    if name:
+        return name
+    digest = hashlib.sha1(" ".join(query.split()).encode("utf-8")).hexdigest()[:12]
+    return f"adhoc:{digest}"
+
+
+def call_site() -> str:
+    """file:line of the innermost caller under app/modules."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        idx = filename.find(_APP_MODULES)
+        if idx >= 0:
+            return f"{filename[idx + 1:]}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+def redact(args: tuple) -> str:
+    parts = []
+    for i, value in enumerate(args, start=1):
+        if value is None:
+            shown = "NULL"
+        elif isinstance(value, (str, bytes, list, tuple)):
+            shown = f"<{type(value).__name__} len={len(value)}>"
+        else:
+            shown = f"<{type(value).__name__}>"
+        parts.append(f"${i}={shown}")
+    return ", ".join(parts)
+
+
+def row_count(method: str, result: Any) -> int:
+    if method == "fetch":
+        return len(result) if result is not None else 0
+    if method in ("fetchrow", "fetchval"):
+        return 0 if result is None else 1
+    if method == "cursor":
+        return int(result)
+    if isinstance(result, str):
+        tail = result.rsplit(" ", 1)[-1]
+        return int(tail) if tail.isdigit() else 0
+    return 0
+
+
+class QueryMetrics:
+    def __init__(self, slow_query_ms: float, default_budget: int, budgets: Dict[str, int], max_keys: int = 500) -> None:
+        self.slow_query_ms = slow_query_ms
+        self.default_budget = default_budget
+        self.budgets = budgets
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._by_statement: Dict[str, List[float]] = {}  # key -> [count, total_s, max_s, rows]
+        self._over_budget: Dict[str, int] = {}
+        self.slow = 0
+
+    def budget_for(self, route: str) -> int:
+        return self.budgets.get(route, self.default_budget)
+
+    def observe(self, method: str, query: str, args: tuple, seconds: float, result: Any, site: str) -> None:
+        key = statement_key(query)
+        rows = row_count(method, result)
+
+        with self._lock:
+            entry = self._by_statement.get(key)
+            if entry is None and len(self._by_statement) < self.max_keys:
+                entry = self._by_statement[key] = [0, 0.0, 0.0, 0]
+            if entry is not None:
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+                entry[3] += rows
+
+        stats = current_request_queries.get()
+        if stats is not None:
+            stats.record(site, seconds)
+
+        if seconds * 1000 >= self.slow_query_ms:
+            self.slow += 1
+            logger.warning(
+                "Slow query %.1fms %s rows=%d at %s request=%s params=[%s]",
+                seconds * 1000,
+                key,
+                rows,
+                site,
+                stats.request_id if stats is not None else "-",
+                redact(args),
+            )
+
+    def check_budget(self, route: str, stats: RequestQueryStats) -> bool:
+        """True (and logged) if the request ran more statements than allowed."""
+        budget = self.budget_for(route)
+        if budget <= 0 or stats.count <= budget:
+            return False
+        with self._lock:
+            self._over_budget[route] = self._over_budget.get(route, 0) + 1
+        site, n = stats.hottest_site()
+        logger.warning(
+            "Query budget exceeded on %s: %d statements (budget %d), %d from %s request=%s",
+            route, stats.count, budget, n, site, stats.request_id,
+        )
+        return True
+
+    def stats(self, top: int = 20) -> Dict[str, Any]:
+        with self._lock:
+            ranked = sorted(self._by_statement.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+            over_budget = dict(self._over_budget)
+        return {
+            "slow_query_ms": self.slow_query_ms,
+            "slow": self.slow,
+            "over_budget": over_budget,
+            "top_by_total_time": {
+                key: {
+                    "count": int(count),
+                    "total_ms": round(total * 1000, 3),
+                    "max_ms": round(worst * 1000, 3),
+                    "rows": int(rows),
+                }
+                for key, (count, total, worst, rows) in ranked
+            },
+        }
+
+
+query_metrics = QueryMetrics(
+    slow_query_ms=settings.SLOW_QUERY_MS,
+    default_budget=settings.QUERY_BUDGET_DEFAULT,
+    budgets=settings.QUERY_BUDGETS,
+)
+
+
+async def instrumented(method: str, query: str, args: tuple, call: Any) -> Any:
+    """Await `call` (the statement), recording timing against `query`."""
+    site = call_site()
+    started = time.perf_counter()
+    result = await call
+    query_metrics.observe(method, query, args, time.perf_counter() - started, result, site)
+    return result
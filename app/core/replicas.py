@@ -0,0 +1,258 @@
+# app/core/replicas.py
+
+"""
+Read replicas for the asyncpg layer.
+
+- ReplicaSet owns one pool (and PoolGovernor) per replica DSN.
+- A background monitor samples the primary's WAL position and each
+  replica's replay position, so every replica knows the latest primary
+  timestamp it has fully replayed (`synced_at`).
+- Writes are recorded per session (tenant:user) in-process and in Redis;
+  a session is only routed to a replica whose synced_at is past its last
+  write, so it always reads its own writes.
+
+A replica that is not a hot standby (pg_last_wal_replay_lsn() is NULL,
+e.g. a second ordinary instance in local testing) is treated as always
+current.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import asyncpg
+
+from app.core.cache import cache
+from app.core.db_pool import PoolGovernor
+
+logger = logging.getLogger("uvicorn")
+
+_PRIMARY_LSN_SQL = "SELECT (pg_current_wal_lsn() - '0/0'::pg_lsn)::bigint"
+_REPLAY_LSN_SQL = "SELECT (pg_last_wal_replay_lsn() - '0/0'::pg_lsn)::bigint"
+
+
+class Replica:
+    def __init__(self, name: str, dsn: str, governor: PoolGovernor) -> None:
+        self.name = name
+        self.dsn = dsn
+        self.governor = governor
+        self.pool: Optional[asyncpg.Pool] = None
+        self.healthy = False
+        self.synced_at = 0.0  # wall-clock time of the newest replayed primary sample
+        self.lag_bytes: Optional[int] = None
+
+    def lag_seconds(self, now: float) -> float:
+        return max(0.0, now - self.synced_at)
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        dsns: List[str],
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+        pool_options: Dict[str, Any],
+        governor_options: Dict[str, Any],
+    ) -> None:
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.pool_options = pool_options
+        self.replicas = [
+            Replica(f"replica{i}", dsn, PoolGovernor(**governor_options))
+            for i, dsn in enumerate(dsns)
+        ]
+
+        self._rr = itertools.count()
+        self._samples: Deque[Tuple[float, int]] = deque()
+        # session -> last write time, oldest first; pruned past the window
+        self._local_writes: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.routed = 0
+        self.fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def _write_key(self, session: str) -> str:
+        return f"last_write:{session}"
+
+    @property
+    def _write_window_seconds(self) -> float:
+        return self.max_lag_seconds + 1
+
+    # ------------------------------------------------------------------
+    # LIFECYCLE
+    # ------------------------------------------------------------------
+    async def connect(self, primary: Any) -> None:
+        """
+        Open replica pools and start lag monitoring against `primary`
+        (the Database whose acquire() reaches the primary).
+        """
+        for replica in self.replicas:
+            if replica.pool is None:
+                try:
+                    replica.pool = await asyncpg.create_pool(replica.dsn, **self.pool_options)
+                except Exception as ex:
+                    logger.warning("Replica %s unavailable: %s", replica.name, ex)
+        if self.enabled and self._task is None:
+            await self.check(primary)
+            self._task = asyncio.create_task(self._monitor(primary))
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        for replica in self.replicas:
+            if replica.pool is not None:
+                await replica.pool.close()
+                replica.pool = None
+            replica.healthy = False
+
+    async def _monitor(self, primary: Any) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval_seconds)
+            try:
+                await self.check(primary)
+            except Exception as ex:
+                logger.warning("Replica lag check failed: %s", ex)
+
+    # ------------------------------------------------------------------
+    # LAG TRACKING
+    # ------------------------------------------------------------------
+    async def check(self, primary: Any) -> None:
+        """
+        One lag sample: primary WAL position now, then each replica's
+        replay position, matched against recent primary samples.
+        """
+        # Timestamp first: the LSN read afterwards is at least as new, so a
+        # replica that replayed it is caught up to at least sampled_at.
+        sampled_at = time.time()
+        async with primary.acquire() as conn:
+            primary_lsn = int(await conn.fetchval(_PRIMARY_LSN_SQL))
+        self._samples.append((sampled_at, primary_lsn))
+        horizon = sampled_at - self.max_lag_seconds - self.check_interval_seconds
+        while len(self._samples) > 1 and self._samples[0][0] < horizon:
+            self._samples.popleft()
+
+        for replica in self.replicas:
+            if replica.pool is None:
+                continue
+            try:
+                async with replica.pool.acquire() as conn:
+                    replay_lsn = await conn.fetchval(_REPLAY_LSN_SQL)
+            except Exception as ex:
+                replica.healthy = False
+                logger.warning("Replica %s lag check failed: %s", replica.name, ex)
+                continue
+
+            replica.healthy = True
+            if replay_lsn is None:
+                replica.synced_at, replica.lag_bytes = sampled_at, 0
+                continue
+            self._record_replay(replica, int(replay_lsn), primary_lsn)
+
+    def _record_replay(self, replica: Replica, replay_lsn: int, primary_lsn: int) -> None:
+        replica.lag_bytes = max(0, primary_lsn - replay_lsn)
+        # Newest primary sample the replica has replayed past
+        for sampled_at, lsn in reversed(self._samples):
+            if lsn <= replay_lsn:
+                replica.synced_at = max(replica.synced_at, sampled_at)
+                break
+
+    # ------------------------------------------------------------------
+    # READ-YOUR-WRITES
+    # ------------------------------------------------------------------
+    async def note_write(self, session: str) -> None:
+        """Record that `session` just committed a write on the primary."""
+        if not self.enabled:
+            return
+        now = time.time()
+        # Re-insert so the dict stays ordered by write time
+        self._local_writes.pop(session, None)
+        self._local_writes[session] = now
+        self._prune_local_writes(now)
+        try:
+            await cache.set(
+                self._write_key(session),
+                repr(now),
+                ttl=math.ceil(self.max_lag_seconds) + 1,
+            )
+        except Exception as ex:
+            logger.warning("Could not publish write marker for %s: %s", session, ex)
+
+    def _prune_local_writes(self, now: float) -> None:
+        # Oldest first: stop at the first marker still inside the window
+        horizon = now - self._write_window_seconds
+        while self._local_writes:
+            session, written_at = next(iter(self._local_writes.items()))
+            if written_at >= horizon:
+                break
+            del self._local_writes[session]
+
+    async def _last_write(self, session: str) -> Optional[float]:
+        local = self._local_writes.get(session)
+        if local is not None and time.time() - local > self._write_window_seconds:
+            del self._local_writes[session]
+            local = None
+        try:
+            shared = await cache.get(self._write_key(session))
+        except Exception:
+            # Can't see other workers' writes: stay on the primary
+            return time.time()
+        if shared is None:
+            return local
+        return max(float(shared), local or 0.0)
+
+    async def pick(self, session: Optional[str]) -> Optional[Replica]:
+        """
+        A replica this session may read from, or None for the primary.
+        Anonymous work always uses the primary.
+        """
+        if not self.enabled or session is None:
+            return None
+
+        now = time.time()
+        candidates = [
+            r for r in self.replicas
+            if r.healthy and r.pool is not None and r.lag_seconds(now) <= self.max_lag_seconds
+        ]
+        if not candidates:
+            self.fallbacks += 1
+            return None
+
+        last_write = await self._last_write(session)
+        if last_write is not None:
+            candidates = [r for r in candidates if r.synced_at >= last_write]
+            if not candidates:
+                self.fallbacks += 1
+                return None
+
+        self.routed += 1
+        return candidates[next(self._rr) % len(candidates)]
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "routed": self.routed,
+            "fallbacks": self.fallbacks,
+            "max_lag_seconds": self.max_lag_seconds,
+            "replicas": {
+                r.name: {
+                    "healthy": r.healthy,
+                    "lag_seconds": round(r.lag_seconds(now), 3) if r.synced_at else None,
+                    "lag_bytes": r.lag_bytes,
+                    "pool": r.governor.stats(r.pool),
+                }
+                for r in self.replicas
+            },
+        }
@@ -6,6 +6,9 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional, Union
 
 import hashlib
+import threading
+import time
+from collections import OrderedDict
 from uuid import uuid4
 
 from fastapi import HTTPException, Request, status
@@ -118,12 +121,92 @@ def create_refresh_token(data: dict):
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
 
 
+class VerifiedTokenCache:
+    """
+    Size-bounded LRU of verified JWT payloads, keyed by token digest.
+
+    - entries expire at the token's `exp`
+    - evict() drops an entry early (called on revocation)
+    - hits / misses counters are exposed via stats()
+
+    Only successful verifications are cached; invalid tokens always go
+    through the full decode.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            exp, payload = entry
+            if exp <= time.time():
+                del self._entries[digest]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            # Callers may annotate the payload; never hand out the cached dict
+            return dict(payload)
+
+    def put(self, digest: str, payload: Dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+
+        with self._lock:
+            self._entries[digest] = (float(exp), dict(payload))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def evict(self, digest: str) -> None:
+        with self._lock:
+            self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+verified_token_cache = VerifiedTokenCache(settings.TOKEN_CACHE_MAX_SIZE)
+
+
 def decode_token(token: str, verify_exp: bool = True) -> Optional[Dict[str, Any]]:
     """
     Decode a JWT and optionally verify exp.
 
     Returns the payload dict on success, or None on failure.
+    Verified payloads are served from verified_token_cache until `exp`.
     """
+    digest = hash_access_token(token) if verify_exp else None
+    if digest is not None:
+        cached = verified_token_cache.get(digest)
+        if cached is not None:
+            return cached
+
     options = {"verify_exp": verify_exp}
     try:
         payload = jwt.decode(
@@ -132,10 +215,13 @@ def decode_token(token: str, verify_exp: bool = True) -> Optional[Dict[str, Any]
             algorithms=[settings.JWT_ALGORITHM],
             options=options,
         )
-        return payload
     except JWTError:
         return None
 
+    if digest is not None:
+        verified_token_cache.put(digest, payload)
+    return payload
+
 
 def datetime_from_timestamp(ts: Union[int, float]) -> datetime:
     """Convert a UNIX timestamp (seconds) to timezone-aware datetime."""
@@ -0,0 +1,187 @@
+# app/core/statements.py
+
+"""
+Central registry of named SQL statements.
+
+Repositories declare their queries once at import time:
+
+    _GET_USER = statements.define("users.get_by_id", \"\"\"SELECT ...\"\"\")
+
+define() returns a Query (a str subclass carrying its name), so it can be
+passed to any asyncpg call unchanged. Every pooled connection prepares all
+registered statements when it is created (pool init= hook); the request
+connection proxy then runs Query objects through those prepared
+statements, so parse/plan work never lands on the request path.
+
+Counters per statement (hits, misses = prepared on demand, evictions from
+the per-connection LRU) plus a tally of ad-hoc (unregistered) SQL are
+exposed via stats().
+"""
+
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn")
+
+
+class Query(str):
+    """SQL text with a registry name."""
+
+    name: str
+
+    def __new__(cls, name: str, sql: str) -> "Query":
+        query = super().__new__(cls, sql)
+        query.name = name
+        return query
+
+
+class _Counters:
+    __slots__ = ("hits", "misses", "evictions", "prepare_errors")
+
+    def __init__(self) -> None:
+        self.hits = self.misses = self.evictions = self.prepare_errors = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def _raw(conn: Any) -> Any:
+    # asyncpg hands out a fresh PoolConnectionProxy per acquire; prepared
+    # statements belong to the underlying Connection.
+    return getattr(conn, "_con", None) or conn
+
+
+class StatementRegistry:
+    def __init__(self, per_connection_limit: int, adhoc_track_limit: int = 1000) -> None:
+        self.per_connection_limit = per_connection_limit
+        self.adhoc_track_limit = adhoc_track_limit
+        self._queries: "OrderedDict[str, Query]" = OrderedDict()
+        self._counters: Dict[str, _Counters] = {}
+        self._prepared: "weakref.WeakKeyDictionary[Any, OrderedDict]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+        self.adhoc_executions = 0
+        self._adhoc: "OrderedDict[str, int]" = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # DECLARATION
+    # ------------------------------------------------------------------
+    def define(self, name: str, sql: str) -> Query:
+        existing = self._queries.get(name)
+        if existing is not None and str(existing) != sql:
+            raise ValueError(f"Statement {name!r} already defined with different SQL")
+        query = Query(name, sql)
+        self._queries[name] = query
+        self._counters.setdefault(name, _Counters())
+        return query
+
+    def get(self, name: str) -> Query:
+        return self._queries[name]
+
+    # ------------------------------------------------------------------
+    # PREPARATION
+    # ------------------------------------------------------------------
+    async def prepare_all(self, conn: Any) -> None:
+        """
+        Pool init= hook: prepare every registered statement on a new
+        connection. A statement that fails to prepare (e.g. migration not
+        applied yet) is logged and left to on-demand preparation.
+        """
+        for query in list(self._queries.values())[: self.per_connection_limit]:
+            try:
+                await self._prepare(conn, query)
+            except Exception as ex:
+                self._counters[query.name].prepare_errors += 1
+                logger.warning("Could not prepare %s: %s", query.name, ex)
+
+    async def _prepare(self, conn: Any, query: Query) -> Any:
+        raw = _raw(conn)
+        stmt = await raw.prepare(str(query))
+        cache = self._prepared.setdefault(raw, OrderedDict())
+        cache[query.name] = stmt
+        cache.move_to_end(query.name)
+        while len(cache) > self.per_connection_limit:
+            evicted, _ = cache.popitem(last=False)
+            self._counters[evicted].evictions += 1
+        return stmt
+
+    async def statement(self, conn: Any, query: Query) -> Any:
+        """The prepared statement for `query` on `conn`, preparing on a miss."""
+        counters = self._counters[query.name]
+        cache = self._prepared.get(_raw(conn))
+        stmt = cache.get(query.name) if cache is not None else None
+        if stmt is not None:
+            cache.move_to_end(query.name)
+            counters.hits += 1
+            return stmt
+        counters.misses += 1
+        return await self._prepare(conn, query)
+
+    def _note_adhoc(self, sql: str) -> None:
+        self.adhoc_executions += 1
+        digest = hashlib.sha1(" ".join(sql.split()).encode("utf-8")).hexdigest()[:12]
+        with self._lock:
+            self._adhoc[digest] = self._adhoc.get(digest, 0) + 1
+            self._adhoc.move_to_end(digest)
+            while len(self._adhoc) > self.adhoc_track_limit:
+                self._adhoc.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # EXECUTION
+    # ------------------------------------------------------------------
+    async def run(self, conn: Any, method: str, query: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        """
+        conn.<method>(query, *args) through the prepared statement when
+        `query` is a registered Query; plain asyncpg call otherwise.
+        """
+        if not isinstance(query, Query) or kwargs:
+            self._note_adhoc(query)
+            return await getattr(conn, method)(query, *args, **kwargs)
+
+        stmt = await self.statement(conn, query)
+        try:
+            if method == "execute":
+                await stmt.fetch(*args)
+                return stmt.get_statusmsg()
+            return await getattr(stmt, method)(*args)
+        except (asyncpg.exceptions.InvalidCachedStatementError, asyncpg.InterfaceError):
+            # Schema changed under the statement (or it was closed): forget
+            # it so the next call prepares a fresh one.
+            cache = self._prepared.get(_raw(conn))
+            if cache is not None and cache.pop(query.name, None) is not None:
+                self._counters[query.name].evictions += 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        totals = _Counters()
+        per_statement: Dict[str, Dict[str, int]] = {}
+        for name, counters in self._counters.items():
+            per_statement[name] = counters.as_dict()
+            for slot in _Counters.__slots__:
+                setattr(totals, slot, getattr(totals, slot) + getattr(counters, slot))
+        with self._lock:
+            adhoc_top = sorted(self._adhoc.items(), key=lambda kv: kv[1], reverse=True)[:10]
+        return {
+            "registered": len(self._queries),
+            "connections": len(self._prepared),
+            **totals.as_dict(),
+            "adhoc_executions": self.adhoc_executions,
+            "adhoc_distinct": len(self._adhoc),
+            "adhoc_top": dict(adhoc_top),
+            "statements": per_statement,
+        }
+
+
+statements = StatementRegistry(settings.DB_PREPARED_STATEMENT_LIMIT)
+
+
+def define(name: str, sql: str) -> Query:
+    return statements.define(name, sql)
@@ -0,0 +1,119 @@
+# app/core/streaming.py
+
+"""
+Opt-in NDJSON streaming for bulk reads.
+
+Clients sending `Accept: application/x-ndjson` get one JSON object per
+line instead of a materialized JSON array. Rows come from a server-side
+cursor (LazyTenantConnection.cursor) inside the request's tenant
+transaction and are encoded as they arrive, so memory stays flat however
+large the tenant is. The first row is flushed on its own so the client
+sees bytes immediately; after that lines go out STREAM_CHUNK_ROWS at a
+time.
+
+The request's own connection (get_tenant_db_connection) commits before
+the response starts, so a stream reads on a connection of its own
+(get_tenant_stream_connection): release_after() commits and returns it to
+the pool once the body has been sent, or rolls back if the stream fails
+or the client goes away.
+"""
+
+import ipaddress
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Optional
+from uuid import UUID
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.database import LazyTenantConnection
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_IP_TYPES = (
+    ipaddress.IPv4Address,
+    ipaddress.IPv6Address,
+    ipaddress.IPv4Network,
+    ipaddress.IPv6Network,
+    ipaddress.IPv4Interface,
+    ipaddress.IPv6Interface,
+)
+
+
+def wants_ndjson(request: Request) -> bool:
+    accept = request.headers.get("accept", "")
+    return any(
+        part.split(";", 1)[0].strip().lower() == NDJSON_MEDIA_TYPE
+        for part in accept.split(",")
+    )
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal) + _IP_TYPES):
+        return str(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def ndjson_line(obj: Any) -> bytes:
+    return json.dumps(obj, default=_json_default, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+async def ndjson_chunks(
+    rows: AsyncIterable[Any],
+    encode: Callable[[Any], Any] = dict,
+    chunk_rows: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    chunk_rows = chunk_rows or settings.STREAM_CHUNK_ROWS
+    buffer = []
+    flush_at = 1
+    async for row in rows:
+        buffer.append(ndjson_line(encode(row)))
+        if len(buffer) >= flush_at:
+            yield b"".join(buffer)
+            buffer.clear()
+            flush_at = chunk_rows
+    if buffer:
+        yield b"".join(buffer)
+
+
+async def release_after(conn: LazyTenantConnection, body: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """`body`, then commit and release `conn` (rolled back if the stream failed)."""
+    try:
+        async for chunk in body:
+            yield chunk
+    except BaseException:
+        # Stop whatever `body` still runs on the connection before it goes back
+        aclose = getattr(body, "aclose", None)
+        if aclose is not None:
+            await aclose()
+        await conn.release(rollback=True)
+        raise
+    else:
+        await conn.release()
+
+
+def ndjson_response(
+    rows: AsyncIterable[Any],
+    encode: Callable[[Any], Any] = dict,
+    headers: Optional[Dict[str, str]] = None,
+    conn: Optional[LazyTenantConnection] = None,
+) -> StreamingResponse:
+    """
+    Stream `rows` as NDJSON. `conn` (from get_tenant_stream_connection) is
+    the connection the rows are read on; it is released after the body.
+    """
+    body = ndjson_chunks(rows, encode)
+    if conn is not None:
+        body = release_after(conn, body)
+    return StreamingResponse(
+        body,
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers,
+    )
@@ -1,10 +1,13 @@
 # app/dependencies/__init__.py
 
+from .auth_context import AuthContext, get_auth_context
 from .database import get_db_connection, get_tenant_db_connection
 from .auth_utils import get_current_token_payload, get_current_user
 from .permissions import require_permissions
 
 __all__ = [
+    "AuthContext",
+    "get_auth_context",
     "get_db_connection",
     "get_tenant_db_connection",
     "get_current_token_payload",
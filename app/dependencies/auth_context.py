@@ -0,0 +1,207 @@
+# app/dependencies/auth_context.py
+
+"""
+Request-scoped authentication context.
+
+The bearer token is decoded and verified once per request and the result is
+stored on request.state.auth. tenant_context_middleware builds it for every
+request that carries a valid token; dependencies that run without the
+middleware build it on first use. Everything downstream (tenant connection,
+permission guards, routers, services) reads the same object instead of
+decoding the JWT again.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, Request, status
+
+from app.core.security import decode_token, get_bearer_token
+from app.modules.auth.revocation import revocation_store
+
+
+def _as_uuid(value: Any) -> Optional[UUID]:
+    if not value:
+        return None
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _normalize_permissions(perms: Iterable[str] | None) -> Set[str]:
+    """
+    Normalize permissions into a set of strings.
+    """
+    if not perms:
+        return set()
+    return {str(p) for p in perms}
+
+
+class AuthContext:
+    """
+    Verified identity for the current request.
+
+    - claims: decoded JWT payload (payload["tenant_id"] mirrors 'tid')
+    - user_id / tenant_id: parsed from 'sub' / 'tid' (None if absent/invalid)
+    - permissions: resolved lazily, at most once per request
+    - permission mask: the permissions compiled against the registry
+    """
+
+    def __init__(self, token: str, claims: Dict[str, Any]):
+        tid = claims.get("tid") or claims.get("tenant_id")
+        if tid:
+            claims["tenant_id"] = tid
+
+        self.token = token
+        self.claims = claims
+        self.user_id: Optional[UUID] = _as_uuid(claims.get("sub"))
+        self.tenant_id: Optional[UUID] = _as_uuid(tid)
+
+        self._permissions: Optional[Set[str]] = None
+        self._permission_mask: Optional[Tuple[str, int]] = None
+        self._snapshot: Optional[Tuple[str, Optional[int]]] = None
+        self._revocation_checked = False
+
+    async def ensure_not_revoked(self) -> None:
+        if self._revocation_checked:
+            return
+        if await revocation_store.is_token_revoked(self.token):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token revoked",
+            )
+        self._revocation_checked = True
+
+    async def _get_snapshot_mask(self) -> Optional[int]:
+        """
+        Permission mask embedded at login/refresh ('pm'/'pv' claims), if
+        its catalog and tenant versions are still current.
+        """
+        from app.modules.roles.permission_registry import permission_registry
+        from app.modules.roles.permission_snapshot import trusted_snapshot_mask
+
+        if self._snapshot is None or self._snapshot[0] != permission_registry.version:
+            mask = None
+            if self.tenant_id:
+                mask = await trusted_snapshot_mask(self.claims, self.tenant_id)
+            self._snapshot = (permission_registry.version, mask)
+        return self._snapshot[1]
+
+    async def get_permissions(self, conn) -> Set[str]:
+        """
+        Effective permissions for (user_id, tenant_id).
+
+        Prefers a 'permissions' claim, then a still-current permission
+        snapshot in the token; otherwise reads the permission cache, which
+        loads from the DB via UserRepository on the given tenant connection
+        when it has no current entry.
+        """
+        if self._permissions is not None:
+            return self._permissions
+
+        perms = self.claims.get("permissions")
+        if perms is not None:
+            self._permissions = _normalize_permissions(perms)
+            return self._permissions
+
+        from app.modules.roles.permission_registry import permission_registry
+
+        await permission_registry.ensure_current(conn)
+        snapshot = await self._get_snapshot_mask()
+        if snapshot is not None:
+            self._permissions = permission_registry.decode(snapshot)
+        elif not self.user_id or not self.tenant_id:
+            # No way to resolve permissions, treat as no permissions
+            self._permissions = set()
+        else:
+            from app.modules.roles.permission_cache import permission_cache
+            from app.modules.users.repository import UserRepository
+
+            async def load():
+                ctx = await UserRepository(conn).get_user_context(self.user_id, self.tenant_id)
+                return getattr(ctx, "permissions", None) or []
+
+            self._permissions = await permission_cache.get_permissions(
+                self.tenant_id, self.user_id, load
+            )
+
+        return self._permissions
+
+    async def get_permission_mask(self, conn) -> int:
+        """
+        Effective permissions as a bitmask over permission_registry,
+        memoized for the registry version it was compiled against.
+        """
+        from app.modules.roles.permission_registry import permission_registry
+
+        await permission_registry.ensure_current(conn)
+        if self._permission_mask and self._permission_mask[0] == permission_registry.version:
+            return self._permission_mask[1]
+
+        mask = None
+        if "permissions" not in self.claims:
+            mask = await self._get_snapshot_mask()
+        if mask is None:
+            mask = permission_registry.compile(await self.get_permissions(conn))
+        self._permission_mask = (permission_registry.version, mask)
+        return mask
+
+
+def try_build_auth_context(request: Request) -> Optional[AuthContext]:
+    """
+    Best-effort variant used by middleware: returns None instead of raising
+    when the request has no usable bearer token.
+    """
+    ctx = getattr(request.state, "auth", None)
+    if ctx is not None:
+        return ctx
+
+    auth = request.headers.get("Authorization")
+    if not auth or not auth.startswith("Bearer "):
+        return None
+
+    token = auth.split(" ", 1)[1].strip()
+    payload = decode_token(token)
+    if not payload:
+        return None
+
+    ctx = AuthContext(token, payload)
+    request.state.auth = ctx
+    return ctx
+
+
+def get_request_auth_context(request: Request) -> AuthContext:
+    """
+    Return the request's AuthContext, decoding the token on first use.
+    Raises 401 if the header is missing/malformed or the token is invalid.
+    This is synchronous; it does not check revocation.
+    """
+    ctx = getattr(request.state, "auth", None)
+    if ctx is not None:
+        return ctx
+
+    token = get_bearer_token(request)
+    payload = decode_token(token)
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
+
+    ctx = AuthContext(token, payload)
+    request.state.auth = ctx
+    return ctx
+
+
+async def get_auth_context(request: Request) -> AuthContext:
+    """
+    FastAPI dependency returning the verified, non-revoked AuthContext.
+
+    Example:
+        async def handler(auth: AuthContext = Depends(get_auth_context)):
+            ...
+    """
+    ctx = get_request_auth_context(request)
+    await ctx.ensure_not_revoked()
+    return ctx
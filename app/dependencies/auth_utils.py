@@ -6,37 +6,28 @@ Used by:
 - database dependencies (to get tenant_id)
 - routers (to get current user_id)
 - permissions (via get_current_user / get_current_user_id)
+
+All helpers read the request-scoped AuthContext (see auth_context.py), so
+the token is decoded at most once per request.
 """
 
 from typing import Any, Dict
 
 from fastapi import Request, HTTPException, status
 
-from app.core.security import get_bearer_token, decode_token
+from app.dependencies.auth_context import get_auth_context, get_request_auth_context
 
 
 def _decode_request_token(request: Request, verify_exp: bool = True) -> Dict[str, Any]:
     """
     Internal helper:
-    - read Bearer token from Authorization header
-    - decode JWT
+    - return the claims of the request's AuthContext
     - raise 401 if anything is wrong
-    """
-    token = get_bearer_token(request)
-    payload = decode_token(token, verify_exp=verify_exp)
-
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-        )
 
-    # Normalize tenant id so callers can reliably use payload["tenant_id"]
-    tid = payload.get("tid") or payload.get("tenant_id")
-    if tid:
-        payload["tenant_id"] = tid
-
-    return payload
+    The shared context is always verified with exp; verify_exp is kept for
+    signature compatibility.
+    """
+    return get_request_auth_context(request).claims
 
 
 def get_current_user_id(request: Request) -> str:
@@ -59,14 +50,16 @@ def get_current_user_id(request: Request) -> str:
     return user_id
 
 
-def get_current_token_payload(request: Request) -> Dict[str, Any]:
+async def get_current_token_payload(request: Request) -> Dict[str, Any]:
     """
     FastAPI dependency to get the *full* decoded JWT payload.
 
     - Does NOT require a 'jti' claim.
     - Ensures payload["tenant_id"] is set if 'tid' or 'tenant_id' exists.
+    - Rejects revoked (logged-out) tokens.
     """
-    return _decode_request_token(request, verify_exp=True)
+    ctx = await get_auth_context(request)
+    return ctx.claims
 
 
 def get_current_user(request: Request) -> Dict[str, Any]:
@@ -1,33 +1,68 @@
 # app/dependencies/database.py
 
 from fastapi import Depends, HTTPException, status
-from typing import AsyncGenerator
-from app.core.database import db
-from app.dependencies.auth_utils import get_current_token_payload
+from typing import AsyncGenerator, Optional
+from app.core.database import LazyTenantConnection, db
+from app.dependencies.auth_context import AuthContext, get_auth_context
 
 
 async def get_db_connection() -> AsyncGenerator:
     """
     System-level connection WITHOUT tenant RLS context.
     Used for health checks, system endpoints, etc.
+
+    Declare it as Depends(get_db_connection, scope="function"), like
+    get_tenant_db_connection.
     """
     # Use a special tenant (or no RLS enforcement) as designed in your DB.
-    async for conn in db.get_connection("00000000-0000-0000-0000-000000000000"):
+    async with db.lazy_connection("00000000-0000-0000-0000-000000000000") as conn:
         yield conn
 
 
 async def get_tenant_db_connection(
-    token_payload: dict = Depends(get_current_token_payload),
+    auth: AuthContext = Depends(get_auth_context),
 ) -> AsyncGenerator:
     """
     Tenant-scoped connection WITH RLS context based on token's tid.
+
+    The connection is lazy: it is only checked out (and the tenant context
+    applied) on the first query, so guards answered from the token or cache
+    and handlers that do CPU work first don't hold a pool slot. Read-only
+    repository methods may be served by a replica that has caught up with
+    this user's last write.
+
+    Always declare it as Depends(get_tenant_db_connection, scope="function"):
+    the transaction then commits, the read-your-writes marker is published
+    and after_commit hooks run before the response is sent, so the client's
+    next request sees its writes. (The scope is part of FastAPI's dependency
+    cache key; mixing scopes would give one request two connections.)
+    Streaming responses use get_tenant_stream_connection instead.
+    """
+    _require_tenant(auth)
+    async with db.lazy_connection(str(auth.tenant_id), session=_session(auth)) as conn:
+        yield conn
+
+
+def get_tenant_stream_connection(
+    auth: AuthContext = Depends(get_auth_context),
+) -> LazyTenantConnection:
+    """
+    Tenant connection owned by a streaming response body rather than the
+    request: hand it to app.core.streaming.release_after() with the body,
+    which commits and releases it when the stream ends. Nothing is checked
+    out until the stream's first query.
     """
-    tenant_id = token_payload.get("tid")
-    if not tenant_id:
+    _require_tenant(auth)
+    return LazyTenantConnection(db, str(auth.tenant_id), _session(auth))
+
+
+def _require_tenant(auth: AuthContext) -> None:
+    if not auth.tenant_id:
         raise HTTPException(
             status.HTTP_400_BAD_REQUEST,
             "Tenant ID missing in token",
         )
 
-    async for conn in db.get_connection(tenant_id):
-        yield conn
+
+def _session(auth: AuthContext) -> Optional[str]:
+    return f"{auth.tenant_id}:{auth.user_id}" if auth.user_id else None
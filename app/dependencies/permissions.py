@@ -2,57 +2,39 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Set, List
-from uuid import UUID
+from typing import List
 
 from fastapi import Depends, HTTPException, Request, status
 
-from app.core.security import get_bearer_token, decode_token
+from app.dependencies.auth_context import get_auth_context
 from app.dependencies.database import get_tenant_db_connection
-from app.modules.users.repository import UserRepository
+from app.modules.roles.permission_registry import permission_registry
 
 
-def _normalize_permissions(perms: Iterable[str] | None) -> Set[str]:
-    """
-    Normalize permissions into a set of strings.
-    """
-    if not perms:
-        return set()
-    return {str(p) for p in perms}
-
-
-async def _get_effective_permissions(
+async def _missing_permissions(
     request: Request,
-    conn=Depends(get_tenant_db_connection),
-) -> Set[str]:
-    """
-    Extract effective permissions from the JWT.
-    If they are not present in the token, fall back to loading from DB.
+    conn,
+    required: List[str],
+) -> List[str]:
     """
-    token = get_bearer_token(request)
-    payload = decode_token(token)
-
-    # 1) Prefer permissions embedded in the token
-    perms = payload.get("permissions")
-    if perms is not None:
-        return _normalize_permissions(perms)
-
-    # 2) Fallback: load from DB via UserRepository
-    user_id_str = payload.get("sub")
-    tenant_id = getattr(request.state, "tenant_id", None)
-
-    if not user_id_str or not tenant_id:
-        # No way to resolve permissions, treat as no permissions
-        return set()
-
-    try:
-        user_id = UUID(user_id_str)
-    except ValueError:
-        return set()
+    Required keys the caller does not hold.
 
-    repo = UserRepository(conn)
-    ctx = await repo.get_user_context(user_id, tenant_id)
-    return _normalize_permissions(getattr(ctx, "permissions", []))
+    Effective permissions are compiled once per request into a bitmask
+    (see permission_registry), so the check itself is a single AND with the
+    requirement mask. Wildcard grants ("*", "tenant.*") are folded into the
+    mask at compile time. If the registry is missing a key, it is reloaded
+    once and the check retried.
+    """
+    ctx = await get_auth_context(request)
+    grants = await ctx.get_permissions(conn)
+
+    missing = permission_registry.missing(await ctx.get_permission_mask(conn), grants, required)
+    if missing and permission_registry.stale:
+        await permission_registry.ensure_current(conn)
+        missing = permission_registry.missing(
+            await ctx.get_permission_mask(conn), grants, required
+        )
+    return missing
 
 
 def require_permission(required_perm: str):
@@ -63,34 +45,23 @@ def require_permission(required_perm: str):
         @router.get("/something", dependencies=[Depends(require_permission("user.read"))])
         async def handler(...):
             ...
+
+    Wildcards:
+        "*"           => full access
+        "tenant.*"    => any tenant-scoped permission
     """
+    required = [required_perm]
 
     async def permission_checker(
         request: Request,
-        conn=Depends(get_tenant_db_connection),
+        conn=Depends(get_tenant_db_connection, scope="function"),
     ) -> bool:
-        effective_permissions = await _get_effective_permissions(request, conn)
-
-        # Wildcards:
-        #   "*"           => full access
-        #   "tenant.*"    => any tenant-scoped permission
-        if "*" in effective_permissions:
-            return True
-
-        # Direct match
-        if required_perm in effective_permissions:
-            return True
-
-        # Prefix wildcard: "tenant.manage" is satisfied by "tenant.*"
-        if "." in required_perm:
-            prefix = required_perm.split(".", 1)[0] + ".*"
-            if prefix in effective_permissions:
-                return True
-
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Missing required permission: {required_perm}",
-        )
+        if await _missing_permissions(request, conn, required):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Missing required permission: {required_perm}",
+            )
+        return True
 
     return permission_checker
 
@@ -105,15 +76,15 @@ def require_permissions(required: List[str]):
     will work with this version.
 
     It does NOT take a 'user' object anymore; it reads from the JWT / DB.
+    Wildcard grants are honoured the same way as in require_permission.
     """
+    required = list(required)
 
     async def checker(
         request: Request,
-        conn=Depends(get_tenant_db_connection),
+        conn=Depends(get_tenant_db_connection, scope="function"),
     ) -> bool:
-        effective_permissions = await _get_effective_permissions(request, conn)
-
-        missing = [p for p in required if p not in effective_permissions]
+        missing = await _missing_permissions(request, conn, required)
         if missing:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
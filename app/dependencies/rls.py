@@ -2,9 +2,8 @@
 
 from uuid import UUID
 from fastapi import Request, HTTPException, status
-from jose import jwt, JWTError
 
-from app.core.config import settings
+from app.dependencies.auth_context import try_build_auth_context
 
 
 async def tenant_context_middleware(request: Request, call_next):
@@ -33,29 +32,17 @@ async def tenant_context_middleware(request: Request, call_next):
             pass
 
     # 2) JWT 'tid' claim
-    auth = request.headers.get("Authorization")
-    if auth and auth.startswith("Bearer "):
-        token = auth.split(" ", 1)[1].strip()
-        try:
-            payload = jwt.decode(
-                token,
-                settings.SECRET_KEY,
-                algorithms=[settings.ALGORITHM],
-            )
-            tid = payload.get("tid")
-            if tid:
-                try:
-                    token_tid = UUID(tid)
-                except ValueError:
-                    token_tid = None
-
-                # If we didn't already set tenant_id from header, use token
-                if not hasattr(request.state, "tenant_id"):
-                    request.state.tenant_id = token_tid
-
-        except (JWTError, ValueError):
-            # Ignore; some endpoints are public (e.g. invitation accept, password reset)
-            pass
+    # Decoding here also primes request.state.auth, so dependencies reuse
+    # the verified claims instead of decoding the token again. Invalid or
+    # missing tokens are ignored; some endpoints are public (e.g. invitation
+    # accept, password reset).
+    ctx = try_build_auth_context(request)
+    if ctx is not None and ctx.tenant_id is not None:
+        token_tid = ctx.tenant_id
+
+        # If we didn't already set tenant_id from header, use token
+        if not hasattr(request.state, "tenant_id"):
+            request.state.tenant_id = token_tid
 
     # 3) If both header and token tenant IDs exist and conflict → error
     if header_tid and token_tid and header_tid != token_tid:
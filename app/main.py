@@ -2,6 +2,8 @@
 
 from contextlib import asynccontextmanager
 import logging
+import time
+from uuid import uuid4
 
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
@@ -10,8 +12,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.database import db
 from app.core.cache import cache
+from app.core.jwks import jwks_store
+from app.core.password_hasher import password_hasher
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.query_log import RequestQueryStats, current_request_queries, query_metrics
 
 from app.dependencies.rls import tenant_context_middleware
+from app.modules.audit.buffer import audit_buffer
+from app.modules.audit.partitions import audit_partitions
+from app.modules.auth.revocation import revocation_store
+from app.modules.roles.permission_registry import permission_registry
 
 # Routers
 from app.modules.tenants.router import router as tenants_router
@@ -36,13 +46,39 @@ async def lifespan(app: FastAPI):
     Application startup/shutdown lifecycle.
     - Connect DB pool
     - Connect Redis
+    - Re-publish active token revocations to Redis
+    - Load the permission bit registry
+    - Load and keep refreshing IdP signing keys (AUTH_MODE="external")
+    - Run the write-behind audit buffer (flushed on shutdown)
+    - Maintain audit_logs partitions and retention
     """
     logger.info("Starting QLAWS application...")
     await db.connect()
     await cache.connect()
     logger.info("Database and cache connections established.")
+    try:
+        warmed = await revocation_store.warm()
+        logger.info(f"Token revocation cache warmed ({warmed} entries).")
+    except Exception as ex:
+        logger.warning(f"Token revocation cache warm-up skipped: {ex}")
+    try:
+        await permission_registry.load()
+        logger.info(f"Permission registry loaded ({len(permission_registry.keys)} keys).")
+    except Exception as ex:
+        logger.warning(f"Permission registry load deferred: {ex}")
+    if settings.AUTH_MODE == "external":
+        await jwks_store.start()
+    if settings.AUDIT_WRITE_BEHIND:
+        await audit_buffer.start()
+    if settings.AUDIT_PARTITIONING:
+        await audit_partitions.start()
     yield
     logger.info("Shutting down QLAWS application...")
+    await audit_partitions.close()
+    # Drain buffered audit events before the database goes away
+    await audit_buffer.close()
+    await jwks_store.close()
+    password_hasher.shutdown()
     await db.disconnect()
     await cache.close()
     logger.info("Database and cache connections closed.")
@@ -61,6 +97,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Tenant context middleware (X-Tenant-ID + JWT tid)
@@ -124,6 +161,36 @@ app.include_router(scim_router)
 # -------------------------------------------------------------------
 @app.middleware("http")
 async def add_request_id_and_log(request: Request, call_next):
-    # Placeholder for request logging / tracing
-    response = await call_next(request)
+    """
+    - Assign a request id (honours an incoming X-Request-ID)
+    - Collect per-request DB statement count / time (app.core.query_log)
+    - Flag requests that exceed their route's query budget
+    """
+    request_id = request.headers.get("X-Request-ID") or uuid4().hex
+    request.state.request_id = request_id
+    stats = RequestQueryStats(request_id)
+    token = current_request_queries.set(stats)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_request_queries.reset(token)
+
+    route = request.scope.get("route")
+    route_key = f"{request.method} {getattr(route, 'path', request.url.path)}"
+    over_budget = query_metrics.check_budget(route_key, stats)
+
+    response.headers["X-Request-ID"] = request_id
+    response.headers["X-Query-Count"] = str(stats.count)
+    logger.info(
+        "%s %s -> %s in %.1fms (%d queries, %.1fms db%s) request=%s",
+        request.method,
+        request.url.path,
+        response.status_code,
+        (time.perf_counter() - started) * 1000,
+        stats.count,
+        stats.db_seconds * 1000,
+        ", OVER BUDGET" if over_budget else "",
+        request_id,
+    )
     return response
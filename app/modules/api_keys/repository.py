@@ -1,13 +1,65 @@
 # app/modules/api_keys/repository.py
 
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from asyncpg import Connection
 
 from app.modules.api_keys.schemas import ApiKeyResponse, ApiKeyInfo
+from app.core.database import read_only
+from app.core.pagination import DEFAULT_PAGE_SIZE
+from app.core.statements import define
 
 
+_CREATE = define(
+    "api_keys.create",
+    """
+    INSERT INTO api_keys (
+        api_key_id,
+        tenant_id,
+        name,
+        hashed_key,
+        scopes
+    )
+    VALUES (
+        uuid_generate_v4(),
+        current_setting('app.current_tenant_id', true)::uuid,
+        $1,
+        $2,
+        $3::text[]
+    )
+    RETURNING api_key_id, name, scopes, created_at
+    """,
+)
+
+_LIST_KEYS = define(
+    "api_keys.list_keys",
+    """
+    SELECT api_key_id, name, scopes, created_at
+    FROM api_keys
+    WHERE ($1::timestamptz IS NULL OR (created_at, api_key_id) < ($1::timestamptz, $2::uuid))
+    ORDER BY created_at DESC, api_key_id DESC
+    LIMIT $3
+    """,
+)
+
+_DELETE = define(
+    "api_keys.delete",
+    """
+    DELETE FROM api_keys WHERE api_key_id = $1
+    """,
+)
+
+_GET_BY_HASHED_KEY = define(
+    "api_keys.get_by_hashed_key",
+    """
+    SELECT api_key_id, tenant_id, scopes
+    FROM api_keys
+    WHERE hashed_key = $1
+    """,
+)
+
 class ApiKeyRepository:
     """
     Tenant-scoped API key repository.
@@ -31,52 +83,32 @@ class ApiKeyRepository:
         scopes: list[str],
     ) -> ApiKeyResponse:
         row = await self.conn.fetchrow(
-            """
-            INSERT INTO api_keys (
-                api_key_id,
-                tenant_id,
-                name,
-                hashed_key,
-                scopes
-            )
-            VALUES (
-                uuid_generate_v4(),
-                current_setting('app.current_tenant_id', true)::uuid,
-                $1,
-                $2,
-                $3::text[]
-            )
-            RETURNING api_key_id, name, scopes, created_at
-            """,
+            _CREATE,
             name,
             hashed_key,
             scopes,
         )
         return ApiKeyResponse(**row)
 
-    async def list_keys(self) -> List[ApiKeyResponse]:
+    @read_only
+    async def list_keys(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[ApiKeyResponse]:
+        after_ts, after_id = after or (None, None)
         rows = await self.conn.fetch(
-            """
-            SELECT api_key_id, name, scopes, created_at
-            FROM api_keys
-            ORDER BY created_at DESC
-            """
+            _LIST_KEYS, after_ts, after_id, limit
         )
         return [ApiKeyResponse(**r) for r in rows]
 
     async def delete(self, api_key_id: UUID) -> None:
         await self.conn.execute(
-            "DELETE FROM api_keys WHERE api_key_id = $1",
+            _DELETE,
             api_key_id,
         )
 
     async def get_by_hashed_key(self, hashed_key: str) -> Optional[ApiKeyInfo]:
         row = await self.conn.fetchrow(
-            """
-            SELECT api_key_id, tenant_id, scopes
-            FROM api_keys
-            WHERE hashed_key = $1
-            """,
+            _GET_BY_HASHED_KEY,
             hashed_key,
         )
         return ApiKeyInfo(**row) if row else None
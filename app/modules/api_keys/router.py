@@ -3,8 +3,9 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 
+from app.core.pagination import PageParams, page_params, set_next_cursor
 from app.dependencies.database import get_tenant_db_connection
 from app.dependencies.permissions import require_permissions
 from app.modules.api_keys.schemas import (
@@ -22,7 +23,7 @@ router = APIRouter(
 )
 
 
-def get_api_key_service(conn=Depends(get_tenant_db_connection)) -> ApiKeyService:
+def get_api_key_service(conn=Depends(get_tenant_db_connection, scope="function")) -> ApiKeyService:
     repo = ApiKeyRepository(conn)
     audit = AuditRepository(conn)
     return ApiKeyService(repo, audit)
@@ -47,9 +48,13 @@ async def create_api_key(
     dependencies=[Depends(require_permissions(["api_key.manage"]))],
 )
 async def list_api_keys(
+    response: Response,
+    page: PageParams = Depends(page_params),
     service: ApiKeyService = Depends(get_api_key_service),
 ):
-    return await service.list_keys()
+    keys, next_cursor = await service.list_keys(page)
+    set_next_cursor(response, next_cursor)
+    return keys
 
 
 @router.delete(
@@ -2,7 +2,7 @@
 
 import secrets
 import hashlib
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from fastapi import HTTPException, status
 
@@ -12,10 +12,13 @@ from app.modules.api_keys.schemas import (
     ApiKeyWithPlain,
     ApiKeyInfo,
 )
+from app.core.pagination import PageParams, created_keyset, fetch_page
 from app.modules.api_keys.repository import ApiKeyRepository
 from app.modules.audit.repository import AuditRepository
 from app.modules.audit.schemas import AuditLogCreate
 
+API_KEY_KEYSET = created_keyset("api_key_id")
+
 
 class ApiKeyService:
     """
@@ -60,8 +63,8 @@ class ApiKeyService:
     # ---------------------------------------------------------
     # LIST / DELETE
     # ---------------------------------------------------------
-    async def list_keys(self) -> List[ApiKeyResponse]:
-        return await self.repo.list_keys()
+    async def list_keys(self, page: PageParams = PageParams()) -> Tuple[List[ApiKeyResponse], Optional[str]]:
+        return await fetch_page(self.repo.list_keys, page, API_KEY_KEYSET)
 
     async def delete_key(self, api_key_id) -> None:
         await self.repo.delete(api_key_id)
@@ -0,0 +1,337 @@
+# app/modules/audit/buffer.py
+
+"""
+Write-behind audit pipeline.
+
+AuditRepository.log_event no longer INSERTs inside the request
+transaction. The event is queued on the request connection and handed to
+the AuditBuffer once that transaction commits, so a rolled-back request
+leaves no audit trail, as before. It costs no extra round trip either.
+
+- The buffer is bounded (AUDIT_BUFFER_MAX_EVENTS). When it is full,
+  producers wait up to AUDIT_ENQUEUE_TIMEOUT_SECONDS for the flusher to
+  make room (backpressure), then write their event themselves rather
+  than drop it.
+- A background task flushes every AUDIT_FLUSH_INTERVAL_SECONDS, or as
+  soon as AUDIT_BATCH_SIZE events are waiting. It writes on a dedicated
+  connection outside the request pool: one multi-row INSERT ... unnest()
+  per tenant, in one transaction. (COPY FROM is rejected on tables under
+  row-level security, so it is not an option for audit_logs.)
+- A failed flush keeps its events and retries with backoff. After
+  AUDIT_FLUSH_MAX_ATTEMPTS failures the head batch is written row by
+  row; rows the database rejects are dead-lettered (logged and dropped)
+  so one bad event cannot stall the queue. Connection errors never
+  dead-letter anything.
+- close() (lifespan shutdown) drains everything that is still queued.
+- audit_rollups_hourly is maintained by a trigger on audit_logs.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID, uuid4
+
+from asyncpg import exceptions as pg_errors
+
+from app.core.config import settings
+from app.core.database import SET_TENANT_SQL, db
+from app.core.statements import define
+
+logger = logging.getLogger("uvicorn")
+
+_INSERT_BATCH = define(
+    "audit.insert_batch",
+    """
+    INSERT INTO audit_logs (
+        audit_id,
+        tenant_id,
+        actor_user_id,
+        action_type,
+        resource_type,
+        resource_id,
+        ip_address,
+        details,
+        created_at
+    )
+    SELECT a, t, u, act, rt, rid, ip, d::jsonb, c
+    FROM unnest(
+        $1::uuid[],
+        $2::uuid[],
+        $3::uuid[],
+        $4::text[],
+        $5::text[],
+        $6::text[],
+        $7::text[],
+        $8::text[],
+        $9::timestamptz[]
+    ) AS e(a, t, u, act, rt, rid, ip, d, c)
+    """,
+)
+
+
+# Failures that say nothing about the row itself: retry, never dead-letter
+_TRANSIENT_ERRORS = (
+    pg_errors.PostgresConnectionError,
+    pg_errors.InsufficientResourcesError,
+    pg_errors.OperatorInterventionError,
+)
+
+
+def _is_rejected_row(ex: Exception) -> bool:
+    """True if the database (or the driver, encoding it) refused the row."""
+    if isinstance(ex, _TRANSIENT_ERRORS):
+        return False
+    return isinstance(ex, (pg_errors.PostgresError, ValueError, TypeError))
+
+
+class AuditEvent(NamedTuple):
+    audit_id: UUID
+    tenant_id: str
+    actor_user_id: Optional[UUID]
+    action_type: str
+    resource_type: str
+    resource_id: str
+    ip_address: Optional[str]
+    details: str  # JSON text
+    created_at: datetime
+
+
+def make_event(
+    tenant_id: str,
+    actor_user_id: Optional[UUID],
+    action_type: str,
+    resource_type: str,
+    resource_id: str,
+    ip_address: Optional[str],
+    details_json: str,
+) -> AuditEvent:
+    return AuditEvent(
+        uuid4(),
+        str(tenant_id),
+        actor_user_id,
+        action_type,
+        resource_type,
+        resource_id,
+        ip_address,
+        details_json,
+        datetime.now(timezone.utc),
+    )
+
+
+class AuditBuffer:
+    def __init__(
+        self,
+        max_events: int,
+        batch_size: int,
+        flush_interval_seconds: float,
+        enqueue_timeout_seconds: float,
+        connect: Callable[[], Awaitable[Any]],
+        retry_backoff_seconds: float = 1.0,
+        max_attempts: int = 3,
+    ) -> None:
+        self.max_events = max_events
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.max_attempts = max_attempts
+        self._connect = connect
+
+        self._pending: Deque[AuditEvent] = deque()
+        self._conn: Optional[Any] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Condition] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._closing = False
+        self._head_failures = 0
+
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dead_lettered = 0
+        self.backpressure_waits = 0
+        self.direct_writes = 0
+        self.last_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._closing
+
+    # ------------------------------------------------------------------
+    # LIFECYCLE
+    # ------------------------------------------------------------------
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._write_lock = asyncio.Lock()
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the flusher and write out everything still queued."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wake.set()
+        try:
+            await self._task
+        except Exception as ex:
+            logger.warning("Audit flusher stopped with error: %s", ex)
+        self._task = None
+
+        for _ in range(3):
+            if not self._pending:
+                break
+            await self.flush()
+        if self._pending:
+            logger.error("Audit buffer closed with %d unwritten events", len(self._pending))
+        await self._drop_connection()
+
+    # ------------------------------------------------------------------
+    # PRODUCERS
+    # ------------------------------------------------------------------
+    async def submit(self, event: AuditEvent) -> None:
+        if self._closing:
+            # Committed after shutdown began: the final flush may be done
+            self.direct_writes += 1
+            await self._write([event])
+            return
+
+        if len(self._pending) >= self.max_events:
+            self.backpressure_waits += 1
+            try:
+                await asyncio.wait_for(self._wait_for_space(), self.enqueue_timeout_seconds)
+            except asyncio.TimeoutError:
+                # Still full: write this one ourselves rather than lose it
+                self.direct_writes += 1
+                await self._write([event])
+                return
+
+        self._pending.append(event)
+        self.enqueued += 1
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    async def _wait_for_space(self) -> None:
+        async with self._space:
+            await self._space.wait_for(lambda: len(self._pending) < self.max_events)
+
+    # ------------------------------------------------------------------
+    # FLUSHING
+    # ------------------------------------------------------------------
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if not await self.flush() and not self._closing:
+                await asyncio.sleep(self.retry_backoff_seconds)
+
+    async def flush(self) -> bool:
+        """Write all pending events in batches. False if a batch failed."""
+        while self._pending:
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            try:
+                if self._head_failures >= self.max_attempts:
+                    unwritten, error = await self._write_singly(batch)
+                else:
+                    unwritten, error = await self._write_batch(batch)
+            finally:
+                async with self._space:
+                    self._space.notify_all()
+            if unwritten:
+                self.failures += 1
+                self._head_failures += 1
+                self._pending.extendleft(reversed(unwritten))
+                logger.warning("Audit flush of %d events failed: %s", len(unwritten), error)
+                return False
+            self._head_failures = 0
+        return True
+
+    async def _write_batch(self, batch: List[AuditEvent]) -> Tuple[List[AuditEvent], Optional[Exception]]:
+        try:
+            await self._write(batch)
+        except Exception as ex:
+            return batch, ex
+        return [], None
+
+    async def _write_singly(self, batch: List[AuditEvent]) -> Tuple[List[AuditEvent], Optional[Exception]]:
+        """Write a repeatedly failing batch row by row, dead-lettering rejected rows."""
+        for index, event in enumerate(batch):
+            try:
+                await self._write([event])
+            except Exception as ex:
+                if not _is_rejected_row(ex):
+                    return batch[index:], ex
+                self.dead_lettered += 1
+                logger.error("Audit event dead-lettered (%s): %r", ex, event)
+        return [], None
+
+    async def _write(self, events: List[AuditEvent]) -> None:
+        by_tenant: Dict[str, List[AuditEvent]] = {}
+        for event in events:
+            by_tenant.setdefault(event.tenant_id, []).append(event)
+
+        started = time.perf_counter()
+        async with self._write_lock:
+            conn = await self._connection()
+            try:
+                async with conn.transaction():
+                    for tenant_id, tenant_events in by_tenant.items():
+                        # audit_logs is under RLS: insert as that tenant
+                        await conn.execute(SET_TENANT_SQL, tenant_id)
+                        columns = [list(col) for col in zip(*tenant_events)]
+                        await conn.execute(_INSERT_BATCH, *columns)
+            except Exception:
+                await self._drop_connection()
+                raise
+        self.batches += 1
+        self.written += len(events)
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+
+    async def _connection(self) -> Any:
+        if self._conn is None:
+            self._conn = await self._connect()
+        return self._conn
+
+    async def _drop_connection(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "pending": len(self._pending),
+            "max_events": self.max_events,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dead_lettered": self.dead_lettered,
+            "backpressure_waits": self.backpressure_waits,
+            "direct_writes": self.direct_writes,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+        }
+
+
+audit_buffer = AuditBuffer(
+    max_events=settings.AUDIT_BUFFER_MAX_EVENTS,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval_seconds=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    enqueue_timeout_seconds=settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS,
+    max_attempts=settings.AUDIT_FLUSH_MAX_ATTEMPTS,
+    connect=db.dedicated_connection,
+)
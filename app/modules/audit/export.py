@@ -0,0 +1,268 @@
+# app/modules/audit/export.py
+
+"""
+Bulk audit export for compliance pulls: a tenant's events for a date range
+as NDJSON or CSV, gzip- or zstd-compressed.
+
+Rows come straight from Postgres via `COPY (SELECT ...) TO STDOUT` on a
+connection already inside the tenant's RLS context. (COPY TO a query
+honours row-level security; COPY of the table itself does not run under
+RLS.) Each chunk COPY hands back is compressed and passed on, so memory
+stays flat however large the export is:
+
+- HTTP (GET /audit/export): the COPY runs on the response's own tenant
+  connection (get_tenant_stream_connection) and feeds a bounded queue
+  (AUDIT_EXPORT_QUEUE_CHUNKS) that the streaming response drains. A slow
+  client slows the COPY down instead of piling bytes up in memory.
+- CLI: the COPY runs on a dedicated connection and writes to a file or
+  stdout:
+
+    python -m app.modules.audit.export --tenant-id <uuid> \\
+        --since 2026-01-01 --until 2026-04-01 --format csv --compression zstd \\
+        --output audit-q1.csv.zst
+
+NDJSON lines are built by row_to_json() in Postgres. The COPY is in CSV
+mode with a quote and delimiter that JSON never contains unescaped, so
+lines pass through byte for byte.
+
+zstd needs the optional `zstandard` package.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import sys
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.database import db, set_tenant_context
+from app.core.statements import define
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd exports only
+    zstandard = None
+
+FORMATS: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# name -> (media type of the compressed download, file suffix)
+COMPRESSIONS: Dict[str, tuple] = {
+    "gzip": ("application/gzip", ".gz"),
+    "zstd": ("application/zstd", ".zst"),
+    "none": (None, ""),
+}
+
+_EXPORT_CSV = define(
+    "audit.export_csv",
+    """
+    SELECT
+        audit_id,
+        tenant_id,
+        actor_user_id,
+        action_type,
+        resource_type,
+        resource_id,
+        ip_address,
+        details,
+        created_at
+    FROM audit_logs
+    WHERE tenant_id = $1
+      AND ($2::timestamptz IS NULL OR created_at >= $2)
+      AND ($3::timestamptz IS NULL OR created_at < $3)
+    ORDER BY created_at, audit_id
+    """,
+)
+
+_EXPORT_NDJSON = define(
+    "audit.export_ndjson",
+    """
+    SELECT row_to_json(e)::text
+    FROM (
+        SELECT
+            audit_id,
+            tenant_id,
+            actor_user_id,
+            action_type,
+            resource_type,
+            resource_id,
+            ip_address,
+            details,
+            created_at
+        FROM audit_logs
+        WHERE tenant_id = $1
+          AND ($2::timestamptz IS NULL OR created_at >= $2)
+          AND ($3::timestamptz IS NULL OR created_at < $3)
+    ) e
+    ORDER BY e.created_at, e.audit_id
+    """,
+)
+
+# CSV mode with bytes JSON never emits raw: no quoting, no escaping.
+_NDJSON_COPY_OPTIONS = {"format": "csv", "quote": "\x01", "delimiter": "\x02"}
+_CSV_COPY_OPTIONS = {"format": "csv", "header": True}
+
+_DONE = object()
+
+
+class _Identity:
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+def compressor(compression: str) -> Any:
+    """A compressobj-style object (compress()/flush()) for `compression`."""
+    if compression == "gzip":
+        return zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip framing
+    if compression == "zstd":
+        if zstandard is None:
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                "zstd compression is not available on this server",
+            )
+        return zstandard.ZstdCompressor().compressobj()
+    if compression == "none":
+        return _Identity()
+    raise HTTPException(status.HTTP_400_BAD_REQUEST, f"Unknown compression: {compression}")
+
+
+def export_filename(tenant_id: UUID, fmt: str, compression: str) -> str:
+    return f"audit-{tenant_id}.{fmt}{COMPRESSIONS[compression][1]}"
+
+
+def export_media_type(fmt: str, compression: str) -> str:
+    return COMPRESSIONS[compression][0] or FORMATS[fmt]
+
+
+async def copy_audit_events(
+    conn: Any,
+    tenant_id: UUID,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    fmt: str,
+    output: Callable[[bytes], Awaitable[None]],
+) -> None:
+    """
+    COPY the tenant's events in [since, until) to `output`, oldest first.
+    `conn` must already be in the tenant's RLS context.
+    """
+    if fmt == "ndjson":
+        query, options = _EXPORT_NDJSON, _NDJSON_COPY_OPTIONS
+    elif fmt == "csv":
+        query, options = _EXPORT_CSV, _CSV_COPY_OPTIONS
+    else:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, f"Unknown export format: {fmt}")
+    await conn.copy_from_query(query, tenant_id, since, until, output=output, **options)
+
+
+def stream_export(
+    conn: Any,
+    tenant_id: UUID,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    fmt: str,
+    compression: str,
+    queue_chunks: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Compressed export bytes for a streaming response. Arguments are
+    validated here, before the response starts.
+    """
+    if fmt not in FORMATS:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, f"Unknown export format: {fmt}")
+    comp = compressor(compression)
+    return _stream(conn, tenant_id, since, until, fmt, comp, queue_chunks or settings.AUDIT_EXPORT_QUEUE_CHUNKS)
+
+
+async def _stream(conn, tenant_id, since, until, fmt, comp, queue_chunks) -> AsyncIterator[bytes]:
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_chunks)
+
+    async def sink(data: bytes) -> None:
+        out = comp.compress(data)
+        if out:
+            await queue.put(out)
+
+    async def produce() -> None:
+        try:
+            await copy_audit_events(conn, tenant_id, since, until, fmt, sink)
+            tail = comp.flush()
+            if tail:
+                await queue.put(tail)
+        finally:
+            await queue.put(_DONE)
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is _DONE:
+                break
+            yield chunk
+        await task  # surfaces a failed COPY: the download ends truncated
+    finally:
+        if not task.done():
+            # Client went away mid-export
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+async def export_to_file(
+    tenant_id: UUID,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    fmt: str,
+    compression: str,
+    out: Any,
+) -> None:
+    comp = compressor(compression)
+
+    async def sink(data: bytes) -> None:
+        out.write(comp.compress(data))
+
+    conn = await db.dedicated_connection()
+    try:
+        async with conn.transaction(readonly=True):
+            await set_tenant_context(conn, tenant_id)
+            await copy_audit_events(conn, tenant_id, since, until, fmt, sink)
+        out.write(comp.flush())
+        out.flush()
+    finally:
+        await conn.close()
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export a tenant's audit events.")
+    parser.add_argument("--tenant-id", type=UUID, required=True)
+    parser.add_argument("--since", type=datetime.fromisoformat, help="inclusive, ISO 8601")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="exclusive, ISO 8601")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="ndjson")
+    parser.add_argument("--compression", choices=sorted(COMPRESSIONS), default="gzip")
+    parser.add_argument("--output", "-o", default="-", help="file path, or - for stdout")
+    args = parser.parse_args(argv)
+
+    if args.compression == "zstd" and zstandard is None:
+        parser.error("zstd compression needs the 'zstandard' package")
+
+    with contextlib.ExitStack() as stack:
+        out = sys.stdout.buffer if args.output == "-" else stack.enter_context(open(args.output, "wb"))
+        asyncio.run(
+            export_to_file(args.tenant_id, args.since, args.until, args.format, args.compression, out)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+# app/modules/audit/partitions.py
+
+"""
+Time-range partition maintenance for audit_logs.
+
+When audit_logs is declared `PARTITION BY RANGE (<timestamp column>)`
+(authz_db_schema.sql partitions on event_time), this manager keeps the
+layout healthy so inserts land in small, right-sized partitions and
+time-bounded queries prune to a handful of them:
+
+- Pre-creation: the current period and the next AUDIT_PARTITION_PRECREATE
+  periods ("month" or "day") always exist, named audit_logs_YYYY_MM or
+  audit_logs_YYYY_MM_DD.
+- Stragglers: rows that fell into the DEFAULT partition are moved into a
+  proper partition. The partition is built as a plain table, the rows are
+  moved into it with one DELETE ... RETURNING, and then it is ATTACHed, all
+  in one transaction.
+- Retention: a partition whose whole range is older than the longest
+  per-plan retention (AUDIT_RETENTION_DAYS_BY_PLAN) is DETACHed and
+  DROPped. There is no row-by-row DELETE.
+
+  Partitions are per time, not per tenant, so a plan with a shorter
+  retention cannot be enforced by dropping. Once a partition is past a
+  shorter retention, the tenants on that plan are purged from it with a
+  single `DELETE ... WHERE tenant_id = $1` on the partition. That happens
+  once per partition and tier, never as a table-wide time-range DELETE.
+
+Partitions are addressed directly, and they carry no RLS of their own.
+Plans are read per tenant inside that tenant's RLS context, because
+tenants is under FORCE ROW LEVEL SECURITY.
+
+One instance does the work at a time (advisory lock). DDL runs with
+AUDIT_PARTITION_LOCK_TIMEOUT_MS, so it never queues request traffic
+behind it. If audit_logs is not range-partitioned, the manager does
+nothing.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.database import SET_TENANT_SQL, db
+
+logger = logging.getLogger("uvicorn")
+
+INTERVALS = ("month", "day")
+
+# Catalog lookups (not registered statements: they run on the maintenance
+# connection only, never through the request pool)
+_TRY_LOCK = "SELECT pg_try_advisory_lock(hashtext($1))"
+_UNLOCK = "SELECT pg_advisory_unlock(hashtext($1))"
+
+_PARTITION_LAYOUT = """
+    SELECT
+        a.attname AS key_column,
+        (SELECT relname FROM pg_class WHERE oid = p.partdefid) AS default_partition
+    FROM pg_partitioned_table p
+    JOIN pg_attribute a
+      ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0]
+    WHERE p.partrelid = to_regclass($1)
+      AND p.partstrat = 'r'
+      AND p.partnatts = 1
+"""
+
+_LIST_PARTITIONS = """
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = to_regclass($1)
+"""
+
+_TENANT_PLAN = "SELECT plan FROM tenants WHERE tenant_id = $1"
+
+_NAME_SUFFIX = re.compile(r"_(\d{4})_(\d{2})(?:_(\d{2}))?$")
+
+Range = Tuple[str, datetime, datetime]
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(ts: datetime) -> str:
+    return "'" + ts.isoformat() + "'"
+
+
+def period_start(ts: datetime, interval: str) -> datetime:
+    ts = ts.astimezone(timezone.utc)
+    if interval == "day":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_period(start: datetime, interval: str) -> datetime:
+    if interval == "day":
+        return start + timedelta(days=1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_name(table: str, start: datetime, interval: str) -> str:
+    if interval == "day":
+        return f"{table}_{start:%Y_%m_%d}"
+    return f"{table}_{start:%Y_%m}"
+
+
+def parse_partition(table: str, name: str) -> Optional[Range]:
+    """
+    (name, lower, upper) for a partition named by this manager (or in its
+    style, like the hand-written audit_logs_2025_11); None otherwise.
+    """
+    if not name.startswith(table + "_"):
+        return None
+    match = _NAME_SUFFIX.fullmatch(name[len(table):])
+    if match is None:
+        return None
+    year, month, day = match.groups()
+    try:
+        lower = datetime(int(year), int(month), int(day or 1), tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    interval = "day" if day else "month"
+    return name, lower, next_period(lower, interval)
+
+
+def _overlaps(partitions: List[Range], lower: datetime, upper: datetime) -> bool:
+    return any(lo < upper and lower < hi for _, lo, hi in partitions)
+
+
+class AuditPartitionManager:
+    def __init__(
+        self,
+        interval: str,
+        precreate: int,
+        retention_days_by_plan: Dict[str, int],
+        check_interval_seconds: float,
+        lock_timeout_ms: int,
+        connect: Callable[[], Awaitable[Any]],
+        table: str = "audit_logs",
+    ) -> None:
+        if interval not in INTERVALS:
+            raise ValueError(f"AUDIT_PARTITION_INTERVAL must be one of {INTERVALS}")
+        self.interval = interval
+        self.precreate = precreate
+        self.retention_days_by_plan = dict(retention_days_by_plan)
+        self.check_interval_seconds = check_interval_seconds
+        self.lock_timeout_ms = lock_timeout_ms
+        self.table = table
+        self._connect = connect
+
+        self._task: Optional[asyncio.Task] = None
+        # (partition, retention days) already purged by this process
+        self._purged: Set[Tuple[str, int]] = set()
+
+        self.partitioned: Optional[bool] = None
+        self.key_column: Optional[str] = None
+        self.runs = 0
+        self.skipped = 0
+        self.failures = 0
+        self.partitions_created = 0
+        self.rows_moved = 0
+        self.partitions_dropped = 0
+        self.tenant_purges = 0
+        self.last_run_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # LIFECYCLE
+    # ------------------------------------------------------------------
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as ex:
+                self.failures += 1
+                logger.warning(f"Audit partition maintenance failed: {ex}")
+            await asyncio.sleep(self.check_interval_seconds)
+
+    # ------------------------------------------------------------------
+    # MAINTENANCE
+    # ------------------------------------------------------------------
+    async def run_once(self, now: Optional[datetime] = None) -> None:
+        now = now or datetime.now(timezone.utc)
+        started = time.perf_counter()
+        conn = await self._connect()
+        try:
+            if not await conn.fetchval(_TRY_LOCK, self.table):
+                self.skipped += 1  # another instance is on it
+                return
+            try:
+                await conn.execute(f"SET lock_timeout = {int(self.lock_timeout_ms)}")
+                layout = await conn.fetchrow(_PARTITION_LAYOUT, self.table)
+                if layout is None:
+                    if self.partitioned is not False:
+                        logger.info(f"{self.table} is not range-partitioned; partition manager idle.")
+                    self.partitioned = False
+                    return
+                self.partitioned = True
+                self.key_column = layout["key_column"]
+                default = layout["default_partition"]
+
+                partitions = await self._partitions(conn)
+                if default:
+                    await self._move_stragglers(conn, default, partitions)
+                await self._precreate(conn, now, default, partitions)
+                await self._enforce_retention(conn, now, partitions)
+            finally:
+                await conn.execute(_UNLOCK, self.table)
+        finally:
+            await conn.close()
+            self.runs += 1
+            self.last_run_ms = (time.perf_counter() - started) * 1000
+
+    async def _partitions(self, conn: Any) -> List[Range]:
+        rows = await conn.fetch(_LIST_PARTITIONS, self.table)
+        parsed = (parse_partition(self.table, r["relname"]) for r in rows)
+        return sorted((p for p in parsed if p is not None), key=lambda p: p[1])
+
+    async def _move_stragglers(self, conn: Any, default: str, partitions: List[Range]) -> None:
+        periods = await conn.fetch(
+            f"SELECT DISTINCT date_trunc('{self.interval}', {_ident(self.key_column)} AT TIME ZONE 'UTC')"
+            f" AS period FROM {_ident(default)}"
+        )
+        for row in periods:
+            lower = row["period"].replace(tzinfo=timezone.utc)
+            upper = next_period(lower, self.interval)
+            if _overlaps(partitions, lower, upper):
+                # Can't attach over an existing range; leave for an operator
+                logger.warning(f"{default} holds rows for {lower:%Y-%m-%d} overlapping an existing partition")
+                continue
+            await self._create_partition(conn, lower, upper, default, partitions)
+
+    async def _precreate(
+        self, conn: Any, now: datetime, default: Optional[str], partitions: List[Range]
+    ) -> None:
+        lower = period_start(now, self.interval)
+        for _ in range(self.precreate + 1):
+            upper = next_period(lower, self.interval)
+            if not _overlaps(partitions, lower, upper):
+                await self._create_partition(conn, lower, upper, default, partitions)
+            lower = upper
+
+    async def _create_partition(
+        self,
+        conn: Any,
+        lower: datetime,
+        upper: datetime,
+        default: Optional[str],
+        partitions: List[Range],
+    ) -> None:
+        name = partition_name(self.table, lower, self.interval)
+        parent, partition = _ident(self.table), _ident(name)
+        bounds = f"FROM ({_literal(lower)}) TO ({_literal(upper)})"
+
+        if default is None:
+            await conn.execute(f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF {parent} FOR VALUES {bounds}")
+            moved = 0
+        else:
+            # A range can only be attached once the default partition holds
+            # none of its rows: build the table, move them, then attach.
+            key = _ident(self.key_column)
+            async with conn.transaction():
+                await conn.execute(
+                    f"CREATE TABLE {partition} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                )
+                status = await conn.execute(
+                    f"WITH moved AS ("
+                    f" DELETE FROM {_ident(default)}"
+                    f" WHERE {key} >= {_literal(lower)} AND {key} < {_literal(upper)}"
+                    f" RETURNING *"
+                    f") INSERT INTO {partition} SELECT * FROM moved"
+                )
+                await conn.execute(f"ALTER TABLE {parent} ATTACH PARTITION {partition} FOR VALUES {bounds}")
+            moved = int(status.split()[-1]) if status else 0
+
+        partitions.append((name, lower, upper))
+        partitions.sort(key=lambda p: p[1])
+        self.partitions_created += 1
+        self.rows_moved += moved
+        logger.info(f"Created audit partition {name}" + (f" ({moved} rows from default)" if moved else ""))
+
+    async def _enforce_retention(self, conn: Any, now: datetime, partitions: List[Range]) -> None:
+        if not self.retention_days_by_plan:
+            return
+        longest = max(self.retention_days_by_plan.values())
+        shortest = min(self.retention_days_by_plan.values())
+
+        for entry in list(partitions):
+            name, _, upper = entry
+            if upper <= now - timedelta(days=longest):
+                async with conn.transaction():
+                    await conn.execute(f"ALTER TABLE {_ident(self.table)} DETACH PARTITION {_ident(name)}")
+                    await conn.execute(f"DROP TABLE {_ident(name)}")
+                partitions.remove(entry)
+                self.partitions_dropped += 1
+                logger.info(f"Dropped audit partition {name} (past {longest}-day retention)")
+            elif upper <= now - timedelta(days=shortest):
+                await self._purge_short_retention(conn, now, name, upper)
+
+    async def _purge_short_retention(self, conn: Any, now: datetime, name: str, upper: datetime) -> None:
+        expired = {
+            days for days in self.retention_days_by_plan.values()
+            if upper <= now - timedelta(days=days)
+        }
+        if all((name, days) in self._purged for days in expired):
+            return
+
+        partition = _ident(name)
+        tenants = await conn.fetch(f"SELECT DISTINCT tenant_id FROM {partition}")
+        for row in tenants:
+            tenant_id = row["tenant_id"]
+            async with conn.transaction():
+                await conn.execute(SET_TENANT_SQL, str(tenant_id))
+                plan = await conn.fetchval(_TENANT_PLAN, tenant_id)
+            days = self.retention_days_by_plan.get(plan) if plan is not None else None
+            if days is not None and days in expired:
+                await conn.execute(f"DELETE FROM {partition} WHERE tenant_id = $1", tenant_id)
+                self.tenant_purges += 1
+        self._purged.update((name, days) for days in expired)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "partitioned": self.partitioned,
+            "key_column": self.key_column,
+            "interval": self.interval,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "partitions_created": self.partitions_created,
+            "rows_moved": self.rows_moved,
+            "partitions_dropped": self.partitions_dropped,
+            "tenant_purges": self.tenant_purges,
+            "last_run_ms": round(self.last_run_ms, 3),
+        }
+
+
+audit_partitions = AuditPartitionManager(
+    interval=settings.AUDIT_PARTITION_INTERVAL,
+    precreate=settings.AUDIT_PARTITION_PRECREATE,
+    retention_days_by_plan=settings.AUDIT_RETENTION_DAYS_BY_PLAN,
+    check_interval_seconds=settings.AUDIT_PARTITION_CHECK_INTERVAL_SECONDS,
+    lock_timeout_ms=settings.AUDIT_PARTITION_LOCK_TIMEOUT_MS,
+    connect=db.dedicated_connection,
+)
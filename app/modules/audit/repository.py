@@ -1,12 +1,119 @@
 # app/modules/audit/repository.py
 
 import json
-from typing import List, Optional, Any
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from asyncpg import Connection
 
-from app.modules.audit.schemas import AuditLogCreate, AuditLogEntry, AuditQuery, AuditLogResponse
+from app.modules.audit.buffer import audit_buffer, make_event
+from app.modules.audit.schemas import (
+    AuditLogCreate,
+    AuditLogEntry,
+    AuditLogResponse,
+    AuditQuery,
+    AuditRollupEntry,
+)
+from app.core.config import settings
+from app.core.database import LazyTenantConnection, read_only
+from app.core.pagination import DEFAULT_PAGE_SIZE
+from app.core.statements import define
+
+
+_INSERT_EVENT = define(
+    "audit.insert_event",
+    """
+    INSERT INTO audit_logs (
+        audit_id,
+        tenant_id,
+        actor_user_id,
+        action_type,
+        resource_type,
+        resource_id,
+        ip_address,
+        details
+    )
+    VALUES (
+        uuid_generate_v4(),
+        current_setting('app.current_tenant_id', true)::uuid,
+        $1,
+        $2,
+        $3,
+        $4,
+        $5,
+        $6::jsonb
+    )
+    """,
+)
+
+_LIST_LOGS = define(
+    "audit.list_logs",
+    """
+    SELECT
+        audit_id,
+        tenant_id,
+        actor_user_id,
+        action_type,
+        resource_type,
+        resource_id,
+        ip_address,
+        details,
+        created_at
+    FROM audit_logs
+    WHERE ($1::timestamptz IS NULL OR (created_at, audit_id) < ($1::timestamptz, $2::uuid))
+    ORDER BY created_at DESC, audit_id DESC
+    LIMIT $3
+    """,
+)
+
+# One statement for every filter combination: an absent filter is passed as
+# NULL and short-circuits its predicate. Keyset-paged on (created_at,
+# audit_id), newest first; served by idx_audit_logs_tenant_created_keyset,
+# or idx_audit_logs_tenant_actor_created when filtering by actor.
+_QUERY_EVENTS = define(
+    "audit.query_events",
+    """
+    SELECT
+        audit_id,
+        tenant_id,
+        actor_user_id,
+        action_type,
+        resource_type,
+        resource_id,
+        ip_address,
+        details,
+        created_at
+    FROM audit_logs
+    WHERE tenant_id = $1
+      AND ($2::text IS NULL OR action_type = $2)
+      AND ($3::text IS NULL OR resource_type = $3)
+      AND ($4::uuid IS NULL OR actor_user_id = $4)
+      AND ($5::timestamptz IS NULL OR created_at >= $5)
+      AND ($6::timestamptz IS NULL OR created_at <= $6)
+      AND ($7::timestamptz IS NULL OR (created_at, audit_id) < ($7::timestamptz, $8::uuid))
+    ORDER BY created_at DESC, audit_id DESC
+    LIMIT $9
+    """,
+)
+
+# Dashboard reads: pre-aggregated hourly rows, optionally folded into days
+_ROLLUPS = define(
+    "audit.rollups",
+    """
+    SELECT
+        date_trunc($5, hour AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' AS bucket,
+        action_type,
+        sum(event_count)::bigint AS event_count
+    FROM audit_rollups_hourly
+    WHERE tenant_id = $1
+      AND hour >= $2
+      AND hour < $3
+      AND ($4::text[] IS NULL OR action_type = ANY($4))
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    """,
+)
 
 
 class AuditRepository:
@@ -25,33 +132,33 @@ class AuditRepository:
             ip_address: Optional[str] = None,
     ) -> None:
         """
-        Insert an audit log entry.
+        Record an audit log entry.
+
+        On a request connection with the write-behind buffer running, the
+        event is handed to the buffer when the request transaction commits
+        (app.modules.audit.buffer). Otherwise it is INSERTed inline.
         """
         details_json = json.dumps(payload.details or {})
 
-        await self.conn.execute(
-            """
-            INSERT INTO audit_logs (
-                audit_id,
-                tenant_id,
+        if (
+            settings.AUDIT_WRITE_BEHIND
+            and audit_buffer.running
+            and isinstance(self.conn, LazyTenantConnection)
+        ):
+            event = make_event(
+                self.conn.tenant_id,
                 actor_user_id,
-                action_type,
-                resource_type,
-                resource_id,
+                payload.action_type,
+                payload.resource_type,
+                payload.resource_id,
                 ip_address,
-                details
-            )
-            VALUES (
-                uuid_generate_v4(),
-                current_setting('app.current_tenant_id', true)::uuid,
-                $1,
-                $2,
-                $3,
-                $4,
-                $5,
-                $6::jsonb
+                details_json,
             )
-            """,
+            self.conn.after_commit(lambda: audit_buffer.submit(event))
+            return
+
+        await self.conn.execute(
+            _INSERT_EVENT,
             actor_user_id,
             payload.action_type,
             payload.resource_type,
@@ -60,85 +167,76 @@ class AuditRepository:
             details_json,
         )
 
-    async def list_logs(self, limit: int = 100, offset: int = 0) -> List[AuditLogEntry]:
+    @read_only
+    async def list_logs(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[AuditLogEntry]:
         """
         Basic list (deprecated in favor of query_events, but kept for compatibility).
+        Keyset-paged on (created_at, audit_id), newest first.
         """
-        rows = await self.conn.fetch(
-            """
-            SELECT
-                audit_id,
-                tenant_id,
-                actor_user_id,
-                action_type,
-                resource_type,
-                resource_id,
-                ip_address,
-                details,
-                created_at
-            FROM audit_logs
-            ORDER BY created_at DESC
-            LIMIT $1 OFFSET $2
-            """,
-            limit,
-            offset,
-        )
+        after_ts, after_id = after or (None, None)
+        rows = await self.conn.fetch(_LIST_LOGS, after_ts, after_id, limit)
         return [AuditLogEntry(**r) for r in rows]
 
-    async def query_events(self, tenant_id: UUID, q: AuditQuery) -> List[AuditLogResponse]:
+    @read_only
+    async def query_events(
+        self,
+        tenant_id: UUID,
+        q: AuditQuery,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> List[AuditLogResponse]:
         """
-        Dynamic filtering for audit logs.
+        Filtered audit log query (fixed-shape SQL; unset filters are NULL),
+        keyset-paged on (created_at, audit_id), newest first.
         """
-        # 1. Base Query
-        sql = """
-            SELECT
-                audit_id,
-                tenant_id,
-                actor_user_id,
-                action_type,
-                resource_type,
-                resource_id,
-                ip_address,
-                details,
-                created_at
-            FROM audit_logs
-            WHERE tenant_id = $1
+        rows = await self.conn.fetch(_QUERY_EVENTS, *self._query_args(tenant_id, q, after), limit)
+        return [AuditLogResponse(**r) for r in rows]
+
+    async def iter_events(
+        self,
+        tenant_id: UUID,
+        q: AuditQuery,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        params: List[Any] = [tenant_id]
-
-        # 2. Dynamic Filters
-        # Note: We start params at $1, so next is $2
-        idx = 2
-
-        if q.action_type:
-            sql += f" AND action_type = ${idx}"
-            params.append(q.action_type)
-            idx += 1
-
-        if q.resource_type:
-            sql += f" AND resource_type = ${idx}"
-            params.append(q.resource_type)
-            idx += 1
-
-        if q.actor_user_id:
-            sql += f" AND actor_user_id = ${idx}"
-            params.append(q.actor_user_id)
-            idx += 1
-
-        if q.start_date:
-            sql += f" AND created_at >= ${idx}"
-            params.append(q.start_date)
-            idx += 1
-
-        if q.end_date:
-            sql += f" AND created_at <= ${idx}"
-            params.append(q.end_date)
-            idx += 1
-
-        # 3. Sorting and Pagination
-        sql += f" ORDER BY created_at DESC LIMIT ${idx} OFFSET ${idx + 1}"
-        params.append(q.limit)
-        params.append(q.offset)
-
-        rows = await self.conn.fetch(sql, *params)
-        return [AuditLogResponse(**r) for r in rows]
\ No newline at end of file
+        Every matching entry after `after`, newest first, through a
+        server-side cursor. Rows are plain dicts (details decoded) for
+        streaming.
+        """
+        async for r in self.conn.cursor(_QUERY_EVENTS, *self._query_args(tenant_id, q, after), None):
+            d = dict(r)
+            if isinstance(d["details"], str):
+                d["details"] = json.loads(d["details"])
+            yield d
+
+    @read_only
+    async def rollups(
+        self,
+        tenant_id: UUID,
+        since: datetime,
+        until: datetime,
+        action_types: Optional[List[str]] = None,
+        bucket: str = "hour",
+    ) -> List[AuditRollupEntry]:
+        """
+        Event counts per (bucket, action_type) in [since, until), from
+        audit_rollups_hourly. `bucket` is "hour" or "day" (UTC).
+        """
+        rows = await self.conn.fetch(_ROLLUPS, tenant_id, since, until, action_types or None, bucket)
+        return [AuditRollupEntry(**r) for r in rows]
+
+    @staticmethod
+    def _query_args(tenant_id: UUID, q: AuditQuery, after: Optional[Tuple[datetime, UUID]]) -> Tuple[Any, ...]:
+        after_ts, after_id = after or (None, None)
+        return (
+            tenant_id,
+            q.action_type,
+            q.resource_type,
+            q.actor_user_id,
+            q.start_date,
+            q.end_date,
+            after_ts,
+            after_id,
+        )
@@ -1,12 +1,22 @@
 # app/modules/audit/router.py
 
-from fastapi import APIRouter, Depends
-from typing import List
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
 
-from app.dependencies.database import get_tenant_db_connection
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.core.pagination import PageParams, page_params, set_next_cursor
+from app.core.database import LazyTenantConnection
+from app.core.streaming import ndjson_response, release_after, wants_ndjson
+from app.dependencies.auth_context import AuthContext, get_auth_context
+from app.dependencies.database import get_tenant_db_connection, get_tenant_stream_connection
 from app.dependencies.permissions import require_permissions
+from app.modules.audit.export import export_filename, export_media_type, stream_export
 from app.modules.audit.repository import AuditRepository
-from app.modules.audit.schemas import AuditLogEntry
+from app.modules.audit.schemas import AuditLogResponse, AuditQuery, AuditRollupEntry
+from app.modules.audit.service import AuditService
 
 router = APIRouter(
     prefix="/audit",
@@ -14,17 +24,100 @@ router = APIRouter(
 )
 
 
-def get_audit_repo(conn=Depends(get_tenant_db_connection)) -> AuditRepository:
+def get_audit_repo(conn=Depends(get_tenant_db_connection, scope="function")) -> AuditRepository:
     return AuditRepository(conn)
 
 
+def get_audit_service(repo: AuditRepository = Depends(get_audit_repo)) -> AuditService:
+    return AuditService(repo)
+
+
+def audit_query(
+    action_type: Optional[str] = Query(None),
+    resource_type: Optional[str] = Query(None),
+    actor_user_id: Optional[UUID] = Query(None),
+    start_date: Optional[datetime] = Query(None, description="Earliest created_at (inclusive)"),
+    end_date: Optional[datetime] = Query(None, description="Latest created_at (inclusive)"),
+) -> AuditQuery:
+    return AuditQuery(
+        action_type=action_type,
+        resource_type=resource_type,
+        actor_user_id=actor_user_id,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
 @router.get(
     "/logs",
-    response_model=List[AuditLogEntry],
+    response_model=List[AuditLogResponse],
     dependencies=[Depends(require_permissions(["audit.read"]))],
 )
 async def list_audit_logs(
-    repo: AuditRepository = Depends(get_audit_repo),
+    request: Request,
+    response: Response,
+    q: AuditQuery = Depends(audit_query),
+    page: PageParams = Depends(page_params),
+    auth: AuthContext = Depends(get_auth_context),
+    service: AuditService = Depends(get_audit_service),
+    stream_conn: LazyTenantConnection = Depends(get_tenant_stream_connection),
+):
+    """
+    Audit entries matching the filters, newest first, keyset-paged on
+    (created_at, audit_id) (next page cursor in X-Next-Cursor). With
+    `Accept: application/x-ndjson` every match from `cursor` on is
+    streamed instead.
+    """
+    if wants_ndjson(request):
+        rows = AuditService(AuditRepository(stream_conn)).stream(auth.tenant_id, q, page.cursor)
+        return ndjson_response(rows, conn=stream_conn)
+
+    logs, next_cursor = await service.query(auth.tenant_id, q, page)
+    set_next_cursor(response, next_cursor)
+    return logs
+
+
+@router.get(
+    "/export",
+    dependencies=[Depends(require_permissions(["audit.read"]))],
+)
+async def export_audit_logs(
+    since: Optional[datetime] = Query(None, description="Earliest created_at (inclusive)"),
+    until: Optional[datetime] = Query(None, description="Latest created_at (exclusive)"),
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    compression: Literal["gzip", "zstd", "none"] = Query("gzip"),
+    auth: AuthContext = Depends(get_auth_context),
+    conn: LazyTenantConnection = Depends(get_tenant_stream_connection),
+):
+    """
+    Every audit entry of the tenant in [since, until), oldest first, as a
+    compressed NDJSON or CSV download streamed from COPY (flat memory).
+    """
+    body = stream_export(conn, auth.tenant_id, since, until, format, compression)
+    return StreamingResponse(
+        release_after(conn, body),
+        media_type=export_media_type(format, compression),
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename(auth.tenant_id, format, compression)}"',
+        },
+    )
+
+
+@router.get(
+    "/rollups",
+    response_model=List[AuditRollupEntry],
+    dependencies=[Depends(require_permissions(["audit.read"]))],
+)
+async def audit_rollups(
+    since: Optional[datetime] = Query(None, description="Start (inclusive); default AUDIT_ROLLUP_DEFAULT_DAYS before until"),
+    until: Optional[datetime] = Query(None, description="End (exclusive); default now"),
+    action_type: Optional[List[str]] = Query(None, description="Repeat to select several"),
+    bucket: Literal["hour", "day"] = Query("hour"),
+    auth: AuthContext = Depends(get_auth_context),
+    service: AuditService = Depends(get_audit_service),
 ):
-    # Simple list with default limit; can be extended with query params
-    return await repo.list_logs()
+    """
+    Event counts per (bucket, action_type) for activity dashboards, read
+    from the hourly rollups instead of audit_logs.
+    """
+    return await service.rollups(auth.tenant_id, since, until, action_type, bucket)
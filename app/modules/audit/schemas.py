@@ -1,7 +1,7 @@
 # app/modules/audit/schemas.py
 import json
 
-from pydantic import BaseModel, Field, field_validator, IPvAnyAddress
+from pydantic import BaseModel, field_validator, IPvAnyAddress
 from typing import Optional, Dict, Any, List
 from uuid import UUID
 from datetime import datetime
@@ -46,15 +46,13 @@ class AuditLogEntry(BaseModel):
 
 class AuditQuery(BaseModel):
     """
-    Filters for querying audit logs.
+    Filters for querying audit logs (paging is keyset, see PageParams).
     """
     action_type: Optional[str] = None
     resource_type: Optional[str] = None
     actor_user_id: Optional[UUID] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
-    limit: int = Field(default=100, ge=1, le=1000)
-    offset: int = Field(default=0, ge=0)
 
 
 # Alias AuditLogResponse to AuditLogEntry for now,
@@ -64,4 +62,13 @@ class AuditLogResponse(AuditLogEntry):
 
 
 class AuditLogListResponse(BaseModel):
-    items: List[AuditLogResponse]
\ No newline at end of file
+    items: List[AuditLogResponse]
+
+
+class AuditRollupEntry(BaseModel):
+    """
+    Number of `action_type` events in the hour/day starting at `bucket` (UTC).
+    """
+    bucket: datetime
+    action_type: str
+    event_count: int
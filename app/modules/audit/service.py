@@ -1,9 +1,40 @@
 # app/modules/audit/service.py
 
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID
 
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.pagination import PageParams, created_keyset, fetch_page
 from app.modules.audit.repository import AuditRepository
-from app.modules.audit.schemas import AuditQuery, AuditLogResponse, AuditLogCreate
+from app.modules.audit.schemas import AuditQuery, AuditLogResponse, AuditLogCreate, AuditRollupEntry
+
+AUDIT_KEYSET = created_keyset("audit_id")
+
+_BUCKETS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+
+def _align_to_bucket(since: datetime, until: datetime, bucket: str) -> Tuple[datetime, datetime]:
+    """
+    Widen [since, until) to whole UTC buckets, so the first and last
+    buckets are counted in full rather than dropped or cut short.
+    """
+    size = _BUCKETS[bucket]
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    start = epoch + (since - epoch) // size * size
+    end = epoch + (until - epoch) // size * size
+    if end < until:
+        end += size
+    return start, end
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Naive query parameters are taken as UTC
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
 
 
 class AuditService:
@@ -40,5 +71,41 @@ class AuditService:
             ip_address=ip_address
         )
 
-    async def query(self, tenant_id: UUID, q: AuditQuery) -> list[AuditLogResponse]:
-        return await self.repo.query_events(tenant_id, q)
\ No newline at end of file
+    async def query(
+        self, tenant_id: UUID, q: AuditQuery, page: PageParams = PageParams()
+    ) -> Tuple[List[AuditLogResponse], Optional[str]]:
+        async def fetch(limit, after):
+            return await self.repo.query_events(tenant_id, q, limit, after)
+
+        return await fetch_page(fetch, page, AUDIT_KEYSET)
+
+    def stream(
+        self, tenant_id: UUID, q: AuditQuery, cursor: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        return self.repo.iter_events(tenant_id, q, AUDIT_KEYSET.decode(cursor))
+
+    async def rollups(
+        self,
+        tenant_id: UUID,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        action_types: Optional[List[str]] = None,
+        bucket: str = "hour",
+    ) -> List[AuditRollupEntry]:
+        """
+        Activity counts for dashboards. Defaults to the last
+        AUDIT_ROLLUP_DEFAULT_DAYS; ranges are capped at
+        AUDIT_ROLLUP_MAX_RANGE_DAYS, then widened to whole buckets.
+        """
+        since, until = _as_utc(since), _as_utc(until)
+        until = until or datetime.now(timezone.utc)
+        since = since or until - timedelta(days=settings.AUDIT_ROLLUP_DEFAULT_DAYS)
+        if since >= until:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, "since must be before until")
+        if until - since > timedelta(days=settings.AUDIT_ROLLUP_MAX_RANGE_DAYS):
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                f"Range exceeds {settings.AUDIT_ROLLUP_MAX_RANGE_DAYS} days",
+            )
+        since, until = _align_to_bucket(since, until, bucket)
+        return await self.repo.rollups(tenant_id, since, until, action_types, bucket)
@@ -3,8 +3,7 @@
 import jwt
 from fastapi import HTTPException, status
 from app.core.config import settings
-from app.modules.auth.token_blacklist import TokenBlacklistRepository
-from app.core.database import db
+from app.modules.auth.revocation import revocation_store
 
 
 def decode_token(token: str) -> dict:
@@ -17,10 +16,8 @@ def decode_token(token: str) -> dict:
 
 
 async def verify_token_not_blacklisted(jti: str):
-    async for conn in db.get_connection("00000000-0000-0000-0000-000000000000"):
-        repo = TokenBlacklistRepository(conn)
-        if await repo.is_token_blacklisted(jti):
-            raise HTTPException(
-                status.HTTP_401_UNAUTHORIZED,
-                detail="Token revoked"
-            )
+    if await revocation_store.is_revoked(jti):
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED,
+            detail="Token revoked"
+        )
@@ -0,0 +1,131 @@
+# app/modules/auth/lockout.py
+
+"""
+Brute-force protection for AuthService.login.
+
+Failure counters live in Redis (app.core.cache), per (tenant, email) and
+per client IP. Once a counter passes its threshold, every further failure
+sets a lock key whose TTL doubles (LOGIN_LOCKOUT_BASE_SECONDS * 2^n, capped
+at LOGIN_LOCKOUT_MAX_SECONDS). While a lock key exists, login is rejected
+with 429 before the user row is loaded or a password is hashed.
+
+Everything expires on its own; admins can clear it early with reset_account
+/ reset_ip. If Redis is unavailable the check fails open.
+"""
+
+import logging
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+from app.core.cache import cache
+from app.core.config import settings
+
+logger = logging.getLogger("uvicorn")
+
+
+class LoginLockout:
+    FAIL_PREFIX = "login_fail:"
+    LOCK_PREFIX = "login_lock:"
+
+    @staticmethod
+    def _account_id(tenant_id: UUID | str, email: str) -> str:
+        return f"acct:{tenant_id}:{email.strip().lower()}"
+
+    @staticmethod
+    def _ip_id(ip_address: str) -> str:
+        return f"ip:{ip_address}"
+
+    def _lock_seconds(self, failures: int, threshold: int) -> int:
+        if failures < threshold:
+            return 0
+        exponent = min(failures - threshold, 16)
+        return min(
+            settings.LOGIN_LOCKOUT_BASE_SECONDS * (2 ** exponent),
+            settings.LOGIN_LOCKOUT_MAX_SECONDS,
+        )
+
+    # ------------------------------------------------------------------
+    # CHECK
+    # ------------------------------------------------------------------
+    async def check(
+        self,
+        tenant_id: UUID | str,
+        email: str,
+        ip_address: Optional[str] = None,
+    ) -> None:
+        """
+        Raise 429 (with Retry-After) if the account or the IP is locked.
+        """
+        ids = [self._account_id(tenant_id, email)]
+        if ip_address:
+            ids.append(self._ip_id(ip_address))
+
+        try:
+            remaining = 0
+            for lock_id in ids:
+                remaining = max(remaining, await cache.ttl(self.LOCK_PREFIX + lock_id))
+        except Exception as ex:
+            logger.warning(f"Login lockout check skipped, cache unavailable: {ex}")
+            return
+
+        if remaining > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many failed login attempts, try again later",
+                headers={"Retry-After": str(remaining)},
+            )
+
+    # ------------------------------------------------------------------
+    # RECORD
+    # ------------------------------------------------------------------
+    async def _record(self, lock_id: str, threshold: int) -> None:
+        failures = await cache.incr(
+            self.FAIL_PREFIX + lock_id,
+            ttl=settings.LOGIN_FAILURE_WINDOW_SECONDS,
+        )
+        lock_seconds = self._lock_seconds(failures, threshold)
+        if lock_seconds:
+            await cache.set(self.LOCK_PREFIX + lock_id, str(failures), ttl=lock_seconds)
+
+    async def record_failure(
+        self,
+        tenant_id: UUID | str,
+        email: str,
+        ip_address: Optional[str] = None,
+    ) -> None:
+        try:
+            await self._record(
+                self._account_id(tenant_id, email),
+                settings.LOGIN_LOCKOUT_THRESHOLD,
+            )
+            if ip_address:
+                await self._record(
+                    self._ip_id(ip_address),
+                    settings.LOGIN_IP_LOCKOUT_THRESHOLD,
+                )
+        except Exception as ex:
+            logger.warning(f"Could not record failed login: {ex}")
+
+    async def record_success(self, tenant_id: UUID | str, email: str) -> None:
+        try:
+            await self.reset_account(tenant_id, email)
+        except Exception as ex:
+            logger.warning(f"Could not clear login failures: {ex}")
+
+    # ------------------------------------------------------------------
+    # ADMIN RESET
+    # ------------------------------------------------------------------
+    async def reset_account(self, tenant_id: UUID | str, email: str) -> None:
+        lock_id = self._account_id(tenant_id, email)
+        await cache.delete(self.FAIL_PREFIX + lock_id)
+        await cache.delete(self.LOCK_PREFIX + lock_id)
+
+    async def reset_ip(self, ip_address: str) -> None:
+        lock_id = self._ip_id(ip_address)
+        await cache.delete(self.FAIL_PREFIX + lock_id)
+        await cache.delete(self.LOCK_PREFIX + lock_id)
+
+
+login_lockout = LoginLockout()
@@ -1,10 +1,9 @@
 # app/modules/auth/mfa/router.py
 
 from fastapi import APIRouter, Depends, Request, HTTPException, status
-from jose import jwt, JWTError
 from uuid import UUID
 
-from app.core.config import settings
+from app.dependencies.auth_context import get_request_auth_context
 from app.dependencies.database import get_tenant_db_connection
 from app.modules.auth.mfa.repository import MFARepository
 from app.modules.auth.mfa.service import MFAService
@@ -13,7 +12,7 @@ from app.modules.auth.mfa.schemas import MFAEnrollRequest, MFAEnrollResponse
 router = APIRouter(tags=["MFA"])
 
 
-async def get_mfa_service(conn = Depends(get_tenant_db_connection)) -> MFAService:
+async def get_mfa_service(conn = Depends(get_tenant_db_connection, scope="function")) -> MFAService:
     repo = MFARepository(conn)
     return MFAService(repo, conn)
 
@@ -21,43 +20,15 @@ async def get_mfa_service(conn = Depends(get_tenant_db_connection)) -> MFAServic
 def _extract_user_and_tenant_from_auth(request: Request) -> tuple[UUID, UUID]:
     """
     Lightweight auth helper:
-    - Reads Bearer token
-    - Decodes JWT with SECRET_KEY/ALGORITHM
+    - Reads the request's AuthContext (token decoded once per request)
     - Returns (user_id, tenant_id)
     Raises 401 on any issue.
     """
-    auth = request.headers.get("Authorization")
-    if not auth:
-        raise HTTPException(status_code=401, detail="Missing Authorization")
-
-    try:
-        scheme, token = auth.split(" ")
-        if scheme.lower() != "bearer":
-            raise ValueError()
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid Authorization header")
-
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
-        )
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
-
-    sub = payload.get("sub")
-    tid = payload.get("tid")
-    if not sub or not tid:
-        raise HTTPException(status_code=401, detail="Malformed token")
-
-    try:
-        user_id = UUID(sub)
-        tenant_id = UUID(tid)
-    except ValueError:
+    ctx = get_request_auth_context(request)
+    if not ctx.user_id or not ctx.tenant_id:
         raise HTTPException(status_code=401, detail="Malformed token subject/tenant")
 
-    return user_id, tenant_id
+    return ctx.user_id, ctx.tenant_id
 
 
 @router.post("/enroll", response_model=MFAEnrollResponse)
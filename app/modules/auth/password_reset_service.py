@@ -5,7 +5,7 @@ from pydantic import UUID4
 
 from app.modules.users.repository import UserRepository
 from app.modules.auth.repository import AuthRepository
-from app.core.security import hash_password
+from app.core.password_hasher import password_hasher
 
 
 class PasswordResetService:
@@ -51,6 +51,7 @@ class PasswordResetService:
         if not row:
             raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid or expired token")
 
-        await self.user_repo.update_password(row["user_id"], hash_password(new_password))
+        hashed_password = await password_hasher.hash(new_password)
+        await self.user_repo.update_password(row["user_id"], hashed_password)
 
         return {"message": "Password updated"}
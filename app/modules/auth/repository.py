@@ -6,8 +6,43 @@ from typing import Optional
 from asyncpg import Connection
 
 from app.modules.users.schemas import UserResponse
+from app.core.statements import define
 
 
+_GET_USER_BY_EMAIL = define(
+    "auth.get_user_by_email",
+    """
+    SELECT user_id, primary_email AS email, display_name, created_at
+    FROM users
+    WHERE primary_email = $1
+    """,
+)
+
+_UPDATE_LAST_SEEN = define(
+    "auth.update_last_seen",
+    """
+    UPDATE sessions
+    SET last_seen_at = $1
+    WHERE session_id = $2
+    """,
+)
+
+_GET_USER_FOR_LOGIN = define(
+    "auth.get_user_for_login",
+    """
+    SELECT
+        u.user_id,
+        u.primary_email,
+        u.hashed_password,
+        ut.user_tenant_id,
+        ut.status
+    FROM users u
+    JOIN user_tenants ut ON ut.user_id = u.user_id
+    WHERE lower(u.primary_email) = lower($1)
+      AND ut.tenant_id = $2::uuid
+    """,
+)
+
 class AuthRepository:
     """
     Low-level queries for login and user lookup.
@@ -20,22 +55,14 @@ class AuthRepository:
 
     async def get_user_by_email(self, email: str) -> UserResponse | None:
         row = await self.conn.fetchrow(
-            """
-            SELECT user_id, primary_email AS email, display_name, created_at
-            FROM users
-            WHERE primary_email = $1
-            """,
+            _GET_USER_BY_EMAIL,
             email.lower()
         )
         return UserResponse(**row) if row else None
 
     async def update_last_seen(self, session_id: UUID):
         await self.conn.execute(
-            """
-            UPDATE sessions
-            SET last_seen_at = $1
-            WHERE session_id = $2
-            """,
+            _UPDATE_LAST_SEEN,
             datetime.utcnow(),
             session_id
         )
@@ -54,18 +81,7 @@ class AuthRepository:
           to match this tenant_id, so the caller must set it.
         """
         row = await self.conn.fetchrow(
-            """
-            SELECT
-                u.user_id,
-                u.primary_email,
-                u.hashed_password,
-                ut.user_tenant_id,
-                ut.status
-            FROM users u
-            JOIN user_tenants ut ON ut.user_id = u.user_id
-            WHERE lower(u.primary_email) = lower($1)
-              AND ut.tenant_id = $2::uuid
-            """,
+            _GET_USER_FOR_LOGIN,
             email,
             str(tenant_id),
         )
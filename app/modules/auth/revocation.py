@@ -0,0 +1,114 @@
+# app/modules/auth/revocation.py
+
+"""
+Access-token revocation.
+
+Entries are keyed by the SHA-256 digest of the access token, the same value
+AuthService.logout stores in token_blacklist.jti.
+
+- Redis holds one key per revoked token, with a TTL that ends at the
+  token's `exp`; the per-request check is a single EXISTS.
+- Postgres (token_blacklist) is the durable copy. It is consulted only
+  when Redis cannot answer, and is used to re-warm Redis on startup.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from asyncpg import Connection
+
+from app.core.cache import cache
+from app.core.database import db
+from app.core.security import hash_access_token, verified_token_cache
+from app.modules.auth.token_blacklist import TokenBlacklistRepository
+
+logger = logging.getLogger("uvicorn")
+
+
+class TokenRevocationStore:
+    KEY_PREFIX = "revoked:"
+
+    def _key(self, digest: str) -> str:
+        return f"{self.KEY_PREFIX}{digest}"
+
+    @staticmethod
+    def _ttl_seconds(expires_at: datetime) -> int:
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return int((expires_at - datetime.now(timezone.utc)).total_seconds())
+
+    # ------------------------------------------------------------------
+    # WRITE
+    # ------------------------------------------------------------------
+    async def revoke(
+        self,
+        conn: Connection,
+        digest: str,
+        expires_at: datetime,
+        tenant_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> None:
+        """
+        Persist the revocation on `conn` (inside the caller's transaction)
+        and publish it to Redis until the token would have expired anyway.
+        The token is also dropped from this process's verified-token cache.
+        """
+        verified_token_cache.evict(digest)
+
+        await TokenBlacklistRepository(conn).blacklist_token(
+            digest,
+            expires_at,
+            tenant_id=tenant_id,
+            user_id=user_id,
+        )
+
+        ttl = self._ttl_seconds(expires_at)
+        if ttl <= 0:
+            return
+
+        try:
+            await cache.set(self._key(digest), "1", ttl=ttl)
+        except Exception as ex:
+            # Postgres still has it; checks fall back there while Redis is down.
+            logger.warning("Could not publish token revocation to Redis: %s", ex)
+
+    # ------------------------------------------------------------------
+    # READ
+    # ------------------------------------------------------------------
+    async def is_revoked(self, digest: str, conn: Optional[Connection] = None) -> bool:
+        try:
+            return await cache.exists(self._key(digest))
+        except Exception as ex:
+            logger.warning("Revocation cache unavailable, using Postgres: %s", ex)
+
+        if conn is not None:
+            return await TokenBlacklistRepository(conn).is_token_blacklisted(digest)
+
+        async with db.acquire() as fallback_conn:
+            return await TokenBlacklistRepository(fallback_conn).is_token_blacklisted(digest)
+
+    async def is_token_revoked(self, token: str, conn: Optional[Connection] = None) -> bool:
+        return await self.is_revoked(hash_access_token(token), conn=conn)
+
+    # ------------------------------------------------------------------
+    # STARTUP
+    # ------------------------------------------------------------------
+    async def warm(self) -> int:
+        """
+        Copy every still-active revocation from Postgres into Redis.
+        Returns the number of entries published.
+        """
+        async with db.acquire() as conn:
+            rows = await TokenBlacklistRepository(conn).list_active()
+
+        published = 0
+        for row in rows:
+            ttl = self._ttl_seconds(row["expires_at"])
+            if ttl > 0:
+                await cache.set(self._key(row["jti"]), "1", ttl=ttl)
+                published += 1
+        return published
+
+
+revocation_store = TokenRevocationStore()
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter, Depends, Request, HTTPException, status
 
+from app.core.admission import login_admission
 from app.dependencies.database import get_db_connection
 from app.modules.auth.service import AuthService
 from app.modules.auth.schemas import LoginRequest, TokenResponse
@@ -16,10 +17,19 @@ router = APIRouter(
 # -------------------------------------------------------
 # Dependency factory for AuthService
 # -------------------------------------------------------
-async def get_auth_service(conn=Depends(get_db_connection)) -> AuthService:
+async def get_auth_service(conn=Depends(get_db_connection, scope="function")) -> AuthService:
     return AuthService(conn)
 
 
+async def admit_login():
+    """
+    Take a login admission slot before a DB connection is checked out or
+    any password is hashed; rejects with 429 when the worker is saturated.
+    """
+    async with login_admission.slot():
+        yield
+
+
 # -------------------------------------------------------
 # LOGIN
 # -------------------------------------------------------
@@ -27,6 +37,7 @@ async def get_auth_service(conn=Depends(get_db_connection)) -> AuthService:
 async def login(
     body: LoginRequest,
     request: Request,
+    _admitted: None = Depends(admit_login),
     svc: AuthService = Depends(get_auth_service),
 ):
     ip = request.client.host if request.client else None
@@ -9,12 +9,16 @@ from uuid import UUID
 from fastapi import HTTPException, status
 from asyncpg import Connection
 
+from app.modules.auth.lockout import login_lockout
 from app.modules.auth.repository import AuthRepository
 from app.modules.auth.schemas import LoginRequest, TokenResponse
+from app.modules.auth.revocation import revocation_store
 from app.modules.audit.repository import AuditRepository
 from app.modules.audit.schemas import AuditLogCreate
+from app.modules.roles.permission_snapshot import build_permission_claims
+from app.core.database import set_tenant_context
+from app.core.password_hasher import password_hasher
 from app.core.security import (
-    verify_password,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -48,11 +52,11 @@ class AuthService:
     ) -> TokenResponse:
         tenant_id: UUID = payload.tenant_id
 
+        # 0) Refuse locked accounts / IPs before touching the DB or bcrypt.
+        await login_lockout.check(tenant_id, payload.email, ip_address)
+
         # 1) Set RLS tenant context *for this connection*.
-        await self.conn.execute(
-            "SELECT set_config('app.current_tenant_id', $1, true)",
-            str(tenant_id),
-        )
+        await set_tenant_context(self.conn, tenant_id)
 
         # 2) Fetch user + tenant membership
         user_row = await self.auth_repo.get_user_for_login(
@@ -61,6 +65,7 @@ class AuthService:
         )
 
         if not user_row:
+            await login_lockout.record_failure(tenant_id, payload.email, ip_address)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found for this tenant",
@@ -74,7 +79,8 @@ class AuthService:
             )
 
         # 3) Verify password
-        if not verify_password(payload.password, user_row["hashed_password"]):
+        if not await password_hasher.verify(payload.password, user_row["hashed_password"]):
+            await login_lockout.record_failure(tenant_id, payload.email, ip_address)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid password",
@@ -82,16 +88,19 @@ class AuthService:
             )
 
         user_id = user_row["user_id"]
+        await login_lockout.record_success(tenant_id, payload.email)
 
-        # 4) Create tokens
+        # 4) Create tokens (access token carries a permission snapshot)
         access_token_expires = timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
+        permission_claims = await build_permission_claims(self.conn, tenant_id, user_id)
 
         access_token = create_access_token(
             data={
                 "sub": str(user_id),
                 "tid": str(tenant_id),
+                **permission_claims,
             },
             expires_delta=access_token_expires,
         )
@@ -156,11 +165,17 @@ class AuthService:
                 detail="Refresh token missing subject or tenant",
             )
 
+        # Re-resolve permissions under the tenant's RLS context
+        await set_tenant_context(self.conn, tenant_id)
+        permission_claims = await build_permission_claims(
+            self.conn, UUID(str(tenant_id)), UUID(str(user_id))
+        )
+
         access_token_expires = timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
         new_access = create_access_token(
-            data={"sub": str(user_id), "tid": str(tenant_id)},
+            data={"sub": str(user_id), "tid": str(tenant_id), **permission_claims},
             expires_delta=access_token_expires,
         )
         new_refresh = create_refresh_token(
@@ -215,10 +230,7 @@ class AuthService:
             )
 
         # Ensure tenant context is set for audit logs
-        await self.conn.execute(
-            "SELECT set_config('app.current_tenant_id', $1, true)",
-            str(tenant_id),
-        )
+        await set_tenant_context(self.conn, tenant_id)
 
         # Determine expiry for blacklist entry
         if exp_ts is not None:
@@ -233,25 +245,13 @@ class AuthService:
                 minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
             )
 
-        # Use a hash of the access token as both jti and token_hash
-        token_hash = hash_access_token(token)
-        jti = token_hash
-
-        await self.conn.execute(
-            """
-            INSERT INTO token_blacklist (jti, token_hash, tenant_id, user_id, expires_at)
-            VALUES ($1, $2, $3::uuid, $4::uuid, $5)
-            ON CONFLICT (jti) DO UPDATE
-               SET token_hash = EXCLUDED.token_hash,
-                   tenant_id  = EXCLUDED.tenant_id,
-                   user_id    = EXCLUDED.user_id,
-                   expires_at = EXCLUDED.expires_at
-            """,
-            jti,
-            token_hash,
-            str(tenant_id),
-            str(user_id),
+        # The access-token digest is the revocation key (jti + token_hash)
+        await revocation_store.revoke(
+            self.conn,
+            hash_access_token(token),
             expires_at,
+            tenant_id=str(tenant_id),
+            user_id=str(user_id),
         )
 
         await self.audit_repo.log_event(
@@ -1,29 +1,70 @@
 # app/modules/auth/token_blacklist.py
 
+"""
+Durable store for revoked access tokens.
+
+Rows are keyed by `jti`, which holds the SHA-256 digest of the access token
+(see app.core.security.hash_access_token). Every lookup is therefore a
+primary-key probe instead of a per-row crypt() comparison.
+
+The per-request check is answered from Redis by
+app.modules.auth.revocation.TokenRevocationStore; this table is the
+fallback when Redis is unavailable and the source used to re-warm it.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from asyncpg import Connection, Record
+
+
 class TokenBlacklistRepository:
-    def __init__(self, conn):
+    def __init__(self, conn: Connection):
         self.conn = conn
 
-    async def blacklist_token(self, jti: str):
+    async def blacklist_token(
+        self,
+        jti: str,
+        expires_at: datetime,
+        tenant_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> None:
         await self.conn.execute(
             """
-            INSERT INTO token_blacklist (token_hash, created_at, expires_at, tenant_id)
-            VALUES (crypt($1, gen_salt('bf')),
-                    now(),
-                    now() + interval '30 minutes',
-                    current_setting('app.current_tenant_id', true)::uuid)
+            INSERT INTO token_blacklist (jti, token_hash, tenant_id, user_id, expires_at)
+            VALUES ($1, $1, $2::uuid, $3::uuid, $4)
+            ON CONFLICT (jti) DO UPDATE
+               SET token_hash = EXCLUDED.token_hash,
+                   tenant_id  = EXCLUDED.tenant_id,
+                   user_id    = EXCLUDED.user_id,
+                   expires_at = EXCLUDED.expires_at
             """,
-            jti
+            jti,
+            str(tenant_id) if tenant_id else None,
+            str(user_id) if user_id else None,
+            expires_at,
         )
 
     async def is_token_blacklisted(self, jti: str) -> bool:
         row = await self.conn.fetchrow(
             """
             SELECT 1 FROM token_blacklist
-            WHERE token_hash = crypt($1, token_hash)
-            AND expires_at > now()
-            LIMIT 1
+            WHERE jti = $1
+              AND expires_at > now()
             """,
-            jti
+            jti,
         )
         return bool(row)
+
+    async def list_active(self) -> List[Record]:
+        """
+        Return (jti, expires_at) for every entry that has not expired yet.
+        Used to re-populate Redis after a cache flush or restart.
+        """
+        return await self.conn.fetch(
+            """
+            SELECT jti, expires_at
+            FROM token_blacklist
+            WHERE expires_at > now()
+            """
+        )
@@ -1,13 +1,106 @@
 # app/modules/groups/repository.py
 
-from typing import List
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from asyncpg import Connection
 
-from app.modules.groups.schemas import GroupCreate, GroupResponse
+from app.modules.groups.schemas import GroupCreate, GroupMemberResponse, GroupResponse
+from app.modules.roles.permission_cache import permission_cache
+from app.core.database import read_only
+from app.core.pagination import DEFAULT_PAGE_SIZE
+from app.core.statements import define
 
 
+_CREATE = define(
+    "groups.create",
+    """
+    INSERT INTO groups (tenant_id, name, description)
+    VALUES (
+        current_setting('app.current_tenant_id', true)::uuid,
+        $1,
+        $2
+    )
+    RETURNING group_id, tenant_id, name, description, created_at
+    """,
+)
+
+_MEMBERSHIP_FOR_USER = define(
+    "groups.membership_for_user",
+    """
+    SELECT user_tenant_id
+    FROM user_tenants
+    WHERE user_id = $1
+      AND tenant_id = $2
+    """,
+)
+
+_INSERT_MEMBER = define(
+    "groups.insert_member",
+    """
+    INSERT INTO group_members (group_id, user_tenant_id, tenant_id)
+    VALUES ($1, $2, $3)
+    ON CONFLICT DO NOTHING
+    """,
+)
+
+_LIST_GROUPS = define(
+    "groups.list_groups",
+    """
+    SELECT
+        g.group_id,
+        g.name,
+        g.description,
+        g.created_at,
+        COUNT(DISTINCT gm.user_tenant_id) AS member_count
+    FROM (
+        SELECT group_id, name, description, created_at
+        FROM groups
+        WHERE ($1::timestamptz IS NULL OR (created_at, group_id) < ($1::timestamptz, $2::uuid))
+        ORDER BY created_at DESC, group_id DESC
+        LIMIT $3
+    ) g
+    LEFT JOIN group_members gm ON gm.group_id = g.group_id
+    GROUP BY g.group_id, g.name, g.description, g.created_at
+    ORDER BY g.created_at DESC, g.group_id DESC
+    """,
+)
+_GET_GROUP = define(
+    "groups.get_group",
+    """
+    SELECT
+        g.group_id,
+        g.name,
+        g.description,
+        g.created_at,
+        (SELECT COUNT(*) FROM group_members gm WHERE gm.group_id = g.group_id) AS member_count
+    FROM groups g
+    WHERE g.group_id = $1
+    """,
+)
+
+# Members of a group, keyset-ordered by user_tenant_id (the group_members
+# primary key). $3 NULL = no limit (streaming).
+_LIST_MEMBERS = define(
+    "groups.list_members",
+    """
+    SELECT
+        gm.user_tenant_id,
+        ut.user_id,
+        u.primary_email AS email,
+        u.display_name,
+        ut.tenant_role
+    FROM group_members gm
+    JOIN user_tenants ut ON ut.user_tenant_id = gm.user_tenant_id
+    JOIN users u ON u.user_id = ut.user_id
+    WHERE gm.group_id = $1
+      AND ($2::uuid IS NULL OR gm.user_tenant_id > $2::uuid)
+    ORDER BY gm.user_tenant_id
+    LIMIT $3
+    """,
+)
+
 class GroupRepository:
     def __init__(self, conn: Connection):
         self.conn = conn
@@ -17,15 +110,7 @@ class GroupRepository:
     # ---------------------------------------------------------
     async def create(self, payload: GroupCreate) -> GroupResponse:
         row = await self.conn.fetchrow(
-            """
-            INSERT INTO groups (tenant_id, name, description)
-            VALUES (
-                current_setting('app.current_tenant_id', true)::uuid,
-                $1,
-                $2
-            )
-            RETURNING group_id, tenant_id, name, description, created_at
-            """,
+            _CREATE,
             payload.name,
             payload.description,
         )
@@ -48,46 +133,55 @@ class GroupRepository:
         # Resolve user_tenant_id in current tenant
         print(f"{tenant_id}")
         ut_row = await self.conn.fetchrow(
-            """
-            SELECT user_tenant_id
-            FROM user_tenants
-            WHERE user_id = $1
-              AND tenant_id = $2
-            """,
+            _MEMBERSHIP_FOR_USER,
             user_id,
             tenant_id,
         )
         if not ut_row:
             return False
 
-        await self.conn.execute(
-            """
-            INSERT INTO group_members (group_id, user_tenant_id, tenant_id)
-            VALUES ($1, $2, $3)
-            ON CONFLICT DO NOTHING
-            """,
+        result = await self.conn.execute(
+            _INSERT_MEMBER,
             group_id,
             ut_row["user_tenant_id"],
             tenant_id,
         )
+        if result == "INSERT 0 1":
+            # Group roles now apply to this user
+            await permission_cache.bump_tenant_on_commit(self.conn, tenant_id)
         return True
 
+    @read_only
+    async def list_members(
+        self, group_id: UUID, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Tuple[UUID]] = None
+    ) -> List[GroupMemberResponse]:
+        rows = await self.conn.fetch(
+            _LIST_MEMBERS, group_id, after[0] if after else None, limit
+        )
+        return [GroupMemberResponse(**r) for r in rows]
+
+    async def iter_members(
+        self, group_id: UUID, after: Optional[Tuple[UUID]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """All members after `after`, through a server-side cursor."""
+        async for r in self.conn.cursor(
+            _LIST_MEMBERS, group_id, after[0] if after else None, None
+        ):
+            yield dict(r)
+
     # ---------------------------------------------------------
     # LIST
     # ---------------------------------------------------------
-    async def list_groups(self) -> List[GroupResponse]:
+    async def get_group(self, group_id: UUID) -> Optional[GroupResponse]:
+        row = await self.conn.fetchrow(_GET_GROUP, group_id)
+        return GroupResponse(**row) if row else None
+
+    @read_only
+    async def list_groups(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[GroupResponse]:
+        after_ts, after_id = after or (None, None)
         rows = await self.conn.fetch(
-            """
-            SELECT
-                g.group_id,
-                g.name,
-                g.description,
-                g.created_at,
-                COUNT(DISTINCT gm.user_tenant_id) AS member_count
-            FROM groups g
-            LEFT JOIN group_members gm ON gm.group_id = g.group_id
-            GROUP BY g.group_id, g.name, g.description, g.created_at
-            ORDER BY g.created_at DESC
-            """
+            _LIST_GROUPS, after_ts, after_id, limit
         )
         return [GroupResponse(**r) for r in rows]
@@ -3,8 +3,10 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Body
+from fastapi import APIRouter, Depends, Body, Response
 
+from app.core.pagination import PageParams, page_params, set_next_cursor
+from app.core.streaming import ndjson_response, wants_ndjson
 from app.dependencies.database import get_tenant_db_connection
 from app.dependencies.permissions import require_permission
 from app.dependencies.auth_utils import get_current_user_id
@@ -14,6 +16,7 @@ from app.modules.groups.schemas import (
     GroupCreate,
     GroupUpdate,
     GroupRolesUpdate,
+    GroupMemberResponse,
     GroupResponse,
 )
 from app.modules.groups.service import GroupService
@@ -25,7 +28,7 @@ router = APIRouter(
 )
 
 
-def get_group_service(conn=Depends(get_tenant_db_connection)) -> GroupService:
+def get_group_service(conn=Depends(get_tenant_db_connection, scope="function")) -> GroupService:
     return GroupService(conn)
 
 
@@ -49,9 +52,36 @@ async def create_group(
     dependencies=[Depends(require_permission("group.read"))],
 )
 async def list_groups(
+    response: Response,
+    page: PageParams = Depends(page_params),
     service: GroupService = Depends(get_group_service),
 ):
-    return await service.list_groups()
+    groups, next_cursor = await service.list_groups(page)
+    set_next_cursor(response, next_cursor)
+    return groups
+
+
+@router.get(
+    "/{group_id}/members",
+    response_model=List[GroupMemberResponse],
+    dependencies=[Depends(require_permission("group.read"))],
+)
+async def list_group_members(
+    request: Request,
+    response: Response,
+    group_id: UUID,
+    page: PageParams = Depends(page_params),
+    service: GroupService = Depends(get_group_service),
+):
+    """
+    Keyset-paged members; `Accept: application/x-ndjson` streams them all.
+    """
+    if wants_ndjson(request):
+        return ndjson_response(service.stream_members(group_id, page.cursor))
+
+    members, next_cursor = await service.list_members(group_id, page)
+    set_next_cursor(response, next_cursor)
+    return members
 
 
 @router.post(
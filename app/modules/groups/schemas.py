@@ -28,6 +28,14 @@ class GroupRolesUpdate(BaseModel):
     role_ids: List[UUID]
 
 
+class GroupMemberResponse(BaseModel):
+    user_tenant_id: UUID
+    user_id: UUID
+    email: str
+    display_name: str
+    tenant_role: str
+
+
 class GroupResponse(BaseModel):
     group_id: UUID
     name: str
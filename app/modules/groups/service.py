@@ -1,15 +1,19 @@
 # app/modules/groups/service.py
 
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
 
+from app.core.pagination import Keyset, PageParams, created_keyset, fetch_page
 from app.modules.groups.repository import GroupRepository
-from app.modules.groups.schemas import GroupCreate, GroupResponse
+from app.modules.groups.schemas import GroupCreate, GroupMemberResponse, GroupResponse
 from app.modules.audit.repository import AuditRepository
 from app.modules.audit.schemas import AuditLogCreate
 
+GROUP_KEYSET = created_keyset("group_id")
+MEMBER_KEYSET = Keyset("user_tenant_id", types=(UUID,))
+
 
 class GroupService:
     def __init__(self, conn):
@@ -39,20 +43,30 @@ class GroupService:
                 "User not part of current tenant",
             )
 
-        groups = await self.repo.list_groups()
-        for g in groups:
-            if g.group_id == group_id:
-                await self.audit_repo.log_event(
-                    AuditLogCreate(
-                        action_type="group.add_member",
-                        resource_type="group",
-                        resource_id=str(group_id),
-                        details={"user_id": str(user_id)},
-                    )
-                )
-                return g
-
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "Group not found")
-
-    async def list_groups(self) -> List[GroupResponse]:
-        return await self.repo.list_groups()
+        group = await self.repo.get_group(group_id)
+        if group is None:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Group not found")
+
+        await self.audit_repo.log_event(
+            AuditLogCreate(
+                action_type="group.add_member",
+                resource_type="group",
+                resource_id=str(group_id),
+                details={"user_id": str(user_id)},
+            )
+        )
+        return group
+
+    async def list_members(
+        self, group_id: UUID, page: PageParams = PageParams()
+    ) -> Tuple[List[GroupMemberResponse], Optional[str]]:
+        async def fetch(limit, after):
+            return await self.repo.list_members(group_id, limit, after)
+
+        return await fetch_page(fetch, page, MEMBER_KEYSET)
+
+    def stream_members(self, group_id: UUID, cursor: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        return self.repo.iter_members(group_id, MEMBER_KEYSET.decode(cursor))
+
+    async def list_groups(self, page: PageParams = PageParams()) -> Tuple[List[GroupResponse], Optional[str]]:
+        return await fetch_page(self.repo.list_groups, page, GROUP_KEYSET)
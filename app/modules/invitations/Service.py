@@ -8,7 +8,7 @@ InvitationService:
 """
 
 import secrets
-from typing import Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 
@@ -26,7 +26,11 @@ from app.modules.groups.repository import GroupRepository
 from app.modules.roles.repository import RoleRepository
 from app.modules.audit.repository import AuditRepository
 from app.modules.audit.schemas import AuditLogCreate
-from app.core.security import get_password_hash
+from app.core.database import release_early
+from app.core.pagination import PageParams, created_keyset, fetch_page
+from app.core.password_hasher import password_hasher
+
+INVITATION_KEYSET = created_keyset("invitation_id")
 
 
 class InvitationService:
@@ -134,10 +138,14 @@ class InvitationService:
         group_ids: list[UUID] = data["group_ids"]
         invitation_id: UUID = data["invitation_id"]
 
-        # 2. Create user + membership in transaction
+        # 2. Create user + membership in transaction.
+        # Hash first, with the pool connection handed back, so neither the
+        # transaction nor a pool slot is held while bcrypt runs.
+        await release_early(self.conn)
+        hashed_password = await password_hasher.hash(body.password)
+
         async with self.conn.transaction():
-            # 2.1 Hash password and create user payload
-            hashed_password = get_password_hash(body.password)
+            # 2.1 Create user payload
 
             # FIXED: Pass single payload dict with all required fields
             user_payload = {
@@ -229,5 +237,10 @@ class InvitationService:
     # ---------------------------------------------------------
     # LIST
     # ---------------------------------------------------------
-    async def list_invitations(self, tenant_id: UUID):
-        return await self.repo.list_for_tenant(tenant_id)
+    async def list_invitations(
+        self, tenant_id: UUID, page: PageParams = PageParams()
+    ) -> Tuple[List[InvitationResponse], Optional[str]]:
+        async def fetch(limit, after):
+            return await self.repo.list_for_tenant(tenant_id, limit, after)
+
+        return await fetch_page(fetch, page, INVITATION_KEYSET)
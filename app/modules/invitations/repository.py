@@ -9,14 +9,83 @@ Repository for invitation CRUD:
 
 from uuid import UUID
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from asyncpg import Connection
 
 from app.modules.invitations.schemas import InvitationCreate, InvitationResponse
 from app.core.security import hash_refresh_token  # SHA-256 helper
+from app.core.database import read_only
+from app.core.pagination import DEFAULT_PAGE_SIZE
+from app.core.statements import define
 
 
+_CREATE_INVITATION = define(
+    "invitations.create_invitation",
+    """
+    INSERT INTO invitations (
+        tenant_id,
+        email,
+        invited_by_user_id,
+        roles,
+        group_ids,
+        token_hash,
+        expires_at
+    )
+    VALUES ($1, lower($2), $3, $4, $5, $6, $7)
+    RETURNING invitation_id, email, roles, group_ids,
+              status, expires_at, created_at
+    """,
+)
+
+_GET_BY_TOKEN = define(
+    "invitations.get_by_token",
+    """
+    SELECT invitation_id,
+           tenant_id,
+           email,
+           invited_by_user_id,
+           roles,
+           group_ids,
+           status,
+           expires_at,
+           created_at
+    FROM invitations
+    WHERE token_hash = $1
+    """,
+)
+
+_MARK_ACCEPTED = define(
+    "invitations.mark_accepted",
+    """
+    UPDATE invitations
+    SET status = 'accepted'
+    WHERE invitation_id = $1
+    """,
+)
+
+_REVOKE = define(
+    "invitations.revoke",
+    """
+    UPDATE invitations
+    SET status = 'revoked'
+    WHERE tenant_id = $1 AND invitation_id = $2
+    """,
+)
+
+_LIST_FOR_TENANT = define(
+    "invitations.list_for_tenant",
+    """
+    SELECT invitation_id, email, roles, group_ids,
+           status, expires_at, created_at
+    FROM invitations
+    WHERE tenant_id = $1
+      AND ($2::timestamptz IS NULL OR (created_at, invitation_id) < ($2::timestamptz, $3::uuid))
+    ORDER BY created_at DESC, invitation_id DESC
+    LIMIT $4
+    """,
+)
+
 class InvitationRepository:
     def __init__(self, conn: Connection):
         self.conn = conn
@@ -35,20 +104,7 @@ class InvitationRepository:
         expires_at = datetime.utcnow() + timedelta(days=payload.expires_in_days)
 
         row = await self.conn.fetchrow(
-            """
-            INSERT INTO invitations (
-                tenant_id,
-                email,
-                invited_by_user_id,
-                roles,
-                group_ids,
-                token_hash,
-                expires_at
-            )
-            VALUES ($1, lower($2), $3, $4, $5, $6, $7)
-            RETURNING invitation_id, email, roles, group_ids,
-                      status, expires_at, created_at
-            """,
+            _CREATE_INVITATION,
             tenant_id,
             payload.email,
             invited_by_user_id,
@@ -67,19 +123,7 @@ class InvitationRepository:
         token_hash = hash_refresh_token(token_plain)
 
         row = await self.conn.fetchrow(
-            """
-            SELECT invitation_id,
-                   tenant_id,
-                   email,
-                   invited_by_user_id,
-                   roles,
-                   group_ids,
-                   status,
-                   expires_at,
-                   created_at
-            FROM invitations
-            WHERE token_hash = $1
-            """,
+            _GET_BY_TOKEN,
             token_hash,
         )
         return dict(row) if row else None
@@ -89,11 +133,7 @@ class InvitationRepository:
     # ---------------------------------------------------------
     async def mark_accepted(self, invitation_id: UUID):
         await self.conn.execute(
-            """
-            UPDATE invitations
-            SET status = 'accepted'
-            WHERE invitation_id = $1
-            """,
+            _MARK_ACCEPTED,
             invitation_id,
         )
 
@@ -102,11 +142,7 @@ class InvitationRepository:
     # ---------------------------------------------------------
     async def revoke(self, tenant_id: UUID, invitation_id: UUID) -> bool:
         result = await self.conn.execute(
-            """
-            UPDATE invitations
-            SET status = 'revoked'
-            WHERE tenant_id = $1 AND invitation_id = $2
-            """,
+            _REVOKE,
             tenant_id,
             invitation_id,
         )
@@ -115,15 +151,19 @@ class InvitationRepository:
     # ---------------------------------------------------------
     # LIST (PER TENANT)
     # ---------------------------------------------------------
-    async def list_for_tenant(self, tenant_id: UUID) -> List[InvitationResponse]:
+    @read_only
+    async def list_for_tenant(
+        self,
+        tenant_id: UUID,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[Tuple[datetime, UUID]] = None,
+    ) -> List[InvitationResponse]:
+        after_ts, after_id = after or (None, None)
         rows = await self.conn.fetch(
-            """
-            SELECT invitation_id, email, roles, group_ids,
-                   status, expires_at, created_at
-            FROM invitations
-            WHERE tenant_id = $1
-            ORDER BY created_at DESC
-            """,
+            _LIST_FOR_TENANT,
             tenant_id,
+            after_ts,
+            after_id,
+            limit,
         )
         return [InvitationResponse(**dict(r)) for r in rows]
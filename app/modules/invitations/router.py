@@ -1,8 +1,9 @@
 # app/modules/invitations/router.py
 
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from uuid import UUID
 
+from app.core.pagination import PageParams, page_params, set_next_cursor
 from app.dependencies.database import get_tenant_db_connection
 from app.dependencies.auth_utils import get_current_user_id
 from app.dependencies.permissions import require_permission
@@ -23,7 +24,7 @@ from app.modules.audit.repository import AuditRepository
 router = APIRouter(prefix="/api/v1/invitations", tags=["Invitations"])
 
 
-async def get_invitation_service(conn = Depends(get_tenant_db_connection)) -> InvitationService:
+async def get_invitation_service(conn = Depends(get_tenant_db_connection, scope="function")) -> InvitationService:
     """
     Provide InvitationService with all required repositories.
     """
@@ -90,10 +91,14 @@ async def accept_invitation(
 )
 async def list_invitations(
     request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
     service: InvitationService = Depends(get_invitation_service),
 ):
     tenant_id = request.state.tenant_id
-    return await service.list_invitations(tenant_id)
+    invitations, next_cursor = await service.list_invitations(tenant_id, page)
+    set_next_cursor(response, next_cursor)
+    return invitations
 
 
 # ---------------------------------------------------------
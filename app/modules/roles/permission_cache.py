@@ -0,0 +1,230 @@
+# app/modules/roles/permission_cache.py
+
+"""
+Effective-permission cache keyed by (tenant_id, user_id).
+
+Two tiers:
+- in-process LRU (PERMISSION_CACHE_LOCAL_SIZE entries)
+- Redis, shared by all workers (PERMISSION_CACHE_TTL_SECONDS)
+
+Every entry is stamped with the tenant's permission version, a Redis
+counter that RoleRepository bumps (after commit) whenever roles, role
+permissions or role assignments change. A lookup costs one Redis GET for the version plus, on a
+local miss, one GET for the permission set; the database is only queried
+when neither tier has an entry for the current version.
+
+A missing version counter (new tenant, Redis flush, eviction, expiry) is
+seeded from the clock rather than 0, so a restarted counter never repeats
+a version an older token snapshot was stamped with. A bump that cannot
+reach Redis is retried on this worker's next lookup for the tenant, and
+until it lands the tenant has no trusted version here.
+
+If Redis is unavailable, lookups fall through to the loader uncached.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import LazyTenantConnection
+
+logger = logging.getLogger("uvicorn")
+
+PermissionLoader = Callable[[], Awaitable[Iterable[str]]]
+
+# Version counters must outlive any cached entry; they are refreshed on
+# every bump.
+_VERSION_TTL_SECONDS = 30 * 24 * 3600
+
+
+def _version_seed() -> int:
+    # Microseconds since the epoch: larger than any value a counter seeded
+    # earlier could have reached by bumping.
+    return time.time_ns() // 1000
+
+
+class PermissionCache:
+    VERSION_PREFIX = "perm_version:"
+    ENTRY_PREFIX = "perms:"
+
+    def __init__(self, local_size: int, ttl_seconds: int) -> None:
+        self.local_size = local_size
+        self.ttl_seconds = ttl_seconds
+
+        self._local: "OrderedDict[Tuple[str, str], Tuple[int, float, frozenset]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending_bumps: Set[str] = set()
+
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    # ------------------------------------------------------------------
+    # KEYS
+    # ------------------------------------------------------------------
+    def _version_key(self, tenant_id: str) -> str:
+        return f"{self.VERSION_PREFIX}{tenant_id}"
+
+    def _entry_key(self, tenant_id: str, user_id: str, version: int) -> str:
+        return f"{self.ENTRY_PREFIX}{tenant_id}:{user_id}:{version}"
+
+    # ------------------------------------------------------------------
+    # LOCAL TIER
+    # ------------------------------------------------------------------
+    def _local_get(self, key: Tuple[str, str], version: int) -> Optional[frozenset]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            entry_version, expires_at, perms = entry
+            if entry_version != version or expires_at <= time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return perms
+
+    def _local_put(self, key: Tuple[str, str], version: int, perms: frozenset) -> None:
+        if self.local_size <= 0:
+            return
+        with self._lock:
+            self._local[key] = (version, time.monotonic() + self.ttl_seconds, perms)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _local_drop_tenant(self, tenant_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._local if k[0] == tenant_id]:
+                del self._local[key]
+
+    # ------------------------------------------------------------------
+    # LOOKUP
+    # ------------------------------------------------------------------
+    async def get_permissions(
+        self,
+        tenant_id: UUID | str,
+        user_id: UUID | str,
+        loader: PermissionLoader,
+    ) -> Set[str]:
+        """
+        Return the effective permissions for (tenant_id, user_id), calling
+        `loader` only when no tier holds an entry for the current version.
+        """
+        tenant_id, user_id = str(tenant_id), str(user_id)
+        local_key = (tenant_id, user_id)
+
+        try:
+            version = await self._current_version(tenant_id)
+
+            perms = self._local_get(local_key, version)
+            if perms is not None:
+                self.local_hits += 1
+                return set(perms)
+
+            entry_key = self._entry_key(tenant_id, user_id, version)
+            raw = await cache.get(entry_key)
+            if raw is not None:
+                perms = frozenset(json.loads(raw))
+                self._local_put(local_key, version, perms)
+                self.redis_hits += 1
+                return set(perms)
+        except Exception as ex:
+            logger.warning(f"Permission cache unavailable, loading from DB: {ex}")
+            self.bypassed += 1
+            return {str(p) for p in await loader()}
+
+        self.misses += 1
+        perms = frozenset(str(p) for p in await loader())
+        self._local_put(local_key, version, perms)
+        try:
+            await cache.set(entry_key, json.dumps(sorted(perms)), ttl=self.ttl_seconds)
+        except Exception as ex:
+            logger.warning(f"Could not store permissions in cache: {ex}")
+        return set(perms)
+
+    async def _current_version(self, tenant_id: str) -> int:
+        """
+        The tenant's version counter. Raises if Redis is unavailable or a
+        bump for the tenant is still outstanding.
+        """
+        if tenant_id in self._pending_bumps:
+            await self._incr_version(tenant_id)
+            self._pending_bumps.discard(tenant_id)
+        return await self._read_version(tenant_id)
+
+    async def _read_version(self, tenant_id: str) -> int:
+        key = self._version_key(tenant_id)
+        raw = await cache.get(key)
+        if raw is None:
+            await cache.set_if_absent(key, str(_version_seed()), ttl=_VERSION_TTL_SECONDS)
+            raw = await cache.get(key)
+        return int(raw)
+
+    async def _incr_version(self, tenant_id: str) -> None:
+        # Seed first: INCR on a missing key would restart the counter at 1
+        await self._read_version(tenant_id)
+        await cache.incr(self._version_key(tenant_id), ttl=_VERSION_TTL_SECONDS)
+
+    async def tenant_version(self, tenant_id: UUID | str) -> Optional[int]:
+        """
+        Current permission version for the tenant, or None if it cannot be
+        trusted (Redis unavailable, or a bump not yet applied).
+        """
+        try:
+            return await self._current_version(str(tenant_id))
+        except Exception as ex:
+            logger.warning(f"Could not read permission version: {ex}")
+            return None
+
+    # ------------------------------------------------------------------
+    # INVALIDATION
+    # ------------------------------------------------------------------
+    async def bump_tenant(self, tenant_id: UUID | str) -> None:
+        """
+        Invalidate every cached permission set for the tenant.
+        """
+        tenant_id = str(tenant_id)
+        self._local_drop_tenant(tenant_id)
+        self._pending_bumps.discard(tenant_id)
+        try:
+            await self._incr_version(tenant_id)
+        except Exception as ex:
+            self._pending_bumps.add(tenant_id)
+            logger.error(f"Could not bump permission version for tenant {tenant_id}, will retry: {ex}")
+
+    async def bump_tenant_on_commit(self, conn: Any, tenant_id: UUID | str) -> None:
+        """
+        Bump the tenant once `conn`'s transaction commits. Bumping earlier
+        lets a concurrent reader cache the old grants under the new version.
+        A plain connection (no commit hook) bumps immediately.
+        """
+        if isinstance(conn, LazyTenantConnection):
+            tenant_id = str(tenant_id)
+            conn.after_commit(lambda: self.bump_tenant(tenant_id))
+        else:
+            await self.bump_tenant(tenant_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._local)
+        return {
+            "local_size": size,
+            "local_max_size": self.local_size,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+        }
+
+
+permission_cache = PermissionCache(
+    local_size=settings.PERMISSION_CACHE_LOCAL_SIZE,
+    ttl_seconds=settings.PERMISSION_CACHE_TTL_SECONDS,
+)
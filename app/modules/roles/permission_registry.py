@@ -0,0 +1,216 @@
+# app/modules/roles/permission_registry.py
+
+"""
+Dense bit indexes for the global permission catalog.
+
+Every `permissions.key` gets a bit, in key order, so the same catalog
+always yields the same layout in every worker. A set of grants (including
+"*" and "prefix.*" wildcards) compiles to one integer mask; a guard's
+required keys compile to another, and the check is a single AND.
+
+- version: fingerprint of the catalog (changes whenever a key is added or
+  removed); anything that stores a compiled mask must store it too.
+- compiled grant sets are memoized, so users sharing the same roles share
+  one compilation.
+- a grant or requirement that is not in the catalog marks the registry
+  stale; callers reload it (rate limited) and retry.
+- the registry only ever loads committed catalog state: a transaction that
+  adds keys schedules the reload for after its COMMIT.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from asyncpg import Connection
+
+from app.core.database import LazyTenantConnection, db
+
+logger = logging.getLogger("uvicorn")
+
+_COMPILED_MEMO_SIZE = 4096
+
+
+class PermissionRegistry:
+    def __init__(self, min_reload_interval_seconds: float = 5.0) -> None:
+        self.min_reload_interval_seconds = min_reload_interval_seconds
+
+        self.keys: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.version: str = ""
+        self.all_mask = 0
+
+        self._prefix_masks: Dict[str, int] = {}
+        self._compiled: Dict[FrozenSet[str], int] = {}
+        self._requirements: Dict[Tuple[str, ...], Tuple[int, List[str]]] = {}
+        self._lock = threading.Lock()
+        self._loaded_at = 0.0
+        self.stale = False
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self.version)
+
+    # ------------------------------------------------------------------
+    # LOAD
+    # ------------------------------------------------------------------
+    def load_keys(self, keys: Iterable[str]) -> None:
+        ordered = sorted(set(keys))
+        index = {key: bit for bit, key in enumerate(ordered)}
+
+        prefix_masks: Dict[str, int] = {}
+        for key, bit in index.items():
+            if "." in key:
+                prefix = key.split(".", 1)[0]
+                prefix_masks[prefix] = prefix_masks.get(prefix, 0) | (1 << bit)
+
+        with self._lock:
+            self.keys = ordered
+            self.index = index
+            self.all_mask = (1 << len(ordered)) - 1
+            self._prefix_masks = prefix_masks
+            self._compiled = {}
+            self._requirements = {}
+            self.version = hashlib.sha256("\n".join(ordered).encode("utf-8")).hexdigest()[:16]
+            self._loaded_at = time.monotonic()
+            self.stale = False
+
+    async def load(self, conn: Optional[Connection] = None) -> None:
+        sql = "SELECT key FROM permissions ORDER BY key"
+        if conn is not None:
+            rows = await conn.fetch(sql)
+        else:
+            async with db.acquire() as pooled:
+                rows = await pooled.fetch(sql)
+        self.load_keys(r["key"] for r in rows)
+
+    def reload_on_commit(self, conn: Any) -> None:
+        """
+        Reload once `conn`'s transaction (which added catalog keys) commits.
+        A plain connection has no commit hook: mark stale instead.
+        """
+        if isinstance(conn, LazyTenantConnection):
+            conn.after_commit(self._reload)
+        else:
+            self.stale = True
+
+    async def _reload(self) -> None:
+        try:
+            await self.load()
+        except Exception as ex:
+            logger.warning(f"Could not reload permission registry: {ex}")
+            self.stale = True
+
+    async def ensure_current(self, conn: Optional[Connection] = None) -> None:
+        """
+        Load on first use, and reload when marked stale (at most once per
+        min_reload_interval_seconds).
+        """
+        if not self.loaded:
+            await self.load(conn)
+        elif self.stale and (
+            time.monotonic() - self._loaded_at >= self.min_reload_interval_seconds
+        ):
+            await self.load(conn)
+
+    # ------------------------------------------------------------------
+    # COMPILE
+    # ------------------------------------------------------------------
+    def _grant_mask(self, grant: str) -> int:
+        if grant == "*":
+            return self.all_mask
+        if grant.endswith(".*"):
+            # The wildcard key itself may also be in the catalog.
+            mask = self._prefix_masks.get(grant[:-2], 0)
+            bit = self.index.get(grant)
+            return mask | (1 << bit) if bit is not None else mask
+
+        bit = self.index.get(grant)
+        if bit is None:
+            self.stale = True
+            return 0
+        return 1 << bit
+
+    def compile(self, grants: Iterable[str]) -> int:
+        """
+        Compile a set of granted keys (wildcards included) into a mask.
+        """
+        frozen = frozenset(grants)
+        with self._lock:
+            mask = self._compiled.get(frozen)
+        if mask is not None:
+            return mask
+
+        mask = 0
+        for grant in frozen:
+            mask |= self._grant_mask(grant)
+
+        with self._lock:
+            if len(self._compiled) >= _COMPILED_MEMO_SIZE:
+                self._compiled.clear()
+            self._compiled[frozen] = mask
+        return mask
+
+    def requirement(self, required: Iterable[str]) -> Tuple[int, List[str]]:
+        """
+        Mask for a list of required keys, plus any keys the catalog does
+        not know (which no mask can satisfy). Memoized per catalog version.
+        """
+        required = tuple(required)
+        cached = self._requirements.get(required)
+        if cached is not None:
+            return cached
+
+        mask = 0
+        unknown: List[str] = []
+        for key in required:
+            bit = self.index.get(key)
+            if bit is None:
+                unknown.append(key)
+            else:
+                mask |= 1 << bit
+        if unknown:
+            # Not memoized: the next reload may know these keys
+            self.stale = True
+        else:
+            self._requirements[required] = (mask, unknown)
+        return mask, unknown
+
+    # ------------------------------------------------------------------
+    # CHECK
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _wildcard_grants(grants: Set[str], key: str) -> bool:
+        if "*" in grants:
+            return True
+        return "." in key and key.split(".", 1)[0] + ".*" in grants
+
+    def missing(self, grant_mask: int, grants: Set[str], required: List[str]) -> List[str]:
+        """
+        Required keys not covered by grant_mask. The common case is one AND;
+        keys outside the catalog can only be satisfied by a wildcard grant.
+        """
+        required_mask, unknown = self.requirement(required)
+        if grant_mask & required_mask == required_mask and not unknown:
+            return []
+
+        missing: List[str] = []
+        for key in required:
+            bit = self.index.get(key)
+            if bit is not None:
+                if not grant_mask & (1 << bit):
+                    missing.append(key)
+            elif not self._wildcard_grants(grants, key):
+                missing.append(key)
+        return missing
+
+    def decode(self, mask: int) -> Set[str]:
+        """
+        Keys set in a mask (for debugging and profile responses).
+        """
+        return {key for key, bit in self.index.items() if mask & (1 << bit)}
+
+
+permission_registry = PermissionRegistry()
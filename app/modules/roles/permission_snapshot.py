@@ -0,0 +1,94 @@
+# app/modules/roles/permission_snapshot.py
+
+"""
+Compact permission snapshot embedded in access tokens.
+
+At login / refresh the user's effective permissions are compiled against
+permission_registry and written into the token as:
+
+    "pm": base64url bitmap of the permission mask
+    "pv": "<catalog version>:<tenant permission version>"
+
+A guard trusts "pm" while both versions are still current: the catalog
+version is this process's registry fingerprint, the tenant version is the
+Redis counter PermissionCache bumps on every role change. Checking that is
+one Redis GET; no database access is needed for authorization.
+"""
+
+import base64
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from asyncpg import Connection
+
+from app.modules.roles.permission_cache import permission_cache
+from app.modules.roles.permission_registry import permission_registry
+
+MASK_CLAIM = "pm"
+VERSION_CLAIM = "pv"
+
+
+def encode_mask(mask: int) -> str:
+    raw = mask.to_bytes(max(1, (mask.bit_length() + 7) // 8), "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_mask(value: str) -> int:
+    padded = value + "=" * (-len(value) % 4)
+    return int.from_bytes(base64.urlsafe_b64decode(padded), "big")
+
+
+async def build_permission_claims(
+    conn: Connection,
+    tenant_id: UUID,
+    user_id: UUID,
+) -> Dict[str, Any]:
+    """
+    Resolve the user's effective permissions (through the permission cache)
+    and return the claims to embed. `conn` must carry the tenant's RLS
+    context. Returns {} when the tenant version cannot be read, in which
+    case guards fall back to the cache / DB path.
+    """
+    from app.modules.users.repository import UserRepository
+
+    # Read the version first: a concurrent bump then invalidates the snapshot
+    # instead of letting it carry newer permissions under an older version.
+    tenant_version = await permission_cache.tenant_version(tenant_id)
+    if tenant_version is None:
+        return {}
+
+    async def load():
+        ctx = await UserRepository(conn).get_user_context(user_id, tenant_id)
+        return getattr(ctx, "permissions", None) or []
+
+    grants = await permission_cache.get_permissions(tenant_id, user_id, load)
+    await permission_registry.ensure_current(conn)
+    mask = permission_registry.compile(grants)
+
+    return {
+        MASK_CLAIM: encode_mask(mask),
+        VERSION_CLAIM: f"{permission_registry.version}:{tenant_version}",
+    }
+
+
+async def trusted_snapshot_mask(claims: Dict[str, Any], tenant_id: UUID) -> Optional[int]:
+    """
+    The token's permission mask if its snapshot is still current, else None.
+    """
+    encoded = claims.get(MASK_CLAIM)
+    stamp = claims.get(VERSION_CLAIM)
+    if not encoded or not stamp or not permission_registry.loaded:
+        return None
+
+    catalog_version, _, tenant_version = str(stamp).partition(":")
+    if catalog_version != permission_registry.version:
+        return None
+
+    current = await permission_cache.tenant_version(tenant_id)
+    if current is None or str(current) != tenant_version:
+        return None
+
+    try:
+        return decode_mask(encoded)
+    except (ValueError, TypeError):
+        return None
@@ -1,14 +1,249 @@
 # app/modules/roles/repository.py
 
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 import asyncpg
 from asyncpg import Connection
 
+from app.modules.roles.permission_cache import permission_cache
+from app.modules.roles.permission_registry import permission_registry
 from app.modules.roles.schemas import RoleCreate, RoleUpdate, RoleResponse
+from app.core.database import read_only
+from app.core.pagination import DEFAULT_PAGE_SIZE
+from app.core.statements import define
 
 
+_CREATE_ROLE = define(
+    "roles.create_role",
+    """
+    INSERT INTO roles (tenant_id, name, description)
+    VALUES (
+        current_setting('app.current_tenant_id', true)::uuid,
+        $1,
+        $2
+    )
+    RETURNING role_id, tenant_id, name, description, created_at
+    """,
+)
+
+_GET_ROLE = define(
+    "roles.get_role",
+    """
+    SELECT
+        r.role_id,
+        r.name,
+        r.description,
+        r.created_at,
+        COALESCE(
+            ARRAY_AGG(DISTINCT p.key) FILTER (WHERE p.key IS NOT NULL),
+            '{}'
+        ) AS permissions
+    FROM roles r
+    LEFT JOIN role_permissions rp ON rp.role_id = r.role_id
+    LEFT JOIN permissions p ON p.permission_id = rp.permission_id
+    WHERE r.role_id = $1
+    GROUP BY r.role_id, r.name, r.description, r.created_at
+    """,
+)
+
+_GET_ROLE_BY_NAME = define(
+    "roles.get_role_by_name",
+    """
+    SELECT
+        r.role_id,
+        r.name,
+        r.description,
+        r.created_at,
+        COALESCE(
+            ARRAY_AGG(DISTINCT p.key) FILTER (WHERE p.key IS NOT NULL),
+            '{}'
+        ) AS permissions
+    FROM roles r
+    LEFT JOIN role_permissions rp ON rp.role_id = r.role_id
+    LEFT JOIN permissions p ON p.permission_id = rp.permission_id
+    WHERE r.name = $1 AND r.tenant_id = $2
+    GROUP BY r.role_id, r.name, r.description, r.created_at
+    """,
+)
+
+_GET_ROLES = define(
+    "roles.get_roles",
+    """
+    SELECT
+        r.role_id,
+        r.name,
+        r.description,
+        r.created_at,
+        COALESCE(
+            ARRAY_AGG(DISTINCT p.key) FILTER (WHERE p.key IS NOT NULL),
+            '{}'
+        ) AS permissions
+    FROM (
+        SELECT role_id, name, description, created_at
+        FROM roles
+        WHERE ($1::timestamptz IS NULL OR (created_at, role_id) < ($1::timestamptz, $2::uuid))
+        ORDER BY created_at DESC, role_id DESC
+        LIMIT $3
+    ) r
+    LEFT JOIN role_permissions rp ON rp.role_id = r.role_id
+    LEFT JOIN permissions p ON p.permission_id = rp.permission_id
+    GROUP BY r.role_id, r.name, r.description, r.created_at
+    ORDER BY r.created_at DESC, r.role_id DESC
+    """,
+)
+
+_RENAME_ROLE = define(
+    "roles.rename_role",
+    """
+    UPDATE roles
+    SET name = $2
+    WHERE role_id = $1
+    """,
+)
+
+_SET_ROLE_DESCRIPTION = define(
+    "roles.set_role_description",
+    """
+    UPDATE roles
+    SET description = $2
+    WHERE role_id = $1
+    """,
+)
+
+_ROLE_TENANT = define(
+    "roles.role_tenant",
+    """
+    SELECT tenant_id FROM roles WHERE role_id = $1
+    """,
+)
+
+_DELETE_ROLE = define(
+    "roles.delete_role",
+    """
+    DELETE FROM roles WHERE role_id = $1 RETURNING tenant_id
+    """,
+)
+
+_ASSIGN_ROLE = define(
+    "roles.assign_role",
+    """
+    WITH ins AS (
+        INSERT INTO user_roles (user_tenant_id, role_id)
+        VALUES ($1, $2)
+        ON CONFLICT (user_tenant_id, role_id) DO NOTHING
+        RETURNING role_id
+    )
+    SELECT r.tenant_id
+    FROM ins
+    JOIN roles r ON r.role_id = ins.role_id
+    """,
+)
+
+_ASSIGN_ROLE_BY_NAME = define(
+    "roles.assign_role_by_name",
+    """
+    SELECT role_id FROM roles WHERE name = $1 AND tenant_id = $2
+    """,
+)
+
+_REMOVE_ROLE = define(
+    "roles.remove_role",
+    """
+    WITH del AS (
+        DELETE FROM user_roles
+        WHERE user_tenant_id = $1 AND role_id = $2
+        RETURNING role_id
+    )
+    SELECT r.tenant_id
+    FROM del
+    JOIN roles r ON r.role_id = del.role_id
+    """,
+)
+
+_GET_USER_ROLES = define(
+    "roles.get_user_roles",
+    """
+    SELECT
+        r.role_id,
+        r.name,
+        r.description,
+        r.created_at,
+        COALESCE(
+            ARRAY_AGG(DISTINCT p.key) FILTER (WHERE p.key IS NOT NULL),
+            '{}'
+        ) AS permissions
+    FROM roles r
+    JOIN user_roles ur ON ur.role_id = r.role_id
+    LEFT JOIN role_permissions rp ON rp.role_id = r.role_id
+    LEFT JOIN permissions p ON p.permission_id = rp.permission_id
+    WHERE ur.user_tenant_id = $1
+    GROUP BY r.role_id, r.name, r.description, r.created_at
+    """,
+)
+
+_CLEAR_ROLE_PERMISSIONS = define(
+    "roles.clear_role_permissions",
+    """
+    DELETE FROM role_permissions WHERE role_id = $1
+    """,
+)
+
+_PERMISSIONS_BY_KEY = define(
+    "roles.permissions_by_key",
+    """
+    SELECT permission_id, key
+    FROM permissions
+    WHERE key = ANY ($1::text[])
+    """,
+)
+
+_UPSERT_PERMISSION_KEYS = define(
+    "roles.upsert_permission_keys",
+    """
+    INSERT INTO permissions (key)
+    SELECT unnest($1::text[])
+    ON CONFLICT (key) DO UPDATE SET key = EXCLUDED.key
+    RETURNING permission_id, key
+    """,
+)
+
+_CURRENT_TENANT = define(
+    "roles.current_tenant",
+    """
+    SELECT current_setting('app.current_tenant_id', true) AS tid
+    """,
+)
+
+_INSERT_ROLE_PERMISSIONS = define(
+    "roles.insert_role_permissions",
+    """
+    INSERT INTO role_permissions (role_id, permission_id, tenant_id)
+    SELECT $1, unnest($2::uuid[]), $3::uuid
+    ON CONFLICT DO NOTHING
+    """,
+)
+
+_ALL_PERMISSIONS = define(
+    "roles.all_permissions",
+    """
+    SELECT permission_id, key
+    FROM permissions
+    ORDER BY key
+    """,
+)
+
+_PERMISSIONS_FOR_KEYS = define(
+    "roles.permissions_for_keys",
+    """
+    SELECT permission_id, key
+    FROM permissions
+    WHERE key = ANY($1::text[])
+    ORDER BY key
+    """,
+)
+
 class RoleRepository:
     """
     Tenant-scoped Role repository.
@@ -16,6 +251,9 @@ class RoleRepository:
     Relies on:
         - RLS using current_setting('app.current_tenant_id')
         - Enterprise schema: roles, role_permissions, permissions, tenants
+
+    Every write that can change a user's effective permissions bumps the
+    tenant's permission-cache version.
     """
 
     def __init__(self, conn: Connection):
@@ -30,15 +268,7 @@ class RoleRepository:
         """
         async with self.conn.transaction():
             row = await self.conn.fetchrow(
-                """
-                INSERT INTO roles (tenant_id, name, description)
-                VALUES (
-                    current_setting('app.current_tenant_id', true)::uuid,
-                    $1,
-                    $2
-                )
-                RETURNING role_id, name, description, created_at
-                """,
+                _CREATE_ROLE,
                 payload.name,
                 payload.description,
             )
@@ -49,6 +279,7 @@ class RoleRepository:
                     payload.permission_keys,
                 )
 
+        await permission_cache.bump_tenant_on_commit(self.conn, row["tenant_id"])
         return await self.get_role(row["role_id"])
 
     # ---------------------------------------------------------
@@ -56,22 +287,7 @@ class RoleRepository:
     # ---------------------------------------------------------
     async def get_role(self, role_id: UUID) -> Optional[RoleResponse]:
         row = await self.conn.fetchrow(
-            """
-            SELECT
-                r.role_id,
-                r.name,
-                r.description,
-                r.created_at,
-                COALESCE(
-                    ARRAY_AGG(DISTINCT p.key) FILTER (WHERE p.key IS NOT NULL),
-                    '{}'
-                ) AS permissions
-            FROM roles r
-            LEFT JOIN role_permissions rp ON rp.role_id = r.role_id
-            LEFT JOIN permissions p ON p.permission_id = rp.permission_id
-            WHERE r.role_id = $1
-            GROUP BY r.role_id, r.name, r.description, r.created_at
-            """,
+            _GET_ROLE,
             role_id,
         )
         return RoleResponse(**row) if row else None
@@ -79,45 +295,19 @@ class RoleRepository:
     async def get_role_by_name(self, name: str, tenant_id: UUID) -> Optional[RoleResponse]:
         """Get a role by name within a tenant."""
         row = await self.conn.fetchrow(
-            """
-            SELECT
-                r.role_id,
-                r.name,
-                r.description,
-                r.created_at,
-                COALESCE(
-                    ARRAY_AGG(DISTINCT p.key) FILTER (WHERE p.key IS NOT NULL),
-                    '{}'
-                ) AS permissions
-            FROM roles r
-            LEFT JOIN role_permissions rp ON rp.role_id = r.role_id
-            LEFT JOIN permissions p ON p.permission_id = rp.permission_id
-            WHERE r.name = $1 AND r.tenant_id = $2
-            GROUP BY r.role_id, r.name, r.description, r.created_at
-            """,
+            _GET_ROLE_BY_NAME,
             name,
             tenant_id,
         )
         return RoleResponse(**row) if row else None
 
-    async def get_roles(self) -> List[RoleResponse]:
+    @read_only
+    async def get_roles(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[RoleResponse]:
+        after_ts, after_id = after or (None, None)
         rows = await self.conn.fetch(
-            """
-            SELECT
-                r.role_id,
-                r.name,
-                r.description,
-                r.created_at,
-                COALESCE(
-                    ARRAY_AGG(DISTINCT p.key) FILTER (WHERE p.key IS NOT NULL),
-                    '{}'
-                ) AS permissions
-            FROM roles r
-            LEFT JOIN role_permissions rp ON rp.role_id = r.role_id
-            LEFT JOIN permissions p ON p.permission_id = rp.permission_id
-            GROUP BY r.role_id, r.name, r.description, r.created_at
-            ORDER BY r.created_at DESC
-            """
+            _GET_ROLES, after_ts, after_id, limit
         )
         return [RoleResponse(**r) for r in rows]
 
@@ -128,22 +318,14 @@ class RoleRepository:
         async with self.conn.transaction():
             if payload.name is not None:
                 await self.conn.execute(
-                    """
-                    UPDATE roles
-                    SET name = $2
-                    WHERE role_id = $1
-                    """,
+                    _RENAME_ROLE,
                     role_id,
                     payload.name,
                 )
 
             if payload.description is not None:
                 await self.conn.execute(
-                    """
-                    UPDATE roles
-                    SET description = $2
-                    WHERE role_id = $1
-                    """,
+                    _SET_ROLE_DESCRIPTION,
                     role_id,
                     payload.description,
                 )
@@ -151,6 +333,13 @@ class RoleRepository:
             if payload.permission_keys is not None:
                 await self._set_role_permissions(role_id, payload.permission_keys)
 
+        tenant_id = await self.conn.fetchval(
+            _ROLE_TENANT,
+            role_id,
+        )
+        if tenant_id:
+            await permission_cache.bump_tenant_on_commit(self.conn, tenant_id)
+
         updated = await self.get_role(role_id)
         return updated
 
@@ -158,10 +347,12 @@ class RoleRepository:
     # DELETE
     # ---------------------------------------------------------
     async def delete_role(self, role_id: UUID):
-        await self.conn.execute(
-            "DELETE FROM roles WHERE role_id = $1",
+        tenant_id = await self.conn.fetchval(
+            _DELETE_ROLE,
             role_id,
         )
+        if tenant_id:
+            await permission_cache.bump_tenant_on_commit(self.conn, tenant_id)
 
     # ---------------------------------------------------------
     # USER ROLE ASSIGNMENT (NEW METHODS)
@@ -175,19 +366,18 @@ class RoleRepository:
         Assign a role to a user (via user_roles table).
         """
         try:
-            await self.conn.execute(
-                """
-                INSERT INTO user_roles (user_tenant_id, role_id)
-                VALUES ($1, $2)
-                ON CONFLICT (user_tenant_id, role_id) DO NOTHING
-                """,
+            tenant_id = await self.conn.fetchval(
+                _ASSIGN_ROLE,
                 user_tenant_id,
                 role_id,
             )
-            return True
         except Exception:
             return False
 
+        if tenant_id:
+            await permission_cache.bump_tenant_on_commit(self.conn, tenant_id)
+        return True
+
     async def assign_role_by_name(
             self,
             user_tenant_id: UUID,
@@ -199,7 +389,7 @@ class RoleRepository:
         """
         # Get role_id from name
         role_row = await self.conn.fetchrow(
-            "SELECT role_id FROM roles WHERE name = $1 AND tenant_id = $2",
+            _ASSIGN_ROLE_BY_NAME,
             role_name,
             tenant_id,
         )
@@ -217,16 +407,18 @@ class RoleRepository:
         """
         Remove a role from a user.
         """
-        result = await self.conn.execute(
-            """
-            DELETE FROM user_roles
-            WHERE user_tenant_id = $1 AND role_id = $2
-            """,
+        tenant_id = await self.conn.fetchval(
+            _REMOVE_ROLE,
             user_tenant_id,
             role_id,
         )
-        return "DELETE 1" in result
+        if not tenant_id:
+            return False
+
+        await permission_cache.bump_tenant_on_commit(self.conn, tenant_id)
+        return True
 
+    @read_only
     async def get_user_roles(
             self,
             user_tenant_id: UUID,
@@ -235,23 +427,7 @@ class RoleRepository:
         Get all roles assigned to a user.
         """
         rows = await self.conn.fetch(
-            """
-            SELECT
-                r.role_id,
-                r.name,
-                r.description,
-                r.created_at,
-                COALESCE(
-                    ARRAY_AGG(DISTINCT p.key) FILTER (WHERE p.key IS NOT NULL),
-                    '{}'
-                ) AS permissions
-            FROM roles r
-            JOIN user_roles ur ON ur.role_id = r.role_id
-            LEFT JOIN role_permissions rp ON rp.role_id = r.role_id
-            LEFT JOIN permissions p ON p.permission_id = rp.permission_id
-            WHERE ur.user_tenant_id = $1
-            GROUP BY r.role_id, r.name, r.description, r.created_at
-            """,
+            _GET_USER_ROLES,
             user_tenant_id,
         )
         return [RoleResponse(**r) for r in rows]
@@ -283,7 +459,7 @@ class RoleRepository:
     async def _set_role_permissions(self, role_id: UUID, permission_keys: List[str]):
         # Clear existing
         await self.conn.execute(
-            "DELETE FROM role_permissions WHERE role_id = $1",
+            _CLEAR_ROLE_PERMISSIONS,
             role_id,
         )
 
@@ -297,11 +473,7 @@ class RoleRepository:
 
         # Ensure permissions exist
         rows = await self.conn.fetch(
-            """
-            SELECT permission_id, key
-            FROM permissions
-            WHERE key = ANY ($1::text[])
-            """,
+            _PERMISSIONS_BY_KEY,
             permission_keys,
         )
         existing = {r["key"]: r["permission_id"] for r in rows}
@@ -309,34 +481,27 @@ class RoleRepository:
         missing = [k for k in permission_keys if k not in existing]
         if missing:
             perms = await self.conn.fetch(
-                """
-                INSERT INTO permissions (key)
-                SELECT unnest($1::text[])
-                ON CONFLICT (key) DO UPDATE SET key = EXCLUDED.key
-                RETURNING permission_id, key
-                """,
+                _UPSERT_PERMISSION_KEYS,
                 missing,
             )
             for r in perms:
                 existing[r["key"]] = r["permission_id"]
 
+            # New catalog keys shift the bit layout, once committed
+            permission_registry.reload_on_commit(self.conn)
+
         # Link to role
         tenant_id_row = await self.conn.fetchrow(
-            "SELECT current_setting('app.current_tenant_id', true) AS tid"
+            _CURRENT_TENANT
         )
         tenant_id = tenant_id_row["tid"]
 
-        inserts = [
-            (role_id, existing[key], tenant_id)
-            for key in permission_keys
-        ]
-        await self.conn.executemany(
-            """
-            INSERT INTO role_permissions (role_id, permission_id, tenant_id)
-            VALUES ($1, $2, $3)
-            ON CONFLICT DO NOTHING
-            """,
-            inserts,
+        # One statement, so user_effective_permissions is refreshed once
+        await self.conn.execute(
+            _INSERT_ROLE_PERMISSIONS,
+            role_id,
+            [existing[key] for key in permission_keys],
+            tenant_id,
         )
 
     async def _fetch_permissions_for_keys(
@@ -348,19 +513,10 @@ class RoleRepository:
 
         if "*" in permission_keys:
             return await self.conn.fetch(
-                """
-                SELECT permission_id, key
-                FROM permissions
-                ORDER BY key
-                """
+                _ALL_PERMISSIONS
             )
 
         return await self.conn.fetch(
-            """
-            SELECT permission_id, key
-            FROM permissions
-            WHERE key = ANY($1::text[])
-            ORDER BY key
-            """,
+            _PERMISSIONS_FOR_KEYS,
             permission_keys,
         )
\ No newline at end of file
@@ -3,8 +3,9 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 
+from app.core.pagination import PageParams, page_params, set_next_cursor
 from app.dependencies.database import get_tenant_db_connection
 from app.dependencies.permissions import require_permissions
 from app.modules.roles.schemas import RoleCreate, RoleUpdate, RoleResponse
@@ -16,7 +17,7 @@ router = APIRouter(
 )
 
 
-def get_role_service(conn=Depends(get_tenant_db_connection)) -> RoleService:
+def get_role_service(conn=Depends(get_tenant_db_connection, scope="function")) -> RoleService:
     return RoleService(conn)
 
 
@@ -25,8 +26,14 @@ def get_role_service(conn=Depends(get_tenant_db_connection)) -> RoleService:
     response_model=List[RoleResponse],
     dependencies=[Depends(require_permissions(["role.read"]))],
 )
-async def list_roles(service: RoleService = Depends(get_role_service)):
-    return await service.list_roles()
+async def list_roles(
+    response: Response,
+    page: PageParams = Depends(page_params),
+    service: RoleService = Depends(get_role_service),
+):
+    roles, next_cursor = await service.list_roles(page)
+    set_next_cursor(response, next_cursor)
+    return roles
 
 
 @router.post(
@@ -1,15 +1,18 @@
 # app/modules/roles/service.py
 
-from typing import List
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
 
+from app.core.pagination import PageParams, created_keyset, fetch_page
 from app.modules.roles.repository import RoleRepository
 from app.modules.roles.schemas import RoleCreate, RoleUpdate, RoleResponse
 from app.modules.audit.repository import AuditRepository
 from app.modules.audit.schemas import AuditLogCreate
 
+ROLE_KEYSET = created_keyset("role_id")
+
 
 class RoleService:
     def __init__(self, conn):
@@ -17,8 +20,8 @@ class RoleService:
         self.repo = RoleRepository(conn)
         self.audit_repo = AuditRepository(conn)
 
-    async def list_roles(self) -> List[RoleResponse]:
-        return await self.repo.get_roles()
+    async def list_roles(self, page: PageParams = PageParams()) -> Tuple[List[RoleResponse], Optional[str]]:
+        return await fetch_page(self.repo.get_roles, page, ROLE_KEYSET)
 
     async def create_role(self, payload: RoleCreate) -> RoleResponse:
         role = await self.repo.create_role(payload)
@@ -1,12 +1,85 @@
 # app/modules/scim/repository.py
 
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID, uuid4
 from asyncpg import Connection
 
 from app.modules.scim.schemas import SCIMUserCreate, SCIMUserResponse, SCIMName, SCIMEmail, SCIMMeta
 from app.modules.users.repository import UserRepository
-from app.core.security import get_password_hash
+from app.core.password_hasher import password_hasher
+from app.core.database import read_only
+from app.core.statements import define
+
+
+_UPSERT_MAPPING = define(
+    "scim.upsert_mapping",
+    """
+    INSERT INTO scim_mappings (tenant_id, user_id, external_id, active)
+    VALUES ($1, $2, $3, $4)
+    ON CONFLICT (tenant_id, external_id) 
+    DO UPDATE SET user_id = EXCLUDED.user_id, active = EXCLUDED.active, created_at = now()
+    """,
+)
+
+_USER_CREATED_AT = define(
+    "scim.user_created_at",
+    """
+    SELECT created_at FROM users WHERE user_id = $1
+    """,
+)
+
+_GET_USER_BY_EMAIL = define(
+    "scim.get_user_by_email",
+    """
+    SELECT user_id, primary_email FROM users WHERE primary_email = lower($1)
+    """,
+)
+
+# SCIM-provisioned users of the current tenant (RLS), in a stable order.
+# SCIM paging is index based (startIndex/count); streaming passes
+# OFFSET 0 / LIMIT NULL.
+_LIST_SCIM_USERS = define(
+    "scim.list_users",
+    """
+    SELECT
+        u.user_id,
+        u.primary_email,
+        u.created_at,
+        u.updated_at,
+        sm.external_id,
+        sm.active
+    FROM scim_mappings sm
+    JOIN users u ON u.user_id = sm.user_id
+    ORDER BY sm.scim_id
+    OFFSET $1
+    LIMIT $2
+    """,
+)
+
+_COUNT_SCIM_USERS = define(
+    "scim.count_users",
+    """
+    SELECT count(*) FROM scim_mappings
+    """,
+)
+
+
+def scim_user_resource(row: Any, base_url: str) -> Dict[str, Any]:
+    """A scim_mappings/users row as a SCIM User resource (plain dict)."""
+    return {
+        "id": row["user_id"],
+        "userName": row["primary_email"],
+        "name": None,
+        "emails": [{"value": row["primary_email"], "primary": True}],
+        "active": row["active"],
+        "externalId": row["external_id"],
+        "meta": {
+            "resourceType": "User",
+            "created": row["created_at"],
+            "lastModified": row["updated_at"] or row["created_at"],
+            "location": f"{base_url}/scim/v2/Users/{row['user_id']}",
+        },
+    }
 
 
 class SCIMRepository:
@@ -51,7 +124,7 @@ class SCIMRepository:
                 # We manually construct the dict for UserRepository.create_user
                 # because it expects 'hashed_password' and 'tenant_id'.
                 random_pw = str(uuid4())
-                hashed_pw = get_password_hash(random_pw)
+                hashed_pw = await password_hasher.hash(random_pw)
 
                 user_payload = {
                     "email": payload.userName,
@@ -69,12 +142,7 @@ class SCIMRepository:
             # 3. Create/Update SCIM Mapping
             external_id = payload.externalId or payload.userName
             await self.conn.execute(
-                """
-                INSERT INTO scim_mappings (tenant_id, user_id, external_id, active)
-                VALUES ($1, $2, $3, $4)
-                ON CONFLICT (tenant_id, external_id) 
-                DO UPDATE SET user_id = EXCLUDED.user_id, active = EXCLUDED.active, created_at = now()
-                """,
+                _UPSERT_MAPPING,
                 tenant_id,
                 user_id,
                 external_id,
@@ -83,7 +151,7 @@ class SCIMRepository:
 
             # Fetch created/updated timestamp for meta
             row = await self.conn.fetchrow(
-                "SELECT created_at FROM users WHERE user_id = $1",
+                _USER_CREATED_AT,
                 user_id
             )
             created_at = row["created_at"]
@@ -110,6 +178,22 @@ class SCIMRepository:
 
     async def _get_user_by_email(self, email: str):
         return await self.conn.fetchrow(
-            "SELECT user_id, primary_email FROM users WHERE primary_email = lower($1)",
+            _GET_USER_BY_EMAIL,
             email,
-        )
\ No newline at end of file
+        )
+    # ------------------------------------------------------------------
+    # LIST / EXPORT
+    # ------------------------------------------------------------------
+    @read_only
+    async def list_scim_users(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        rows = await self.conn.fetch(_LIST_SCIM_USERS, offset, limit)
+        return [dict(r) for r in rows]
+
+    @read_only
+    async def count_scim_users(self) -> int:
+        return await self.conn.fetchval(_COUNT_SCIM_USERS)
+
+    async def iter_scim_users(self) -> AsyncIterator[Any]:
+        """Every SCIM-provisioned user, through a server-side cursor."""
+        async for r in self.conn.cursor(_LIST_SCIM_USERS, 0, None):
+            yield r
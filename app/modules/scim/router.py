@@ -1,8 +1,9 @@
 # app/modules/scim/router.py
 
-from fastapi import APIRouter, Depends, Header, Request, status
+from fastapi import APIRouter, Depends, Header, Query, Request, status
+from app.core.streaming import ndjson_response, wants_ndjson
 from app.dependencies.database import get_db_connection
-from app.modules.scim.schemas import SCIMUserCreate, SCIMUserResponse
+from app.modules.scim.schemas import SCIMListResponse, SCIMUserCreate, SCIMUserResponse
 from app.modules.scim.service import SCIMService
 
 router = APIRouter(
@@ -11,7 +12,7 @@ router = APIRouter(
 )
 
 
-def get_scim_service(conn=Depends(get_db_connection)) -> SCIMService:
+def get_scim_service(conn=Depends(get_db_connection, scope="function")) -> SCIMService:
     """
     Note:
     - In tests, get_db_connection is overridden to yield a connection with
@@ -43,3 +44,24 @@ async def scim_create_user(
     We provision into the tenant tied to the API key.
     """
     return await service.create_scim_user(request, payload, authorization)
+
+
+@router.get(
+    "/Users",
+    response_model=SCIMListResponse,
+)
+async def scim_list_users(
+    request: Request,
+    startIndex: int = Query(1, ge=1),
+    count: int = Query(100, ge=0),
+    authorization: str = Header(None, alias="Authorization"),
+    service: SCIMService = Depends(get_scim_service),
+):
+    """
+    SCIM ListResponse of the API key's tenant users (startIndex/count
+    paging). With `Accept: application/x-ndjson` every user resource is
+    streamed instead (full export).
+    """
+    if wants_ndjson(request):
+        return ndjson_response(await service.export_scim_users(request, authorization))
+    return await service.list_scim_users(request, authorization, startIndex, count)
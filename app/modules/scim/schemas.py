@@ -49,3 +49,11 @@ class SCIMUserResponse(BaseModel):
     active: bool
     externalId: Optional[str] = None
     meta: SCIMMeta
+
+
+class SCIMListResponse(BaseModel):
+    schemas: List[str] = ["urn:ietf:params:scim:api:messages:2.0:ListResponse"]
+    totalResults: int
+    startIndex: int
+    itemsPerPage: int
+    Resources: List[SCIMUserResponse]
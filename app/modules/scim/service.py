@@ -1,11 +1,14 @@
 # app/modules/scim/service.py
 
+from typing import Any, AsyncIterator, Dict
 from uuid import UUID
 from fastapi import HTTPException, status
 from starlette.requests import Request
 
-from app.modules.scim.schemas import SCIMUserCreate, SCIMUserResponse
-from app.modules.scim.repository import SCIMRepository
+from app.core.database import set_tenant_context
+from app.core.pagination import MAX_PAGE_SIZE
+from app.modules.scim.schemas import SCIMListResponse, SCIMUserCreate, SCIMUserResponse
+from app.modules.scim.repository import SCIMRepository, scim_user_resource
 from app.modules.api_keys.service import ApiKeyService
 from app.modules.api_keys.repository import ApiKeyRepository
 
@@ -57,3 +60,52 @@ class SCIMService:
         # 2. Provision user
         base_url = str(request.base_url).rstrip("/")
         return await self.repo.create_scim_user(payload, tenant_id, base_url)
+
+    # ------------------------------------------------------------------
+    # LIST / EXPORT
+    # ------------------------------------------------------------------
+    async def _enter_tenant(self, authorization: str) -> UUID:
+        tenant_id = await self._authenticate_scim_request(authorization)
+        # RLS scope for the reads below: the API key's tenant
+        await set_tenant_context(self.conn, tenant_id)
+        return tenant_id
+
+    async def list_scim_users(
+        self,
+        request: Request,
+        authorization: str,
+        start_index: int = 1,
+        count: int = 100,
+    ) -> SCIMListResponse:
+        await self._enter_tenant(authorization)
+        start_index = max(1, start_index)
+        count = max(0, min(count, MAX_PAGE_SIZE))
+
+        base_url = str(request.base_url).rstrip("/")
+        total = await self.repo.count_scim_users()
+        rows = await self.repo.list_scim_users(start_index - 1, count) if count else []
+        resources = [SCIMUserResponse(**scim_user_resource(r, base_url)) for r in rows]
+        return SCIMListResponse(
+            totalResults=total,
+            startIndex=start_index,
+            itemsPerPage=len(resources),
+            Resources=resources,
+        )
+
+    async def export_scim_users(
+        self,
+        request: Request,
+        authorization: str,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Authenticate now (so a bad key is still a 401), then hand back an
+        iterator over every SCIM user resource for NDJSON streaming.
+        """
+        await self._enter_tenant(authorization)
+        base_url = str(request.base_url).rstrip("/")
+
+        async def resources() -> AsyncIterator[Dict[str, Any]]:
+            async for row in self.repo.iter_scim_users():
+                yield scim_user_resource(row, base_url)
+
+        return resources()
@@ -1,14 +1,102 @@
 # app/modules/sso/repository.py
 
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
 from asyncpg import Connection
 
 from app.modules.sso.schemas import SSOProviderCreate, SSOProviderUpdate, SSOProviderResponse
 from app.core.encryption import encrypt_value, decrypt_value
+from app.core.database import read_only
+from app.core.pagination import DEFAULT_PAGE_SIZE
+from app.core.statements import define
 
 
+_CREATE = define(
+    "sso.create",
+    """
+    INSERT INTO sso_providers (
+        tenant_id,
+        name,
+        provider_type,
+        enabled,
+        description,
+        config
+    )
+    VALUES (
+        current_setting('app.current_tenant_id', true)::uuid,
+        $1,
+        $2,
+        $3,
+        $4,
+        $5::jsonb
+    )
+    RETURNING
+        sso_provider_id,
+        tenant_id,
+        name,
+        provider_type,
+        enabled,
+        description,
+        config,
+        created_at
+    """,
+)
+
+_LIST_PROVIDERS = define(
+    "sso.list_providers",
+    """
+    SELECT
+        sso_id AS sso_provider_id,
+        name,
+        provider_type,
+        enabled,
+        description,
+        config,
+        created_at
+    FROM sso_providers
+    WHERE ($1::timestamptz IS NULL OR (created_at, sso_id) < ($1::timestamptz, $2::uuid))
+    ORDER BY created_at DESC, sso_id DESC
+    LIMIT $3
+    """,
+)
+
+_GET_BY_ID = define(
+    "sso.get_by_id",
+    """
+    SELECT
+        sso_provider_id,
+        name,
+        provider_type,
+        enabled,
+        description,
+        config,
+        created_at
+    FROM sso_providers
+    WHERE sso_provider_id = $1
+    """,
+)
+
+_UPDATE = define(
+    "sso.update",
+    """
+    UPDATE sso_providers
+    SET name = $2,
+        description = $3,
+        enabled = $4,
+        config = $5::jsonb
+    WHERE sso_provider_id = $1
+    """,
+)
+
+_DELETE = define(
+    "sso.delete",
+    """
+    DELETE FROM sso_providers WHERE sso_provider_id = $1
+    """,
+)
+
 class SSOProviderRepository:
     """
     Tenant-scoped SSO Provider repository.
@@ -27,33 +115,7 @@ class SSOProviderRepository:
         enc_config = self._encrypt_config(payload.config)
 
         row = await self.conn.fetchrow(
-            """
-            INSERT INTO sso_providers (
-                tenant_id,
-                name,
-                provider_type,
-                enabled,
-                description,
-                config
-            )
-            VALUES (
-                current_setting('app.current_tenant_id', true)::uuid,
-                $1,
-                $2,
-                $3,
-                $4,
-                $5::jsonb
-            )
-            RETURNING
-                sso_provider_id,
-                tenant_id,
-                name,
-                provider_type,
-                enabled,
-                description,
-                config,
-                created_at
-            """,
+            _CREATE,
             payload.name,
             payload.provider_type,
             payload.enabled,
@@ -75,20 +137,13 @@ class SSOProviderRepository:
     # ------------------------------------------------------------------
     # READ
     # ------------------------------------------------------------------
-    async def list_providers(self) -> List[SSOProviderResponse]:
+    @read_only
+    async def list_providers(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[SSOProviderResponse]:
+        after_ts, after_id = after or (None, None)
         rows = await self.conn.fetch(
-            """
-            SELECT
-                sso_provider_id,
-                name,
-                provider_type,
-                enabled,
-                description,
-                config,
-                created_at
-            FROM sso_providers
-            ORDER BY created_at DESC
-            """
+            _LIST_PROVIDERS, after_ts, after_id, limit
         )
         providers: List[SSOProviderResponse] = []
         for r in rows:
@@ -108,18 +163,7 @@ class SSOProviderRepository:
 
     async def get_by_id(self, provider_id: UUID) -> Optional[SSOProviderResponse]:
         r = await self.conn.fetchrow(
-            """
-            SELECT
-                sso_provider_id,
-                name,
-                provider_type,
-                enabled,
-                description,
-                config,
-                created_at
-            FROM sso_providers
-            WHERE sso_provider_id = $1
-            """,
+            _GET_BY_ID,
             provider_id,
         )
         if not r:
@@ -152,14 +196,7 @@ class SSOProviderRepository:
         enc_config = self._encrypt_config(new_config)
 
         await self.conn.execute(
-            """
-            UPDATE sso_providers
-            SET name = $2,
-                description = $3,
-                enabled = $4,
-                config = $5::jsonb
-            WHERE sso_provider_id = $1
-            """,
+            _UPDATE,
             provider_id,
             new_name,
             new_description,
@@ -171,7 +208,7 @@ class SSOProviderRepository:
 
     async def delete(self, provider_id: UUID):
         await self.conn.execute(
-            "DELETE FROM sso_providers WHERE sso_provider_id = $1",
+            _DELETE,
             provider_id,
         )
 
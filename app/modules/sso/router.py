@@ -3,8 +3,9 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 
+from app.core.pagination import PageParams, page_params, set_next_cursor
 from app.dependencies.database import get_tenant_db_connection
 from app.dependencies.permissions import require_permissions
 from app.modules.sso.schemas import (
@@ -20,7 +21,7 @@ router = APIRouter(
 )
 
 
-def get_sso_service(conn=Depends(get_tenant_db_connection)) -> SSOService:
+def get_sso_service(conn=Depends(get_tenant_db_connection, scope="function")) -> SSOService:
     return SSOService(conn)
 
 
@@ -43,9 +44,13 @@ async def create_sso_provider(
     dependencies=[Depends(require_permissions(["sso.read"]))],
 )
 async def list_sso_providers(
+    response: Response,
+    page: PageParams = Depends(page_params),
     service: SSOService = Depends(get_sso_service),
 ):
-    return await service.list_providers()
+    providers, next_cursor = await service.list_providers(page)
+    set_next_cursor(response, next_cursor)
+    return providers
 
 
 @router.patch(
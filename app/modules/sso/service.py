@@ -1,6 +1,6 @@
 # app/modules/sso/service.py
 
-from typing import List
+from typing import List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
@@ -10,10 +10,13 @@ from app.modules.sso.schemas import (
     SSOProviderUpdate,
     SSOProviderResponse,
 )
+from app.core.pagination import PageParams, created_keyset, fetch_page
 from app.modules.sso.repository import SSOProviderRepository
 from app.modules.audit.repository import AuditRepository
 from app.modules.audit.schemas import AuditLogCreate
 
+SSO_PROVIDER_KEYSET = created_keyset("sso_provider_id")
+
 
 class SSOService:
     def __init__(self, conn):
@@ -41,13 +44,15 @@ class SSOService:
     # ---------------------------------------------------------
     # LIST
     # ---------------------------------------------------------
-    async def list_providers(self) -> List[SSOProviderResponse]:
-        providers = await self.repo.list_providers()
+    async def list_providers(
+        self, page: PageParams = PageParams()
+    ) -> Tuple[List[SSOProviderResponse], Optional[str]]:
+        providers, next_cursor = await fetch_page(self.repo.list_providers, page, SSO_PROVIDER_KEYSET)
         # Mask secrets in listing
         for p in providers:
             if "client_secret" in p.config:
                 p.config["client_secret"] = "********"
-        return providers
+        return providers, next_cursor
 
     # ---------------------------------------------------------
     # UPDATE
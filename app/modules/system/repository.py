@@ -1,8 +1,30 @@
 # app/modules/system/repository.py
 
 from asyncpg import Connection
+from app.core.statements import define
 
 
+_CLEANUP_EXPIRED_REFRESH_TOKENS = define(
+    "system.cleanup_expired_refresh_tokens",
+    """
+    DELETE FROM refresh_tokens WHERE expires_at < now()
+    """,
+)
+
+_CLEANUP_EXPIRED_PASSWORD_RESET_TOKENS = define(
+    "system.cleanup_expired_password_reset_tokens",
+    """
+    DELETE FROM password_reset_tokens WHERE expires_at < now()
+    """,
+)
+
+_CLEANUP_EXPIRED_BLACKLIST_ENTRIES = define(
+    "system.cleanup_expired_blacklist_entries",
+    """
+    DELETE FROM token_blacklist WHERE expires_at < now()
+    """,
+)
+
 class SystemRepository:
     """
     Low-level cleanup repository.
@@ -23,7 +45,7 @@ class SystemRepository:
         Returns: number of rows deleted.
         """
         result = await self.conn.execute(
-            "DELETE FROM refresh_tokens WHERE expires_at < now()"
+            _CLEANUP_EXPIRED_REFRESH_TOKENS
         )
         # asyncpg returns e.g. "DELETE 3"
         try:
@@ -33,7 +55,7 @@ class SystemRepository:
 
     async def cleanup_expired_password_reset_tokens(self) -> int:
         result = await self.conn.execute(
-            "DELETE FROM password_reset_tokens WHERE expires_at < now()"
+            _CLEANUP_EXPIRED_PASSWORD_RESET_TOKENS
         )
         try:
             return int(result.split()[-1])
@@ -42,7 +64,7 @@ class SystemRepository:
 
     async def cleanup_expired_blacklist_entries(self) -> int:
         result = await self.conn.execute(
-            "DELETE FROM token_blacklist WHERE expires_at < now()"
+            _CLEANUP_EXPIRED_BLACKLIST_ENTRIES
         )
         try:
             return int(result.split()[-1])
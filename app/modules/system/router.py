@@ -2,6 +2,16 @@
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 
+from app.core.admission import login_admission
+from app.core.database import db
+from app.core.password_hasher import password_hasher
+from app.core.query_log import query_metrics
+from app.core.security import verified_token_cache
+from app.core.statements import statements
+from app.modules.audit.buffer import audit_buffer
+from app.modules.audit.partitions import audit_partitions
+from app.modules.auth.lockout import login_lockout
+from app.modules.roles.permission_cache import permission_cache
 from app.dependencies.database import get_db_connection
 from app.modules.system.service import SystemService
 from app.modules.system.schemas import CleanupResult
@@ -12,7 +22,7 @@ router = APIRouter(
 )
 
 
-def get_system_service(conn=Depends(get_db_connection)) -> SystemService:
+def get_system_service(conn=Depends(get_db_connection, scope="function")) -> SystemService:
     """
     Uses the system-level DB connection (no tenant RLS context),
     as this endpoint is meant for global maintenance.
@@ -44,3 +54,52 @@ async def run_cleanup(
 
     result = await service.run_cleanup()
     return result
+
+
+@router.get("/metrics")
+async def get_metrics(
+    x_system_key: str = Header(None, alias="X-System-Key"),
+):
+    """
+    In-process runtime metrics for this worker (caches, pools, queues).
+
+    - Protected by the same X-System-Key header as /system/cleanup.
+    """
+    if x_system_key != "sys_admin_secret_123":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid system key",
+        )
+
+    return {
+        "audit_buffer": audit_buffer.stats(),
+        "audit_partitions": audit_partitions.stats(),
+        "db_pool": db.stats(),
+        "login_admission": login_admission.stats(),
+        "password_hasher": password_hasher.stats(),
+        "permission_cache": permission_cache.stats(),
+        "queries": query_metrics.stats(),
+        "statements": statements.stats(),
+        "token_cache": verified_token_cache.stats(),
+    }
+
+
+@router.delete(
+    "/login-lockouts/ip/{ip_address}",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def reset_ip_lockout(
+    ip_address: str,
+    x_system_key: str = Header(None, alias="X-System-Key"),
+):
+    """
+    Clear failed-login counters and any lockout for a client IP.
+    """
+    if x_system_key != "sys_admin_secret_123":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid system key",
+        )
+
+    await login_lockout.reset_ip(ip_address)
+    return None
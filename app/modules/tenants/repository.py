@@ -1,12 +1,54 @@
 # app/modules/tenants/repository.py
 
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Tuple
 from uuid import UUID
 from asyncpg import Connection
 
 from app.modules.tenants.schemas import TenantCreate, TenantResponse
+from app.core.database import read_only
+from app.core.pagination import DEFAULT_PAGE_SIZE
+from app.core.statements import define
 
 
+_CREATE = define(
+    "tenants.create",
+    """
+    INSERT INTO tenants (name, domain, plan, region, status)
+    VALUES ($1, lower($2), $3, COALESCE($4, 'us-east-1'), 'active')
+    RETURNING tenant_id, name, domain, plan, region, status, created_at
+    """,
+)
+
+_GET_BY_ID = define(
+    "tenants.get_by_id",
+    """
+    SELECT tenant_id, name, domain, plan, region, status, created_at
+    FROM tenants
+    WHERE tenant_id = $1
+    """,
+)
+
+_GET_BY_DOMAIN = define(
+    "tenants.get_by_domain",
+    """
+    SELECT tenant_id, name, domain, plan, region, status, created_at
+    FROM tenants
+    WHERE domain = lower($1)
+    """,
+)
+
+_LIST_TENANTS = define(
+    "tenants.list_tenants",
+    """
+    SELECT tenant_id, name, domain, plan, region, status, created_at
+    FROM tenants
+    WHERE ($1::timestamptz IS NULL OR (created_at, tenant_id) < ($1::timestamptz, $2::uuid))
+    ORDER BY created_at DESC, tenant_id DESC
+    LIMIT $3
+    """,
+)
+
 class TenantRepository:
     """
     Low-level data access for tenants.
@@ -22,11 +64,7 @@ class TenantRepository:
         Status defaults to 'active'.
         """
         row = await self.conn.fetchrow(
-            """
-            INSERT INTO tenants (name, domain, plan, region, status)
-            VALUES ($1, lower($2), $3, COALESCE($4, 'us-east-1'), 'active')
-            RETURNING tenant_id, name, domain, plan, region, status, created_at
-            """,
+            _CREATE,
             payload.name,
             payload.domain,
             payload.plan,
@@ -37,32 +75,24 @@ class TenantRepository:
 
     async def get_by_id(self, tenant_id: UUID) -> Optional[TenantResponse]:
         row = await self.conn.fetchrow(
-            """
-            SELECT tenant_id, name, domain, plan, region, status, created_at
-            FROM tenants
-            WHERE tenant_id = $1
-            """,
+            _GET_BY_ID,
             tenant_id,
         )
         return TenantResponse(**row) if row else None
 
     async def get_by_domain(self, domain: str) -> Optional[TenantResponse]:
         row = await self.conn.fetchrow(
-            """
-            SELECT tenant_id, name, domain, plan, region, status, created_at
-            FROM tenants
-            WHERE domain = lower($1)
-            """,
+            _GET_BY_DOMAIN,
             domain,
         )
         return TenantResponse(**row) if row else None
 
-    async def list_tenants(self) -> List[TenantResponse]:
+    @read_only
+    async def list_tenants(
+        self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[TenantResponse]:
+        after_ts, after_id = after or (None, None)
         rows = await self.conn.fetch(
-            """
-            SELECT tenant_id, name, domain, plan, region, status, created_at
-            FROM tenants
-            ORDER BY created_at DESC
-            """
+            _LIST_TENANTS, after_ts, after_id, limit
         )
         return [TenantResponse(**r) for r in rows]
@@ -3,8 +3,9 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 
+from app.core.pagination import PageParams, page_params, set_next_cursor
 from app.dependencies.database import get_db_connection
 from app.modules.tenants.schemas import (
     TenantCreate,
@@ -22,7 +23,7 @@ router = APIRouter(
 )
 
 
-def get_tenant_service(conn=Depends(get_db_connection)) -> TenantService:
+def get_tenant_service(conn=Depends(get_db_connection, scope="function")) -> TenantService:
     """
     Uses a system-level DB connection (no tenant RLS yet) for onboarding
     and tenant listing. Tests override get_db_connection to inject a
@@ -59,12 +60,16 @@ async def create_tenant(
     status_code=status.HTTP_200_OK,
 )
 async def list_tenants(
+    response: Response,
+    page: PageParams = Depends(page_params),
     service: TenantService = Depends(get_tenant_service),
 ):
     """
     System-level list of tenants.
     """
-    return await service.list_tenants()
+    tenants, next_cursor = await service.list_tenants(page)
+    set_next_cursor(response, next_cursor)
+    return tenants
 
 
 @router.get(
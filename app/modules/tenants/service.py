@@ -1,3 +1,5 @@
+from typing import List, Optional, Tuple
+
 from fastapi import HTTPException, status
 
 from app.modules.tenants.repository import TenantRepository
@@ -13,7 +15,11 @@ from app.modules.audit.repository import AuditRepository
 from app.modules.audit.schemas import AuditLogCreate
 from app.modules.groups.repository import GroupRepository
 from app.modules.groups.schemas import GroupCreate
-from app.core.security import get_password_hash
+from app.core.database import set_tenant_context
+from app.core.pagination import PageParams, created_keyset, fetch_page
+from app.core.password_hasher import password_hasher
+
+TENANT_KEYSET = created_keyset("tenant_id")
 
 
 class TenantService:
@@ -60,6 +66,10 @@ class TenantService:
                     detail="Domain already taken",
                 )
 
+        # Hash before opening the transaction so it is not held open
+        # while bcrypt runs.
+        hashed_pw = await password_hasher.hash(payload.admin_password)
+
         # 2. Transactional creation
         async with self.conn.transaction():
             # 2.1 Create Tenant
@@ -68,9 +78,7 @@ class TenantService:
             # 2.2 Create Admin User
             # UserRepository.create_user expects a dict and returns a dict:
             # { "user": { "user_id": ... }, "membership": { ... } }
-            # It also expects an already hashed password.
-            hashed_pw = get_password_hash(payload.admin_password)
-
+            # It also expects an already hashed password (hashed_pw above).
             admin_user_data = await self.user_repo.create_user(
                 {
                     "email": payload.admin_email,
@@ -91,10 +99,7 @@ class TenantService:
             # 2.3 Set RLS context for tenant-scoped resources
             # RoleRepository, GroupRepository, AuditRepository, etc.
             # all depend on current_setting('app.current_tenant_id').
-            await self.conn.execute(
-                "SELECT set_config('app.current_tenant_id', $1, true)",
-                str(tenant.tenant_id),
-            )
+            await set_tenant_context(self.conn, tenant.tenant_id)
 
             # 2.4 Create default RBAC roles for this tenant
             # Admin, Drafter, Reviewer, Commenter
@@ -253,8 +258,8 @@ class TenantService:
     # ------------------------------------------------------------------
     # Other helpers
     # ------------------------------------------------------------------
-    async def list_tenants(self) -> list[TenantResponse]:
-        return await self.tenant_repo.list_tenants()
+    async def list_tenants(self, page: PageParams = PageParams()) -> Tuple[List[TenantResponse], Optional[str]]:
+        return await fetch_page(self.tenant_repo.list_tenants, page, TENANT_KEYSET)
 
     async def get_tenant(self, tenant_id) -> TenantResponse:
         tenant = await self.tenant_repo.get_by_id(tenant_id)
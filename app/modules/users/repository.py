@@ -1,11 +1,256 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Union
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 from uuid import UUID
 
 import asyncpg
 
 from app.modules.users.schemas import UserContext
+from app.core.database import read_only
+from app.core.statements import define
+
+
+_INSERT_USER = define(
+    "users.insert_user",
+    """
+    INSERT INTO users (
+        primary_email,
+        display_name,
+        hashed_password
+    )
+    VALUES ($1, $2, $3)
+    RETURNING
+        user_id,
+        primary_email,
+        display_name,
+        created_at,
+        updated_at,
+        password_updated_at
+    """,
+)
+
+_INSERT_MEMBERSHIP = define(
+    "users.insert_membership",
+    """
+    INSERT INTO user_tenants (
+        tenant_id,
+        user_id,
+        tenant_email,
+        tenant_role,
+        status,
+        persona
+    )
+    VALUES ($1, $2, $3, $4, $5, $6)
+    RETURNING
+        user_tenant_id,
+        tenant_id,
+        user_id,
+        tenant_email,
+        tenant_role,
+        status,
+        persona,
+        created_at,
+        last_accessed_at
+    """,
+)
+
+_GET_USER_BY_EMAIL_FOR_LOGIN = define(
+    "users.get_user_by_email_for_login",
+    """
+    SELECT
+        u.user_id,
+        u.primary_email,
+        u.display_name,
+        u.hashed_password,
+        u.is_verified,
+        u.mfa_enabled,
+        u.locale,
+        u.timezone,
+        ut.user_tenant_id,
+        ut.tenant_id,
+        ut.tenant_email,
+        ut.tenant_role,
+        ut.status AS tenant_status,
+        ut.persona
+    FROM users u
+    JOIN user_tenants ut
+      ON ut.user_id = u.user_id
+    WHERE
+        u.primary_email = $1
+        AND ut.tenant_id = $2
+        AND ut.status = 'active'
+    """,
+)
+
+_GET_USER_BY_ID = define(
+    "users.get_user_by_id",
+    """
+    SELECT
+        user_id,
+        primary_email,
+        display_name,
+        is_verified,
+        locale,
+        timezone,
+        mfa_enabled,
+        created_at,
+        updated_at,
+        last_login_at
+    FROM users
+    WHERE user_id = $1
+    """,
+)
+
+_GET_USER_CONTEXT = define(
+    "users.get_user_context",
+    """
+    SELECT
+        u.user_id,
+        u.primary_email AS email,
+        COALESCE(u.display_name, u.primary_email) AS display_name,
+        t.tenant_id,
+        t.name AS tenant_name,
+        ut.user_tenant_id,
+        ARRAY[ut.tenant_role] AS roles,
+        uep.permission_keys AS permissions,
+        ut.persona
+    FROM user_tenants ut
+    JOIN users u
+        ON u.user_id = ut.user_id
+    JOIN tenants t
+        ON t.tenant_id = ut.tenant_id
+    -- maintained by triggers on roles / user_roles / group_* tables
+    LEFT JOIN user_effective_permissions uep
+        ON uep.user_tenant_id = ut.user_tenant_id
+    WHERE ut.user_id = $1
+      AND ut.tenant_id = $2
+    """,
+)
+
+_REFRESH_EFFECTIVE_PERMISSIONS = define(
+    "users.refresh_effective_permissions",
+    """
+    SELECT refresh_user_effective_permissions(ARRAY[$1]::uuid[])
+    """,
+)
+
+_EFFECTIVE_PERMISSIONS = define(
+    "users.effective_permissions",
+    """
+    SELECT permission_keys FROM user_effective_permissions WHERE user_tenant_id = $1
+    """,
+)
+
+# One page of a tenant's users, keyset-ordered by (created_at, user_id).
+# Roles (tenant_role + user_roles) and permissions (the effective-permission
+# store) are resolved for the whole page in the same statement; $5 = false
+# skips both when the caller did not ask for them.
+_LIST_USERS_FOR_TENANT = define(
+    "users.list_users_for_tenant",
+    """
+    SELECT
+        u.user_id,
+        u.primary_email as email,
+        u.display_name,
+        ut.tenant_id,
+        ut.tenant_email,
+        ut.persona,
+        ut.status AS tenant_status,
+        u.is_verified,
+        u.mfa_enabled,
+        u.created_at,
+        u.updated_at,
+        r.roles,
+        COALESCE(uep.permission_keys, '{}'::text[]) AS permissions
+    FROM user_tenants ut
+    JOIN users u
+      ON u.user_id = ut.user_id
+    LEFT JOIN LATERAL (
+        SELECT ARRAY(
+            SELECT ut.tenant_role
+            UNION
+            SELECT ro.name
+            FROM user_roles ur
+            JOIN roles ro ON ro.role_id = ur.role_id
+            WHERE ur.user_tenant_id = ut.user_tenant_id
+            ORDER BY 1
+        ) AS roles
+        WHERE $5::boolean
+    ) r ON true
+    LEFT JOIN user_effective_permissions uep
+      ON $5::boolean AND uep.user_tenant_id = ut.user_tenant_id
+    WHERE ut.tenant_id = $1
+      AND ($2::timestamptz IS NULL OR (u.created_at, u.user_id) > ($2::timestamptz, $3::uuid))
+    ORDER BY u.created_at ASC, u.user_id ASC
+    LIMIT $4
+    """,
+)
+
+_UPDATE_USER_PROFILE = define(
+    "users.update_user_profile",
+    """
+    UPDATE users
+       SET display_name = COALESCE($2, display_name),
+           locale = COALESCE($3, locale),
+           timezone = COALESCE($4, timezone),
+           updated_at = now()
+     WHERE user_id = $1
+    RETURNING
+        user_id,
+        primary_email as email,
+        display_name,
+        is_verified,
+        locale,
+        timezone,
+        mfa_enabled,
+        created_at,
+        updated_at,
+        last_login_at
+    """,
+)
+
+_DEACTIVATE_USER_IN_TENANT = define(
+    "users.deactivate_user_in_tenant",
+    """
+    UPDATE user_tenants
+    SET status = 'deactivated', updated_at = now()
+    WHERE user_id = $1 AND tenant_id = $2
+    """,
+)
+
+_UPDATE_USER_PERSONA = define(
+    "users.update_user_persona",
+    """
+    UPDATE user_tenants
+    SET persona = $3, updated_at = now()
+    WHERE user_id = $1 AND tenant_id = $2
+    """,
+)
+
+_UPDATE_PASSWORD = define(
+    "users.update_password",
+    """
+    UPDATE users
+    SET hashed_password = $2,
+        password_updated_at = now(),
+        updated_at = now()
+    WHERE user_id = $1
+    """,
+)
+
+_GET_PASSWORD_HASH = define(
+    "users.get_password_hash",
+    """
+    SELECT hashed_password FROM users WHERE user_id = $1
+    """,
+)
+
+def _listed_user(record: Any) -> Dict[str, Any]:
+    d = dict(record)
+    d["roles"] = list(d["roles"] or [])
+    d["permissions"] = list(d["permissions"] or [])
+    return d
 
 
 class UserRepository:
@@ -62,21 +307,7 @@ class UserRepository:
 
         # 1) Insert into USERS
         user_row = await self.conn.fetchrow(
-            """
-            INSERT INTO users (
-                primary_email,
-                display_name,
-                hashed_password
-            )
-            VALUES ($1, $2, $3)
-            RETURNING
-                user_id,
-                primary_email,
-                display_name,
-                created_at,
-                updated_at,
-                password_updated_at
-            """,
+            _INSERT_USER,
             email,
             display_name,
             hashed_password,
@@ -86,27 +317,7 @@ class UserRepository:
 
         # 2) Insert into USER_TENANTS
         ut_row = await self.conn.fetchrow(
-            """
-            INSERT INTO user_tenants (
-                tenant_id,
-                user_id,
-                tenant_email,
-                tenant_role,
-                status,
-                persona
-            )
-            VALUES ($1, $2, $3, $4, $5, $6)
-            RETURNING
-                user_tenant_id,
-                tenant_id,
-                user_id,
-                tenant_email,
-                tenant_role,
-                status,
-                persona,
-                created_at,
-                last_accessed_at
-            """,
+            _INSERT_MEMBERSHIP,
             tenant_id,
             user_id,
             tenant_email,
@@ -130,30 +341,7 @@ class UserRepository:
         tenant_id: UUID,
     ) -> Optional[Dict[str, Any]]:
         row = await self.conn.fetchrow(
-            """
-            SELECT
-                u.user_id,
-                u.primary_email,
-                u.display_name,
-                u.hashed_password,
-                u.is_verified,
-                u.mfa_enabled,
-                u.locale,
-                u.timezone,
-                ut.user_tenant_id,
-                ut.tenant_id,
-                ut.tenant_email,
-                ut.tenant_role,
-                ut.status AS tenant_status,
-                ut.persona
-            FROM users u
-            JOIN user_tenants ut
-              ON ut.user_id = u.user_id
-            WHERE
-                u.primary_email = $1
-                AND ut.tenant_id = $2
-                AND ut.status = 'active'
-            """,
+            _GET_USER_BY_EMAIL_FOR_LOGIN,
             email,
             tenant_id,
         )
@@ -164,21 +352,7 @@ class UserRepository:
         Fetches global user data. Use get_user_context for tenant-aware data.
         """
         row = await self.conn.fetchrow(
-            """
-            SELECT
-                user_id,
-                primary_email,
-                display_name,
-                is_verified,
-                locale,
-                timezone,
-                mfa_enabled,
-                created_at,
-                updated_at,
-                last_login_at
-            FROM users
-            WHERE user_id = $1
-            """,
+            _GET_USER_BY_ID,
             user_id,
         )
         return dict(row) if row else None
@@ -197,50 +371,12 @@ class UserRepository:
         - user basic info
         - tenant info
         - roles in that tenant
-        - permissions as *keys* (strings), not UUIDs
+        - permissions as *keys* (strings), not UUIDs, read from
+          user_effective_permissions (direct role, user_roles, group_roles)
         - persona (Partner, Paralegal, etc.) for this tenant
         """
         row = await self.conn.fetchrow(
-            """
-            SELECT
-                u.user_id,
-                u.primary_email AS email,
-                COALESCE(u.display_name, u.primary_email) AS display_name,
-                t.tenant_id,
-                t.name AS tenant_name,
-                COALESCE(
-                    ARRAY_AGG(DISTINCT ut.tenant_role)
-                    FILTER (WHERE ut.tenant_role IS NOT NULL),
-                    '{}'
-                ) AS roles,
-                COALESCE(
-                    ARRAY_AGG(DISTINCT p.key)
-                    FILTER (WHERE p.key IS NOT NULL),
-                    '{}'
-                ) AS permissions,
-                MAX(ut.persona) AS persona
-            FROM users u
-            JOIN user_tenants ut
-                ON ut.user_id = u.user_id
-            JOIN tenants t
-                ON t.tenant_id = ut.tenant_id
-            -- role + permission join chain
-            LEFT JOIN roles r
-                ON r.tenant_id = t.tenant_id
-               AND r.name = ut.tenant_role
-            LEFT JOIN role_permissions rp
-                ON rp.tenant_id = t.tenant_id
-            LEFT JOIN permissions p
-                ON p.permission_id = rp.permission_id
-            WHERE u.user_id = $1
-              AND t.tenant_id = $2
-            GROUP BY
-                u.user_id,
-                u.primary_email,
-                u.display_name,
-                t.tenant_id,
-                t.name
-            """,
+            _GET_USER_CONTEXT,
             user_id,
             tenant_id,
         )
@@ -249,7 +385,17 @@ class UserRepository:
             return None
 
         roles = row["roles"] or []
-        permissions = row["permissions"] or []
+        permissions = row["permissions"]
+        if permissions is None:
+            # Row predates the effective-permission store; build it now.
+            await self.conn.execute(
+                _REFRESH_EFFECTIVE_PERMISSIONS,
+                row["user_tenant_id"],
+            )
+            permissions = await self.conn.fetchval(
+                _EFFECTIVE_PERMISSIONS,
+                row["user_tenant_id"],
+            ) or []
         persona = row["persona"]
 
         # Pydantic expects list[str] for roles & permissions
@@ -268,52 +414,45 @@ class UserRepository:
     # MANAGEMENT
     # -------------------------------------------------------------------------
 
-    async def list_users_for_tenant(self, tenant_id: UUID) -> List[Dict[str, Any]]:
+    @read_only
+    async def list_users_for_tenant(
+        self,
+        tenant_id: UUID,
+        limit: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_access: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Up to `limit` users of the tenant after the (created_at, user_id)
+        keyset `after`. With include_access=False roles/permissions are
+        not resolved and come back empty.
+        """
+        after_ts, after_id = after if after is not None else (None, None)
         rows = await self.conn.fetch(
-            """
-            SELECT
-                u.user_id,
-                u.primary_email as email,
-                u.display_name,
-                ut.tenant_id,
-                ut.tenant_email,
-                ut.tenant_role,
-                ut.persona,
-                ut.status AS tenant_status,
-                u.is_verified,
-                u.mfa_enabled,
-                u.created_at,
-                u.updated_at
-            FROM users u
-            JOIN user_tenants ut
-              ON ut.user_id = u.user_id
-            WHERE ut.tenant_id = $1
-            ORDER BY u.created_at ASC
-            """,
+            _LIST_USERS_FOR_TENANT,
             tenant_id,
+            after_ts,
+            after_id,
+            limit,
+            include_access,
         )
-        # Adapt keys for UserResponse
-        results = []
-        for r in rows:
-            d = dict(r)
-            # roles comes from tenant_role
-            d["roles"] = [d.pop("tenant_role")] if d.get("tenant_role") else []
-
-            # Fetch tenant-wide permissions
-            perm_rows = await self.conn.fetch(
-                """
-                SELECT DISTINCT p.key
-                FROM role_permissions rp
-                JOIN permissions p ON rp.permission_id = p.permission_id
-                WHERE rp.tenant_id = $1
-                """,
-                tenant_id,
-            )
-            permission_keys = [row["key"] for row in perm_rows]
-            d["permissions"] = permission_keys
+        return [_listed_user(r) for r in rows]
 
-            results.append(d)
-        return results
+    async def iter_users_for_tenant(
+        self,
+        tenant_id: UUID,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        include_access: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Every user of the tenant after `after`, read through a server-side
+        cursor (same statement as the paged list, LIMIT NULL).
+        """
+        after_ts, after_id = after if after is not None else (None, None)
+        async for r in self.conn.cursor(
+            _LIST_USERS_FOR_TENANT, tenant_id, after_ts, after_id, None, include_access
+        ):
+            yield _listed_user(r)
 
     async def update_user_profile(
         self,
@@ -322,49 +461,18 @@ class UserRepository:
         locale: Optional[str] = None,
         timezone: Optional[str] = None,
     ) -> Optional[Dict[str, Any]]:
-        fields: List[str] = []
-        values: List[Any] = []
-        if display_name is not None:
-            fields.append("display_name = $" + str(len(values) + 1))
-            values.append(display_name)
-        if locale is not None:
-            fields.append("locale = $" + str(len(values) + 1))
-            values.append(locale)
-        if timezone is not None:
-            fields.append("timezone = $" + str(len(values) + 1))
-            values.append(timezone)
-
-        if not fields:
+        if display_name is None and locale is None and timezone is None:
             return await self.get_user_by_id(user_id)
 
-        values.append(user_id)
-        sql = f"""
-            UPDATE users
-               SET {", ".join(fields)},
-                   updated_at = now()
-             WHERE user_id = ${len(values)}
-         RETURNING
-                user_id,
-                primary_email as email,
-                display_name,
-                is_verified,
-                locale,
-                timezone,
-                mfa_enabled,
-                created_at,
-                updated_at,
-                last_login_at
-        """
-        row = await self.conn.fetchrow(sql, *values)
+        # Fixed-shape UPDATE: a NULL argument leaves that column unchanged
+        row = await self.conn.fetchrow(
+            _UPDATE_USER_PROFILE, user_id, display_name, locale, timezone
+        )
         return dict(row) if row else None
 
     async def deactivate_user_in_tenant(self, user_id: UUID, tenant_id: UUID):
         await self.conn.execute(
-            """
-            UPDATE user_tenants
-            SET status = 'deactivated', updated_at = now()
-            WHERE user_id = $1 AND tenant_id = $2
-            """,
+            _DEACTIVATE_USER_IN_TENANT,
             user_id,
             tenant_id,
         )
@@ -380,11 +488,7 @@ class UserRepository:
         Update persona on user_tenants for a specific tenant.
         """
         await self.conn.execute(
-            """
-            UPDATE user_tenants
-            SET persona = $3, updated_at = now()
-            WHERE user_id = $1 AND tenant_id = $2
-            """,
+            _UPDATE_USER_PERSONA,
             user_id,
             tenant_id,
             persona,
@@ -407,13 +511,7 @@ class UserRepository:
                 hashed_password: Already hashed password (use get_password_hash())
             """
             result = await self.conn.execute(
-                """
-                UPDATE users
-                SET hashed_password = $2,
-                    password_updated_at = now(),
-                    updated_at = now()
-                WHERE user_id = $1
-                """,
+                _UPDATE_PASSWORD,
                 user_id,
                 hashed_password,
             )
@@ -424,7 +522,7 @@ class UserRepository:
             Get user's current password hash (for verification).
             """
             row = await self.conn.fetchrow(
-                "SELECT hashed_password FROM users WHERE user_id = $1",
+                _GET_PASSWORD_HASH,
                 user_id,
             )
             return row["hashed_password"] if row else None
@@ -437,10 +535,10 @@ class UserRepository:
             """
             Verify user's current password.
             """
-            from app.core.security import verify_password
+            from app.core.password_hasher import password_hasher
 
             hashed = await self.get_password_hash(user_id)
             if not hashed:
                 return False
 
-            return verify_password(plain_password, hashed)
+            return await password_hasher.verify(plain_password, hashed)
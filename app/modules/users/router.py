@@ -1,12 +1,17 @@
 # app/modules/users/router.py
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import JSONResponse
 
-from app.dependencies.database import get_tenant_db_connection
-from app.dependencies.auth_utils import get_current_token_payload
+from app.core.pagination import PageParams, page_params, parse_fields, set_next_cursor
+from app.core.streaming import ndjson_response, wants_ndjson
+
+from app.core.database import LazyTenantConnection
+from app.dependencies.database import get_tenant_db_connection, get_tenant_stream_connection
+from app.dependencies.auth_context import AuthContext, get_auth_context
 from app.dependencies.permissions import require_permissions
 from app.modules.users.schemas import (
     UserCreate,
@@ -22,8 +27,11 @@ router = APIRouter(
 )
 
 
-def get_user_service(conn=Depends(get_tenant_db_connection)) -> UserService:
-    return UserService(conn)
+def get_user_service(
+    conn=Depends(get_tenant_db_connection, scope="function"),
+    auth: AuthContext = Depends(get_auth_context),
+) -> UserService:
+    return UserService(conn, tenant_id=auth.tenant_id)
 
 
 # ---------------------------------------------------------
@@ -34,8 +42,33 @@ def get_user_service(conn=Depends(get_tenant_db_connection)) -> UserService:
     response_model=List[UserResponse],
     dependencies=[Depends(require_permissions(["user.read"]))],
 )
-async def list_users(service: UserService = Depends(get_user_service)):
-    return await service.list_users()
+async def list_users(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    service: UserService = Depends(get_user_service),
+    auth: AuthContext = Depends(get_auth_context),
+    stream_conn: LazyTenantConnection = Depends(get_tenant_stream_connection),
+):
+    """
+    Keyset-paged list (next page cursor in X-Next-Cursor). With
+    `Accept: application/x-ndjson` every user from `cursor` on is
+    streamed instead, one JSON object per line.
+    """
+    projection = parse_fields(fields, UserResponse)
+    if wants_ndjson(request):
+        rows = UserService(stream_conn, tenant_id=auth.tenant_id).stream_users(page.cursor, projection)
+        return ndjson_response(rows, conn=stream_conn)
+
+    users, next_cursor = await service.list_users(page, fields=projection)
+
+    if projection is not None:
+        response = JSONResponse([u.model_dump(mode="json", include=projection) for u in users])
+        set_next_cursor(response, next_cursor)
+        return response
+    set_next_cursor(response, next_cursor)
+    return users
 
 
 # ---------------------------------------------------------
@@ -46,12 +79,10 @@ async def list_users(service: UserService = Depends(get_user_service)):
     response_model=CurrentUserResponse,
 )
 async def get_me(
-    payload=Depends(get_current_token_payload),
+    auth: AuthContext = Depends(get_auth_context),
     service: UserService = Depends(get_user_service),
 ):
-    user_id = UUID(payload["sub"])
-    tenant_id = UUID(payload["tid"])
-    return await service.get_current_user_profile(user_id, tenant_id)
+    return await service.get_current_user_profile(auth.user_id, auth.tenant_id)
 
 
 # ---------------------------------------------------------
@@ -96,10 +127,24 @@ async def update_user(
 )
 async def deactivate_user(
     user_id: UUID,
-    payload=Depends(get_current_token_payload),
+    auth: AuthContext = Depends(get_auth_context),
+    service: UserService = Depends(get_user_service),
+):
+    await service.deactivate_user(user_id, auth.tenant_id)
+    return None
+
+
+# ---------------------------------------------------------
+# RESET LOGIN LOCKOUT
+# ---------------------------------------------------------
+@router.delete(
+    "/{user_id}/lockout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(require_permissions(["user.update"]))],
+)
+async def reset_login_lockout(
+    user_id: UUID,
     service: UserService = Depends(get_user_service),
 ):
-    from uuid import UUID as _UUID
-    tenant_id = _UUID(payload["tid"])
-    await service.deactivate_user(user_id, tenant_id)
+    await service.reset_login_lockout(user_id)
     return None
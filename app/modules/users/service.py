@@ -1,5 +1,5 @@
 from uuid import UUID
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
 from fastapi import HTTPException, status
 
@@ -12,46 +12,85 @@ from app.modules.users.schemas import (
 from app.modules.users.repository import UserRepository
 from app.modules.audit.repository import AuditRepository
 from app.modules.audit.schemas import AuditLogCreate
-from app.core.security import get_password_hash
+from app.core.pagination import PageParams, created_keyset, fetch_page
+from app.core.password_hasher import password_hasher
+from app.modules.auth.lockout import login_lockout
+
+USER_KEYSET = created_keyset("user_id")
+_ACCESS_FIELDS = {"roles", "permissions"}
 
 
 class UserService:
-    def __init__(self, conn):
+    def __init__(self, conn, tenant_id: Optional[UUID] = None):
         self.conn = conn
+        # Tenant from the request's AuthContext; when not supplied we fall
+        # back to reading the RLS setting from the connection.
+        self.tenant_id = tenant_id
         self.user_repo = UserRepository(conn)
         self.audit_repo = AuditRepository(conn)
 
+    async def _current_tenant_id(self) -> Optional[UUID]:
+        if self.tenant_id is not None:
+            return self.tenant_id
+        return await self.conn.fetchval(
+            "SELECT current_setting('app.current_tenant_id', true)::uuid"
+        )
+
     # ---------------------------------------------------------
     # CRUD
     # ---------------------------------------------------------
-    async def list_users(self) -> List[UserResponse]:
-        # Fetch current tenant from RLS context variable set by middleware/dependency
-        tenant_id = await self.conn.fetchval(
-            "SELECT current_setting('app.current_tenant_id', true)::uuid"
-        )
+    async def list_users(
+        self,
+        page: PageParams = PageParams(),
+        fields: Optional[Set[str]] = None,
+    ) -> Tuple[List[UserResponse], Optional[str]]:
+        """
+        One keyset page of the tenant's users plus the cursor for the next
+        page (None on the last one). Roles/permissions are only resolved
+        when `fields` asks for them (or no projection is given).
+        """
+        tenant_id = await self._current_tenant_id()
         if not tenant_id:
             # Fallback or error if no context
-            return []
+            return [], None
+
+        include_access = fields is None or bool(fields & _ACCESS_FIELDS)
 
-        rows = await self.user_repo.list_users_for_tenant(tenant_id)
+        async def fetch(limit, after):
+            return await self.user_repo.list_users_for_tenant(
+                tenant_id, limit, after=after, include_access=include_access
+            )
 
-        results = []
-        for r in rows:
-            d = dict(r)
-            # Ensure 'roles' is a list. The repo might return 'tenant_role' string.
-            if "roles" not in d:
-                role = d.pop("tenant_role", None)
-                d["roles"] = [role] if role else []
+        rows, next_cursor = await fetch_page(fetch, page, USER_KEYSET)
+        return [UserResponse(**r) for r in rows], next_cursor
 
-            results.append(UserResponse(**d))
+    def stream_users(
+        self,
+        cursor: Optional[str] = None,
+        fields: Optional[Set[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Every user of the tenant (from `cursor` on) as UserResponse-shaped
+        dicts, for NDJSON streaming. The cursor is validated here, before
+        the response starts.
+        """
+        after = USER_KEYSET.decode(cursor)
+        keys = tuple(fields or UserResponse.model_fields)
+        include_access = bool(set(keys) & _ACCESS_FIELDS)
+        return self._iter_users(after, keys, include_access)
 
-        return results
+    async def _iter_users(self, after, keys, include_access) -> AsyncIterator[Dict[str, Any]]:
+        tenant_id = await self._current_tenant_id()
+        if not tenant_id:
+            return
+        async for row in self.user_repo.iter_users_for_tenant(
+            tenant_id, after=after, include_access=include_access
+        ):
+            yield {k: row.get(k) for k in keys}
 
     async def get_user(self, user_id: UUID) -> UserResponse:
         # Use get_user_context to ensure we get tenant-scoped info (roles, etc.)
-        tenant_id = await self.conn.fetchval(
-            "SELECT current_setting('app.current_tenant_id', true)::uuid"
-        )
+        tenant_id = await self._current_tenant_id()
         if not tenant_id:
             raise HTTPException(status.HTTP_400_BAD_REQUEST, "Tenant context missing")
 
@@ -72,19 +111,17 @@ class UserService:
 
     async def create_user(self, payload: UserCreate) -> UserResponse:
         # 1. Get current tenant
-        tenant_id_str = await self.conn.fetchval(
-            "SELECT current_setting('app.current_tenant_id', true)"
-        )
-        if not tenant_id_str:
+        tenant_id = await self._current_tenant_id()
+        if not tenant_id:
             raise HTTPException(status.HTTP_400_BAD_REQUEST, "Tenant context missing")
 
         # 2. Prepare payload for repo (expects dict with hashed password)
-        hashed = get_password_hash(payload.password)
+        hashed = await password_hasher.hash(payload.password)
         repo_payload = {
             "email": payload.email,
             "display_name": payload.display_name,
             "hashed_password": hashed,
-            "tenant_id": tenant_id_str,
+            "tenant_id": str(tenant_id),
             "tenant_role": "member",  # Default role
             "status": "active",
             # NEW: persona from API payload
@@ -168,6 +205,18 @@ class UserService:
             )
         )
 
+    async def reset_login_lockout(self, user_id: UUID) -> None:
+        user = await self.get_user(user_id)
+        await login_lockout.reset_account(user.tenant_id, user.email)
+        await self.audit_repo.log_event(
+            AuditLogCreate(
+                action_type="user.lockout_reset",
+                resource_type="user",
+                resource_id=str(user_id),
+                details={"tenant_id": str(user.tenant_id)},
+            )
+        )
+
     # ---------------------------------------------------------
     # CURRENT USER CONTEXT
     # ---------------------------------------------------------
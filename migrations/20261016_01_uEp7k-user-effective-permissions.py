@@ -0,0 +1,236 @@
+"""
+user_effective_permissions: incrementally maintained permission keys per
+user_tenant, folding in the direct tenant_role, user_roles and roles
+inherited through group_roles.
+"""
+
+from yoyo import step
+
+__depends__ = {"20251121_01_ibRNV-initial-schema"}
+
+steps = [
+    step(
+        """
+        CREATE TABLE IF NOT EXISTS user_effective_permissions (
+            user_tenant_id   uuid PRIMARY KEY REFERENCES user_tenants(user_tenant_id) ON DELETE CASCADE,
+            tenant_id        uuid NOT NULL REFERENCES tenants(tenant_id) ON DELETE CASCADE,
+            permission_keys  text[] NOT NULL DEFAULT '{}',
+            updated_at       timestamptz NOT NULL DEFAULT now()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_uep_tenant
+            ON user_effective_permissions(tenant_id);
+
+        ALTER TABLE user_effective_permissions ENABLE ROW LEVEL SECURITY;
+        ALTER TABLE user_effective_permissions FORCE ROW LEVEL SECURITY;
+
+        CREATE POLICY uep_isolation ON user_effective_permissions
+            USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+            WITH CHECK (tenant_id = current_setting('app.current_tenant_id', true)::uuid);
+
+        CREATE INDEX IF NOT EXISTS idx_group_members_user_tenant
+            ON group_members(user_tenant_id);
+        CREATE INDEX IF NOT EXISTS idx_group_roles_role
+            ON group_roles(role_id);
+        CREATE INDEX IF NOT EXISTS idx_role_permissions_role
+            ON role_permissions(role_id);
+        CREATE INDEX IF NOT EXISTS idx_user_tenants_tenant_role
+            ON user_tenants(tenant_id, tenant_role);
+        """,
+        """
+        DROP TABLE IF EXISTS user_effective_permissions;
+        DROP INDEX IF EXISTS idx_group_members_user_tenant;
+        DROP INDEX IF EXISTS idx_group_roles_role;
+        DROP INDEX IF EXISTS idx_role_permissions_role;
+        DROP INDEX IF EXISTS idx_user_tenants_tenant_role;
+        """,
+    ),
+    step(
+        """
+        -- Recompute the stored keys for the given user_tenants (set-based).
+        CREATE OR REPLACE FUNCTION refresh_user_effective_permissions(p_user_tenant_ids uuid[])
+        RETURNS void
+        LANGUAGE sql
+        AS $$
+            INSERT INTO user_effective_permissions (user_tenant_id, tenant_id, permission_keys, updated_at)
+            SELECT
+                ut.user_tenant_id,
+                ut.tenant_id,
+                ARRAY(
+                    SELECT DISTINCT p.key
+                    FROM (
+                        SELECT r.role_id
+                        FROM roles r
+                        WHERE r.tenant_id = ut.tenant_id
+                          AND r.name = ut.tenant_role
+                        UNION
+                        SELECT ur.role_id
+                        FROM user_roles ur
+                        WHERE ur.user_tenant_id = ut.user_tenant_id
+                        UNION
+                        SELECT gr.role_id
+                        FROM group_members gm
+                        JOIN group_roles gr ON gr.group_id = gm.group_id
+                        WHERE gm.user_tenant_id = ut.user_tenant_id
+                    ) er
+                    JOIN role_permissions rp ON rp.role_id = er.role_id
+                    JOIN permissions p ON p.permission_id = rp.permission_id
+                    ORDER BY p.key
+                ),
+                now()
+            FROM user_tenants ut
+            WHERE ut.user_tenant_id = ANY(p_user_tenant_ids)
+            ON CONFLICT (user_tenant_id) DO UPDATE
+                SET permission_keys = EXCLUDED.permission_keys,
+                    updated_at = now();
+        $$;
+
+        -- Every user_tenant currently holding a role, by any path.
+        CREATE OR REPLACE FUNCTION role_holder_user_tenants(p_role_ids uuid[])
+        RETURNS uuid[]
+        LANGUAGE sql STABLE
+        AS $$
+            SELECT ARRAY(
+                SELECT ur.user_tenant_id
+                FROM user_roles ur
+                WHERE ur.role_id = ANY(p_role_ids)
+                UNION
+                SELECT gm.user_tenant_id
+                FROM group_roles gr
+                JOIN group_members gm ON gm.group_id = gr.group_id
+                WHERE gr.role_id = ANY(p_role_ids)
+                UNION
+                SELECT ut.user_tenant_id
+                FROM roles r
+                JOIN user_tenants ut
+                  ON ut.tenant_id = r.tenant_id
+                 AND ut.tenant_role = r.name
+                WHERE r.role_id = ANY(p_role_ids)
+            );
+        $$;
+
+        CREATE OR REPLACE FUNCTION uep_on_user_link_change()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM refresh_user_effective_permissions(
+                ARRAY(SELECT DISTINCT user_tenant_id FROM changed)
+            );
+            RETURN NULL;
+        END;
+        $$;
+
+        CREATE OR REPLACE FUNCTION uep_on_group_roles_change()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM refresh_user_effective_permissions(
+                ARRAY(
+                    SELECT DISTINCT gm.user_tenant_id
+                    FROM changed c
+                    JOIN group_members gm ON gm.group_id = c.group_id
+                )
+            );
+            RETURN NULL;
+        END;
+        $$;
+
+        CREATE OR REPLACE FUNCTION uep_on_role_permissions_change()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM refresh_user_effective_permissions(
+                role_holder_user_tenants(ARRAY(SELECT DISTINCT role_id FROM changed))
+            );
+            RETURN NULL;
+        END;
+        $$;
+
+        CREATE OR REPLACE FUNCTION uep_on_user_tenant_change()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM refresh_user_effective_permissions(ARRAY[NEW.user_tenant_id]);
+            RETURN NULL;
+        END;
+        $$;
+
+        -- Renamed / deleted roles change who matches through tenant_role.
+        CREATE OR REPLACE FUNCTION uep_on_role_change()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM refresh_user_effective_permissions(
+                ARRAY(
+                    SELECT ut.user_tenant_id
+                    FROM user_tenants ut
+                    WHERE ut.tenant_id = OLD.tenant_id
+                      AND ut.tenant_role IN (OLD.name, COALESCE(NEW.name, OLD.name))
+                )
+            );
+            RETURN NULL;
+        END;
+        $$;
+
+        CREATE TRIGGER uep_user_roles_ins AFTER INSERT ON user_roles
+            REFERENCING NEW TABLE AS changed
+            FOR EACH STATEMENT EXECUTE FUNCTION uep_on_user_link_change();
+        CREATE TRIGGER uep_user_roles_del AFTER DELETE ON user_roles
+            REFERENCING OLD TABLE AS changed
+            FOR EACH STATEMENT EXECUTE FUNCTION uep_on_user_link_change();
+
+        CREATE TRIGGER uep_group_members_ins AFTER INSERT ON group_members
+            REFERENCING NEW TABLE AS changed
+            FOR EACH STATEMENT EXECUTE FUNCTION uep_on_user_link_change();
+        CREATE TRIGGER uep_group_members_del AFTER DELETE ON group_members
+            REFERENCING OLD TABLE AS changed
+            FOR EACH STATEMENT EXECUTE FUNCTION uep_on_user_link_change();
+
+        CREATE TRIGGER uep_group_roles_ins AFTER INSERT ON group_roles
+            REFERENCING NEW TABLE AS changed
+            FOR EACH STATEMENT EXECUTE FUNCTION uep_on_group_roles_change();
+        CREATE TRIGGER uep_group_roles_del AFTER DELETE ON group_roles
+            REFERENCING OLD TABLE AS changed
+            FOR EACH STATEMENT EXECUTE FUNCTION uep_on_group_roles_change();
+
+        CREATE TRIGGER uep_role_permissions_ins AFTER INSERT ON role_permissions
+            REFERENCING NEW TABLE AS changed
+            FOR EACH STATEMENT EXECUTE FUNCTION uep_on_role_permissions_change();
+        CREATE TRIGGER uep_role_permissions_del AFTER DELETE ON role_permissions
+            REFERENCING OLD TABLE AS changed
+            FOR EACH STATEMENT EXECUTE FUNCTION uep_on_role_permissions_change();
+
+        CREATE TRIGGER uep_user_tenants_upsert
+            AFTER INSERT OR UPDATE OF tenant_role ON user_tenants
+            FOR EACH ROW EXECUTE FUNCTION uep_on_user_tenant_change();
+
+        CREATE TRIGGER uep_roles_change
+            AFTER UPDATE OF name OR DELETE ON roles
+            FOR EACH ROW EXECUTE FUNCTION uep_on_role_change();
+        """,
+        """
+        DROP TRIGGER IF EXISTS uep_user_roles_ins ON user_roles;
+        DROP TRIGGER IF EXISTS uep_user_roles_del ON user_roles;
+        DROP TRIGGER IF EXISTS uep_group_members_ins ON group_members;
+        DROP TRIGGER IF EXISTS uep_group_members_del ON group_members;
+        DROP TRIGGER IF EXISTS uep_group_roles_ins ON group_roles;
+        DROP TRIGGER IF EXISTS uep_group_roles_del ON group_roles;
+        DROP TRIGGER IF EXISTS uep_role_permissions_ins ON role_permissions;
+        DROP TRIGGER IF EXISTS uep_role_permissions_del ON role_permissions;
+        DROP TRIGGER IF EXISTS uep_user_tenants_upsert ON user_tenants;
+        DROP TRIGGER IF EXISTS uep_roles_change ON roles;
+        DROP FUNCTION IF EXISTS uep_on_user_link_change();
+        DROP FUNCTION IF EXISTS uep_on_group_roles_change();
+        DROP FUNCTION IF EXISTS uep_on_role_permissions_change();
+        DROP FUNCTION IF EXISTS uep_on_user_tenant_change();
+        DROP FUNCTION IF EXISTS uep_on_role_change();
+        DROP FUNCTION IF EXISTS role_holder_user_tenants(uuid[]);
+        DROP FUNCTION IF EXISTS refresh_user_effective_permissions(uuid[]);
+        """,
+    ),
+    step(
+        # Backfill. Under FORCE ROW LEVEL SECURITY this only sees rows when
+        # run by a role that bypasses RLS; otherwise UserRepository fills
+        # missing rows on first read.
+        """
+        SELECT refresh_user_effective_permissions(
+            ARRAY(SELECT user_tenant_id FROM user_tenants)
+        );
+        """,
+    ),
+]
@@ -0,0 +1,19 @@
+"""
+users(created_at, user_id): keyset order for the paginated user listing.
+"""
+
+from yoyo import step
+
+__depends__ = {"20261016_01_uEp7k-user-effective-permissions"}
+
+steps = [
+    step(
+        """
+        CREATE INDEX IF NOT EXISTS idx_users_created_at_user_id
+            ON users(created_at, user_id);
+        """,
+        """
+        DROP INDEX IF EXISTS idx_users_created_at_user_id;
+        """,
+    )
+]
@@ -0,0 +1,38 @@
+"""
+Keyset indexes for the paginated list endpoints: each list is ordered by
+(created_at DESC, <id> DESC) within the tenant RLS scope.
+"""
+
+from yoyo import step
+
+__depends__ = {"20261016_02_kPg3u-user-list-keyset-index"}
+
+steps = [
+    step(
+        """
+        CREATE INDEX IF NOT EXISTS idx_tenants_created_keyset
+            ON tenants(created_at DESC, tenant_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_audit_logs_tenant_created_keyset
+            ON audit_logs(tenant_id, created_at DESC, audit_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_api_keys_tenant_created_keyset
+            ON api_keys(tenant_id, created_at DESC, api_key_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_invitations_tenant_created_keyset
+            ON invitations(tenant_id, created_at DESC, invitation_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_groups_tenant_created_keyset
+            ON groups(tenant_id, created_at DESC, group_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_roles_tenant_created_keyset
+            ON roles(tenant_id, created_at DESC, role_id DESC);
+        CREATE INDEX IF NOT EXISTS idx_sso_providers_tenant_created_keyset
+            ON sso_providers(tenant_id, created_at DESC, sso_id DESC);
+        """,
+        """
+        DROP INDEX IF EXISTS idx_sso_providers_tenant_created_keyset;
+        DROP INDEX IF EXISTS idx_roles_tenant_created_keyset;
+        DROP INDEX IF EXISTS idx_groups_tenant_created_keyset;
+        DROP INDEX IF EXISTS idx_invitations_tenant_created_keyset;
+        DROP INDEX IF EXISTS idx_api_keys_tenant_created_keyset;
+        DROP INDEX IF EXISTS idx_audit_logs_tenant_created_keyset;
+        DROP INDEX IF EXISTS idx_tenants_created_keyset;
+        """,
+    )
+]
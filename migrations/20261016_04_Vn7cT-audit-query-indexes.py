@@ -0,0 +1,26 @@
+"""
+Composite indexes for the filtered audit query (GET /audit/logs).
+
+(tenant_id, created_at DESC, audit_id DESC) already exists
+(idx_audit_logs_tenant_created_keyset) and serves tenant + time-range
+searches. This adds the per-actor equivalent and drops idx_audit_tenant,
+a prefix of both.
+"""
+
+from yoyo import step
+
+__depends__ = {"20261016_03_Rq8dW-list-keyset-indexes"}
+
+steps = [
+    step(
+        """
+        CREATE INDEX IF NOT EXISTS idx_audit_logs_tenant_actor_created
+            ON audit_logs(tenant_id, actor_user_id, created_at DESC, audit_id DESC);
+        DROP INDEX IF EXISTS idx_audit_tenant;
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_audit_tenant ON audit_logs(tenant_id);
+        DROP INDEX IF EXISTS idx_audit_logs_tenant_actor_created;
+        """,
+    )
+]
@@ -0,0 +1,94 @@
+"""
+audit_rollups_hourly: event counts per (tenant, UTC hour, action_type)
+for activity dashboards.
+
+Kept current in the database: a statement-level AFTER INSERT trigger on
+audit_logs folds each statement's new rows (transition table) into the
+counts, so every writer is covered, whatever code version it runs. (Rows
+the partition manager moves between partitions are inserted into the
+partition directly and do not count twice.)
+
+The trigger is created and the existing rows backfilled in one step while
+audit_logs is locked against inserts, so no event is missed or counted
+twice. audit_logs is under FORCE ROW LEVEL SECURITY: the step refuses to
+run unless the migration role bypasses RLS, instead of backfilling nothing.
+"""
+
+from yoyo import step
+
+__depends__ = {"20261016_04_Vn7cT-audit-query-indexes"}
+
+steps = [
+    step(
+        """
+        CREATE TABLE IF NOT EXISTS audit_rollups_hourly (
+            tenant_id    uuid NOT NULL REFERENCES tenants(tenant_id) ON DELETE CASCADE,
+            hour         timestamptz NOT NULL,
+            action_type  text NOT NULL,
+            event_count  bigint NOT NULL DEFAULT 0,
+            PRIMARY KEY (tenant_id, hour, action_type)
+        );
+
+        ALTER TABLE audit_rollups_hourly ENABLE ROW LEVEL SECURITY;
+        ALTER TABLE audit_rollups_hourly FORCE ROW LEVEL SECURITY;
+
+        CREATE POLICY audit_rollups_isolation ON audit_rollups_hourly
+            USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+            WITH CHECK (tenant_id = current_setting('app.current_tenant_id', true)::uuid);
+        """,
+        """
+        DROP TABLE IF EXISTS audit_rollups_hourly;
+        """,
+    ),
+    step(
+        """
+        DO $$
+        BEGIN
+            IF row_security_active('audit_logs') OR row_security_active('audit_rollups_hourly') THEN
+                RAISE EXCEPTION 'audit rollup backfill: row-level security applies to role %, so not every tenant''s events are visible. Run this migration as a BYPASSRLS role.', current_user;
+            END IF;
+        END
+        $$;
+
+        LOCK TABLE audit_logs IN SHARE ROW EXCLUSIVE MODE;
+
+        CREATE OR REPLACE FUNCTION audit_rollups_on_insert() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO audit_rollups_hourly AS r (tenant_id, hour, action_type, event_count)
+            SELECT
+                tenant_id,
+                date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+                action_type,
+                count(*)
+            FROM inserted_rows
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+            ON CONFLICT (tenant_id, hour, action_type)
+            DO UPDATE SET event_count = r.event_count + EXCLUDED.event_count;
+            RETURN NULL;
+        END
+        $$;
+
+        CREATE TRIGGER audit_logs_rollup
+            AFTER INSERT ON audit_logs
+            REFERENCING NEW TABLE AS inserted_rows
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION audit_rollups_on_insert();
+
+        INSERT INTO audit_rollups_hourly (tenant_id, hour, action_type, event_count)
+        SELECT
+            tenant_id,
+            date_trunc('hour', created_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+            action_type,
+            count(*)
+        FROM audit_logs
+        GROUP BY 1, 2, 3;
+        """,
+        """
+        DROP TRIGGER IF EXISTS audit_logs_rollup ON audit_logs;
+        DROP FUNCTION IF EXISTS audit_rollups_on_insert();
+        TRUNCATE audit_rollups_hourly;
+        """,
+    ),
+]
@@ -0,0 +1,86 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.modules.audit.buffer import AuditBuffer, make_event
+from app.modules.audit.repository import AuditRepository
+from app.modules.audit.schemas import AuditLogCreate
+from app.modules.tenants.repository import TenantRepository
+from app.modules.tenants.schemas import TenantCreate
+
+
+@pytest.mark.asyncio
+async def test_inline_and_batched_inserts_maintain_hourly_rollups(db_connection):
+    tenant = await TenantRepository(db_connection).create(TenantCreate(
+        name="Rollup Corp",
+        plan="startup",
+        admin_email="admin@rollup.com",
+        admin_password="password123",
+        admin_name="Rollup Admin"
+    ))
+    tenant_id = str(tenant.tenant_id)
+    await db_connection.execute("SELECT set_config('app.current_tenant_id', $1, true)", tenant_id)
+    repo = AuditRepository(db_connection)
+
+    # Inline path (plain connection, no write-behind)
+    for action in ("rollup.login", "rollup.login", "rollup.update"):
+        await repo.log_event(AuditLogCreate(
+            action_type=action, resource_type="user", resource_id="1", details={}
+        ), ip_address="10.0.0.1")
+
+    # Write-behind path: the buffer's batched INSERT, on the test transaction
+    async def connect():
+        return db_connection
+
+    buffer = AuditBuffer(
+        max_events=10,
+        batch_size=10,
+        flush_interval_seconds=60,
+        enqueue_timeout_seconds=1,
+        connect=connect,
+    )
+    await buffer.start()
+    for action in ("rollup.login", "rollup.export"):
+        await buffer.submit(make_event(tenant_id, None, action, "user", "1", "10.0.0.2", "{}"))
+    assert await buffer.flush()
+    buffer._conn = None  # the fixture owns the connection: don't let close() close it
+    await buffer.close()
+
+    now = datetime.now(timezone.utc)
+    actions = ["rollup.login", "rollup.update", "rollup.export"]
+    rollups = await repo.rollups(tenant.tenant_id, now - timedelta(hours=2), now + timedelta(hours=2), actions)
+    counts = {}
+    for entry in rollups:
+        counts[entry.action_type] = counts.get(entry.action_type, 0) + entry.event_count
+    assert counts == {"rollup.login": 3, "rollup.update": 1, "rollup.export": 1}
+
+    # The batched rows read back like inline ones
+    logs = await repo.list_logs()
+    assert {str(log.ip_address) for log in logs} >= {"10.0.0.1", "10.0.0.2"}
+
+
+@pytest.mark.asyncio
+async def test_rollups_count_inserts_from_any_writer(db_connection):
+    tenant = await TenantRepository(db_connection).create(TenantCreate(
+        name="Rollup Legacy Corp",
+        plan="startup",
+        admin_email="admin@rollup-legacy.com",
+        admin_password="password123",
+        admin_name="Rollup Legacy Admin"
+    ))
+    await db_connection.execute("SELECT set_config('app.current_tenant_id', $1, true)", str(tenant.tenant_id))
+
+    # A plain multi-row INSERT, as an instance without rollup code would send
+    await db_connection.execute(
+        """
+        INSERT INTO audit_logs (audit_id, tenant_id, action_type, resource_type, resource_id, details)
+        SELECT uuid_generate_v4(), $1, 'rollup.legacy', 'user', '1', '{}'::jsonb
+        FROM generate_series(1, 3)
+        """,
+        tenant.tenant_id,
+    )
+
+    now = datetime.now(timezone.utc)
+    rollups = await AuditRepository(db_connection).rollups(
+        tenant.tenant_id, now - timedelta(hours=2), now + timedelta(hours=2), ["rollup.legacy"]
+    )
+    assert sum(entry.event_count for entry in rollups) == 3
@@ -0,0 +1,63 @@
+# tests/unit/test_admission.py
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.admission import AdmissionController
+
+
+def _controller(**overrides) -> AdmissionController:
+    params = dict(
+        name="test",
+        max_in_flight=1,
+        max_queue=1,
+        queue_timeout_seconds=1.0,
+        retry_after_seconds=3,
+    )
+    params.update(overrides)
+    return AdmissionController(**params)
+
+
+@pytest.mark.asyncio
+async def test_rejects_with_retry_after_when_queue_full():
+    controller = _controller()
+    release = asyncio.Event()
+
+    async def hold():
+        async with controller.slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    queued = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    assert controller.stats()["in_flight"] == 1
+    assert controller.stats()["queue_depth"] == 1
+
+    with pytest.raises(HTTPException) as exc:
+        async with controller.slot():
+            pass
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "3"
+
+    release.set()
+    await asyncio.gather(holder, queued)
+    stats = controller.stats()
+    assert stats["admitted"] == 2
+    assert stats["rejected"] == 1
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queued_request_times_out_with_429():
+    controller = _controller(queue_timeout_seconds=0.01)
+
+    async with controller.slot():
+        with pytest.raises(HTTPException) as exc:
+            async with controller.slot():
+                pass
+
+    assert exc.value.status_code == 429
+    assert controller.stats()["queue_depth"] == 0
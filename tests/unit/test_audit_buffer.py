@@ -0,0 +1,201 @@
+# tests/unit/test_audit_buffer.py
+
+import pytest
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+from asyncpg import exceptions as pg_errors
+from unittest.mock import AsyncMock, Mock
+
+from app.core.database import SET_TENANT_SQL, Database
+from app.modules.audit import repository as audit_repository
+from app.modules.audit.buffer import AuditBuffer, make_event
+from app.modules.audit.repository import AuditRepository
+from app.modules.audit.schemas import AuditLogCreate
+
+T1 = "11111111-1111-1111-1111-111111111111"
+T2 = "22222222-2222-2222-2222-222222222222"
+
+
+def _writer_conn(fail=False):
+    conn = Mock()
+    conn.execute = AsyncMock(side_effect=RuntimeError("db down") if fail else None)
+    conn.close = AsyncMock()
+
+    @asynccontextmanager
+    async def transaction():
+        yield
+
+    conn.transaction = transaction
+    return conn
+
+
+def _buffer(conn, **kwargs):
+    options = dict(
+        max_events=100,
+        batch_size=10,
+        flush_interval_seconds=60,
+        enqueue_timeout_seconds=0.01,
+        connect=AsyncMock(return_value=conn),
+    )
+    options.update(kwargs)
+    return AuditBuffer(**options)
+
+
+def _event(tenant, action="user.update"):
+    return make_event(tenant, None, action, "user", "u1", None, "{}")
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_one_insert_per_tenant():
+    conn = _writer_conn()
+    buffer = _buffer(conn)
+    await buffer.start()
+    for tenant in (T1, T2, T1):
+        await buffer.submit(_event(tenant))
+
+    assert await buffer.flush()
+    await buffer.close()
+
+    calls = conn.execute.await_args_list
+    assert [c.args[:2] for c in calls[::2]] == [(SET_TENANT_SQL, T1), (SET_TENANT_SQL, T2)]
+    t1_insert = calls[1].args
+    assert t1_insert[2] == [T1, T1]  # tenant_id column, both T1 events in one statement
+    assert buffer.stats()["written"] == 3 and buffer.stats()["batches"] == 1
+    conn.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_applies_backpressure_then_writes_directly():
+    conn = _writer_conn()
+    buffer = _buffer(conn, max_events=2)
+    await buffer.start()
+    await buffer.submit(_event(T1))
+    await buffer.submit(_event(T1))
+
+    await buffer.submit(_event(T1, "overflow"))
+
+    stats = buffer.stats()
+    assert stats["backpressure_waits"] == 1
+    assert stats["direct_writes"] == 1
+    assert stats["pending"] == 2
+    await buffer.close()
+    assert buffer.stats()["written"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_events_for_retry():
+    conn = _writer_conn(fail=True)
+    buffer = _buffer(conn)
+    await buffer.start()
+    await buffer.submit(_event(T1))
+
+    assert not await buffer.flush()
+
+    assert buffer.stats()["pending"] == 1
+    assert buffer.stats()["failures"] == 1
+    conn.close.assert_awaited()  # connection dropped, reopened next time
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_ip_address_is_written_as_plain_text():
+    conn = _writer_conn()
+    buffer = _buffer(conn)
+    await buffer.start()
+    await buffer.submit(make_event(T1, None, "user.login", "user", "u1", "1.2.3.4", "{}"))
+    await buffer.submit(make_event(T1, None, "user.login", "user", "u2", "testclient", "{}"))
+
+    assert await buffer.flush()
+    await buffer.close()
+
+    sql, *columns = conn.execute.await_args_list[1].args
+    assert columns[6] == ["1.2.3.4", "testclient"]  # stored as given, like the inline path
+    assert "::inet" not in sql
+
+
+def _rejecting_conn(error):
+    """Writer whose INSERT fails whenever the batch contains action 'bad'."""
+    conn = _writer_conn()
+
+    async def execute(sql, *args):
+        if len(args) > 3 and "bad" in args[3]:
+            raise error
+
+    conn.execute = AsyncMock(side_effect=execute)
+    return conn
+
+
+@pytest.mark.asyncio
+async def test_poison_row_is_dead_lettered_after_max_attempts():
+    conn = _rejecting_conn(pg_errors.InvalidTextRepresentationError("bad value"))
+    buffer = _buffer(conn, max_attempts=2)
+    await buffer.start()
+    for action in ("ok.1", "bad", "ok.2"):
+        await buffer.submit(_event(T1, action))
+
+    assert not await buffer.flush()
+    assert not await buffer.flush()
+    assert buffer.stats()["pending"] == 3
+
+    assert await buffer.flush()  # third pass goes row by row
+    stats = buffer.stats()
+    assert stats["pending"] == 0
+    assert stats["dead_lettered"] == 1
+    assert stats["written"] == 2
+
+    await buffer.submit(_event(T1, "ok.3"))
+    assert await buffer.flush()  # back to whole batches
+    assert buffer.stats()["batches"] == 3
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_are_retried_not_dead_lettered():
+    conn = _rejecting_conn(pg_errors.ConnectionDoesNotExistError("gone"))
+    buffer = _buffer(conn, max_attempts=1)
+    await buffer.start()
+    for action in ("ok.1", "bad", "ok.2"):
+        await buffer.submit(_event(T1, action))
+
+    assert not await buffer.flush()
+    assert not await buffer.flush()  # row by row: ok.1 written, stops at bad
+
+    stats = buffer.stats()
+    assert stats["dead_lettered"] == 0
+    assert stats["written"] == 1
+    assert stats["pending"] == 2
+    await buffer.close()
+
+
+def _database():
+    raw = Mock()
+    raw.execute = AsyncMock(return_value="SELECT 1")
+    database = Database()
+    database.pool = Mock()
+    database.pool.acquire = AsyncMock(return_value=raw)
+    database.pool.release = AsyncMock()
+    return database, raw
+
+
+@pytest.mark.asyncio
+async def test_log_event_is_deferred_until_commit(monkeypatch):
+    buffer = _buffer(_writer_conn())
+    await buffer.start()
+    monkeypatch.setattr(audit_repository, "audit_buffer", buffer)
+    database, raw = _database()
+    payload = AuditLogCreate(action_type="a", resource_type="r", resource_id="1")
+
+    async with database.lazy_connection(T1) as conn:
+        await AuditRepository(conn).log_event(payload, actor_user_id=uuid4())
+        assert buffer.stats()["enqueued"] == 0
+    raw.execute.assert_not_awaited()  # nothing inside the request transaction
+    assert buffer.stats()["enqueued"] == 1
+
+    with pytest.raises(ValueError):
+        async with database.lazy_connection(T1) as conn:
+            await AuditRepository(conn).log_event(payload)
+            raise ValueError("request failed")
+    assert buffer.stats()["enqueued"] == 1
+
+    await buffer.close()
@@ -0,0 +1,73 @@
+# tests/unit/test_audit_export.py
+
+import gzip
+import pytest
+from datetime import datetime, timezone
+from uuid import uuid4
+from unittest.mock import Mock
+
+from fastapi import HTTPException
+
+from app.modules.audit import export
+from app.modules.audit.export import stream_export
+
+LINES = [b'{"audit_id":"a","details":{"k":"x\\ny"}}\n', b'{"audit_id":"b","details":{}}\n']
+
+
+def _conn(chunks, fail=False):
+    conn = Mock()
+    conn.copied = []
+
+    async def copy_from_query(query, *args, output, **options):
+        conn.copied.append((query, args, options))
+        for chunk in chunks:
+            await output(chunk)
+        if fail:
+            raise RuntimeError("connection lost")
+
+    conn.copy_from_query = copy_from_query
+    return conn
+
+
+@pytest.mark.asyncio
+async def test_ndjson_export_streams_gzip_of_copy_output():
+    conn = _conn(LINES * 50)
+    tenant_id = uuid4()
+    since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    body = b"".join([c async for c in stream_export(conn, tenant_id, since, None, "ndjson", "gzip", queue_chunks=2)])
+
+    assert gzip.decompress(body) == b"".join(LINES * 50)
+    query, args, options = conn.copied[0]
+    assert "row_to_json" in query
+    assert args == (tenant_id, since, None)
+    assert options["format"] == "csv" and options["quote"] == "\x01"
+
+
+@pytest.mark.asyncio
+async def test_csv_export_uncompressed_keeps_header_option():
+    conn = _conn([b"audit_id,tenant_id\n", b"a,t\n"])
+
+    body = b"".join([c async for c in stream_export(conn, uuid4(), None, None, "csv", "none")])
+
+    assert body == b"audit_id,tenant_id\na,t\n"
+    assert conn.copied[0][2] == {"format": "csv", "header": True}
+
+
+@pytest.mark.asyncio
+async def test_failed_copy_surfaces_after_partial_stream():
+    conn = _conn([b"x\n"], fail=True)
+
+    with pytest.raises(RuntimeError):
+        async for _ in stream_export(conn, uuid4(), None, None, "ndjson", "none"):
+            pass
+
+
+def test_unavailable_or_unknown_options_rejected_before_streaming(monkeypatch):
+    monkeypatch.setattr(export, "zstandard", None)
+    with pytest.raises(HTTPException) as exc:
+        stream_export(_conn([]), uuid4(), None, None, "ndjson", "zstd")
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException):
+        stream_export(_conn([]), uuid4(), None, None, "xml", "gzip")
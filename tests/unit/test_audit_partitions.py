@@ -0,0 +1,128 @@
+# tests/unit/test_audit_partitions.py
+
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from app.modules.audit.partitions import AuditPartitionManager, parse_partition
+
+NOW = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+
+
+def _conn(partitions, stragglers=(), tenants=(), plans=None, partitioned=True):
+    conn = Mock()
+    conn.fetchrow = AsyncMock(
+        return_value={"key_column": "event_time", "default_partition": "audit_logs_default"}
+        if partitioned else None
+    )
+
+    async def fetch(sql, *args):
+        if "pg_inherits" in sql:
+            return [{"relname": name} for name in partitions]
+        if "date_trunc" in sql:
+            return [{"period": p} for p in stragglers]
+        if "DISTINCT tenant_id" in sql:
+            return [{"tenant_id": t} for t in tenants]
+        return []
+
+    async def fetchval(sql, *args):
+        if "advisory_lock" in sql:
+            return True
+        return (plans or {}).get(args[0])
+
+    conn.fetch = AsyncMock(side_effect=fetch)
+    conn.fetchval = AsyncMock(side_effect=fetchval)
+    conn.execute = AsyncMock(return_value="INSERT 0 7")
+    conn.close = AsyncMock()
+
+    @asynccontextmanager
+    async def transaction():
+        yield
+
+    conn.transaction = transaction
+    return conn
+
+
+def _manager(conn, **kwargs):
+    options = dict(
+        interval="month",
+        precreate=2,
+        retention_days_by_plan={"free": 90, "enterprise": 300},
+        check_interval_seconds=3600,
+        lock_timeout_ms=5000,
+        connect=AsyncMock(return_value=conn),
+    )
+    options.update(kwargs)
+    return AuditPartitionManager(**options)
+
+
+def _statements(conn):
+    return [c.args[0] for c in conn.execute.await_args_list]
+
+
+def test_partition_names_parse_to_ranges():
+    assert parse_partition("audit_logs", "audit_logs_2025_12")[1:] == (
+        datetime(2025, 12, 1, tzinfo=timezone.utc),
+        datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+    assert parse_partition("audit_logs", "audit_logs_2026_02_28")[2] == datetime(2026, 3, 1, tzinfo=timezone.utc)
+    assert parse_partition("audit_logs", "audit_logs_default") is None
+    assert parse_partition("audit_logs", "audit_logs_2026_13") is None
+
+
+@pytest.mark.asyncio
+async def test_run_moves_stragglers_precreates_and_drops_expired():
+    conn = _conn(
+        ["audit_logs_2025_11", "audit_logs_default"],
+        stragglers=[datetime(2026, 10, 1)],
+    )
+    manager = _manager(conn)
+
+    await manager.run_once(NOW)
+
+    sql = _statements(conn)
+    attached = [s for s in sql if "ATTACH PARTITION" in s]
+    assert [s.split('"')[3] for s in attached] == [
+        "audit_logs_2026_10", "audit_logs_2026_11", "audit_logs_2026_12",
+    ]
+    assert any('DELETE FROM "audit_logs_default"' in s and '"event_time"' in s for s in sql)
+    # 2025-11 ended more than 300 days ago: detached and dropped, not DELETEd
+    assert 'ALTER TABLE "audit_logs" DETACH PARTITION "audit_logs_2025_11"' in sql
+    assert 'DROP TABLE "audit_logs_2025_11"' in sql
+    assert not any("DELETE" in s and "2025_11" in s for s in sql)
+
+    stats = manager.stats()
+    assert stats["partitions_created"] == 3 and stats["partitions_dropped"] == 1
+    assert stats["rows_moved"] == 21
+    conn.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_short_retention_plans_are_purged_per_partition_once():
+    free, enterprise = uuid4(), uuid4()
+    conn = _conn(
+        ["audit_logs_2026_05", "audit_logs_2026_10", "audit_logs_2026_11", "audit_logs_2026_12"],
+        tenants=[free, enterprise],
+        plans={free: "free", enterprise: "enterprise"},
+    )
+    manager = _manager(conn)
+
+    await manager.run_once(NOW)
+    await manager.run_once(NOW)
+
+    deletes = [c.args for c in conn.execute.await_args_list if c.args[0].startswith("DELETE")]
+    assert deletes == [('DELETE FROM "audit_logs_2026_05" WHERE tenant_id = $1', free)]
+    assert manager.stats()["partitions_dropped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unpartitioned_table_is_left_alone():
+    conn = _conn([], partitioned=False)
+    manager = _manager(conn)
+
+    await manager.run_once(NOW)
+
+    assert manager.stats()["partitioned"] is False
+    assert not any("CREATE" in s or "DROP" in s for s in _statements(conn))
@@ -0,0 +1,74 @@
+# tests/unit/test_audit_query.py
+
+import pytest
+from datetime import datetime, timezone
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from fastapi import HTTPException
+
+from app.core.pagination import PageParams, encode_cursor
+from app.modules.audit.repository import AuditRepository
+from app.modules.audit.schemas import AuditQuery
+from app.modules.audit.service import AuditService
+
+
+def _row(tenant_id, i):
+    return {
+        "audit_id": uuid4(),
+        "tenant_id": tenant_id,
+        "actor_user_id": None,
+        "action_type": "user.update",
+        "resource_type": "user",
+        "resource_id": str(i),
+        "ip_address": None,
+        "details": '{"k": 1}',
+        "created_at": datetime(2026, 1, 1, 0, 0, 10 - i, tzinfo=timezone.utc),
+    }
+
+
+def _service(rows):
+    conn = Mock()
+    conn.fetch = AsyncMock(return_value=rows)
+    return AuditService(AuditRepository(conn)), conn
+
+
+@pytest.mark.asyncio
+async def test_filtered_query_is_keyset_paged():
+    tenant_id, actor = uuid4(), uuid4()
+    rows = [_row(tenant_id, i) for i in range(3)]
+    service, conn = _service(rows)
+    since = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    logs, next_cursor = await service.query(
+        tenant_id, AuditQuery(actor_user_id=actor, start_date=since), PageParams(limit=2)
+    )
+
+    args = conn.fetch.call_args.args
+    assert args[1:] == (tenant_id, None, None, actor, since, None, None, None, 3)
+    assert len(logs) == 2 and logs[0].details == {"k": 1}
+    assert next_cursor == encode_cursor(rows[1]["created_at"], rows[1]["audit_id"])
+
+
+@pytest.mark.asyncio
+async def test_cursor_continues_after_last_entry():
+    tenant_id = uuid4()
+    service, conn = _service([_row(tenant_id, 5)])
+    anchor_ts, anchor_id = datetime(2026, 1, 1, tzinfo=timezone.utc), uuid4()
+
+    logs, next_cursor = await service.query(
+        tenant_id, AuditQuery(action_type="user.update"),
+        PageParams(limit=10, cursor=encode_cursor(anchor_ts, anchor_id)),
+    )
+
+    args = conn.fetch.call_args.args
+    assert args[2] == "user.update"
+    assert args[7:9] == (anchor_ts, anchor_id)
+    assert len(logs) == 1 and next_cursor is None
+
+
+def test_stream_rejects_bad_cursor_before_streaming():
+    service, _ = _service([])
+    with pytest.raises(HTTPException) as exc:
+        service.stream(uuid4(), AuditQuery(), cursor="%%%")
+    assert exc.value.status_code == 400
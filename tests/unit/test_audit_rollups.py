@@ -0,0 +1,73 @@
+# tests/unit/test_audit_rollups.py
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from fastapi import HTTPException
+
+from app.modules.audit.repository import AuditRepository
+from app.modules.audit.service import AuditService
+
+
+def _service(rows=()):
+    conn = Mock()
+    conn.fetch = AsyncMock(return_value=list(rows))
+    return AuditService(AuditRepository(conn)), conn
+
+
+@pytest.mark.asyncio
+async def test_rollups_read_pre_aggregated_rows():
+    tenant_id = uuid4()
+    hour = datetime(2026, 10, 16, 9, tzinfo=timezone.utc)
+    service, conn = _service([{"bucket": hour, "action_type": "auth.login", "event_count": 42}])
+    since, until = hour - timedelta(days=1), hour + timedelta(hours=1)
+
+    rollups = await service.rollups(tenant_id, since, until, ["auth.login"], "hour")
+
+    assert conn.fetch.call_args.args[1:] == (tenant_id, since, until, ["auth.login"], "hour")
+    assert rollups[0].event_count == 42
+
+
+@pytest.mark.asyncio
+async def test_rollup_range_is_widened_to_whole_buckets():
+    service, conn = _service()
+    since = datetime(2026, 10, 9, 14, 37, tzinfo=timezone.utc)
+    until = datetime(2026, 10, 16, 14, 37, tzinfo=timezone.utc)
+
+    await service.rollups(uuid4(), since, until, bucket="hour")
+    assert conn.fetch.call_args.args[2:4] == (
+        datetime(2026, 10, 9, 14, tzinfo=timezone.utc),
+        datetime(2026, 10, 16, 15, tzinfo=timezone.utc),
+    )
+
+    await service.rollups(uuid4(), since, until, bucket="day")
+    assert conn.fetch.call_args.args[2:4] == (
+        datetime(2026, 10, 9, tzinfo=timezone.utc),
+        datetime(2026, 10, 17, tzinfo=timezone.utc),
+    )
+
+    # Already aligned, or naive (taken as UTC): unchanged
+    await service.rollups(uuid4(), datetime(2026, 10, 9), datetime(2026, 10, 16), bucket="day")
+    assert conn.fetch.call_args.args[2:4] == (
+        datetime(2026, 10, 9, tzinfo=timezone.utc),
+        datetime(2026, 10, 16, tzinfo=timezone.utc),
+    )
+
+
+@pytest.mark.asyncio
+async def test_rollups_default_window_and_range_checks():
+    service, conn = _service()
+
+    await service.rollups(uuid4())
+    since, until = conn.fetch.call_args.args[2:4]
+    assert timedelta(days=7) <= until - since <= timedelta(days=7, hours=1)
+    assert since.minute == since.second == since.microsecond == 0
+    assert conn.fetch.call_args.args[4] is None  # all action types
+
+    now = datetime.now(timezone.utc)
+    with pytest.raises(HTTPException):
+        await service.rollups(uuid4(), since=now, until=now - timedelta(hours=1))
+    with pytest.raises(HTTPException):
+        await service.rollups(uuid4(), since=now - timedelta(days=5000), until=now)
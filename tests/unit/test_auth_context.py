@@ -0,0 +1,62 @@
+# tests/unit/test_auth_context.py
+
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.dependencies.auth_context import AuthContext, get_auth_context
+
+
+def _request(token: str = "tok"):
+    request = Mock()
+    request.state = SimpleNamespace()
+    request.headers = {"Authorization": f"Bearer {token}"}
+    return request
+
+
+@pytest.mark.asyncio
+async def test_token_decoded_and_revocation_checked_once_per_request():
+    user_id, tenant_id = uuid4(), uuid4()
+    request = _request()
+
+    with patch(
+        "app.dependencies.auth_context.decode_token",
+        return_value={"sub": str(user_id), "tid": str(tenant_id)},
+    ) as mock_decode, patch("app.dependencies.auth_context.revocation_store") as mock_store:
+        mock_store.is_token_revoked = AsyncMock(return_value=False)
+
+        first = await get_auth_context(request)
+        second = await get_auth_context(request)
+
+        assert first is second
+        assert first.user_id == user_id
+        assert first.tenant_id == tenant_id
+        assert first.claims["tenant_id"] == str(tenant_id)
+        mock_decode.assert_called_once_with("tok")
+        mock_store.is_token_revoked.assert_awaited_once_with("tok")
+
+
+@pytest.mark.asyncio
+async def test_permissions_loaded_once_and_memoized():
+    ctx = AuthContext("tok", {"sub": str(uuid4()), "tid": str(uuid4())})
+    conn = Mock()
+    conn.fetch = AsyncMock(return_value=[{"key": "users:read"}])
+
+    with patch("app.modules.users.repository.UserRepository") as mock_repo:
+        mock_repo.return_value.get_user_context = AsyncMock(
+            return_value=SimpleNamespace(permissions=["users:read", "users:read"])
+        )
+
+        assert await ctx.get_permissions(conn) == {"users:read"}
+        assert await ctx.get_permissions(conn) == {"users:read"}
+        mock_repo.return_value.get_user_context.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_permissions_claim_skips_database():
+    ctx = AuthContext("tok", {"sub": str(uuid4()), "tid": str(uuid4()), "permissions": ["a:b"]})
+
+    with patch("app.modules.users.repository.UserRepository") as mock_repo:
+        assert await ctx.get_permissions(Mock()) == {"a:b"}
+        mock_repo.assert_not_called()
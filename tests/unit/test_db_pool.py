@@ -0,0 +1,103 @@
+# tests/unit/test_db_pool.py
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.core.db_pool import PoolExhausted, PoolGovernor
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _pool():
+    pool = Mock()
+    pool.acquire = AsyncMock(side_effect=lambda timeout=None: Mock())
+    pool.release = AsyncMock()
+    pool.get_size = Mock(return_value=3)
+    pool.get_idle_size = Mock(return_value=2)
+    return pool
+
+
+@pytest.mark.asyncio
+async def test_gauges_and_histogram():
+    governor = PoolGovernor(min_size=1, max_size=5, acquire_timeout_seconds=1.0)
+    pool = _pool()
+
+    conn = await governor.acquire(pool)
+    stats = governor.stats(pool)
+    assert stats["in_use"] == 1
+    assert stats["idle"] == 2
+    assert stats["waiting"] == 0
+    assert stats["wait_seconds"]["count"] == 1
+    assert stats["wait_seconds"]["buckets"]["+Inf"] == 1
+
+    await governor.release(pool, conn)
+    assert governor.stats(pool)["in_use"] == 0
+    pool.release.assert_awaited_once_with(conn)
+
+
+@pytest.mark.asyncio
+async def test_acquire_timeout_raises_503():
+    governor = PoolGovernor(min_size=1, max_size=5, acquire_timeout_seconds=0.5)
+    pool = _pool()
+    pool.acquire = AsyncMock(side_effect=asyncio.TimeoutError)
+
+    with pytest.raises(PoolExhausted) as exc:
+        await governor.acquire(pool)
+
+    assert exc.value.status_code == 503
+    assert governor.timeouts == 1
+    assert governor.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limit_caps_concurrent_checkouts():
+    governor = PoolGovernor(
+        min_size=1, max_size=4, acquire_timeout_seconds=0.05, adaptive=True,
+    )
+    pool = _pool()
+
+    first = await governor.acquire(pool)
+    with pytest.raises(PoolExhausted):
+        await governor.acquire(pool)
+
+    await governor.release(pool, first)
+    second = await governor.acquire(pool)
+    await governor.release(pool, second)
+    assert pool.acquire.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limit_grows_on_slow_waits_and_shrinks_when_idle():
+    clock = _Clock()
+    governor = PoolGovernor(
+        min_size=2, max_size=8, acquire_timeout_seconds=10.0, adaptive=True,
+        target_wait_seconds=0.01, adjust_interval_seconds=10.0, clock=clock,
+    )
+    pool = _pool()
+
+    async def slow_acquire(timeout=None):
+        clock.now += 0.5
+        return Mock()
+
+    pool.acquire = AsyncMock(side_effect=slow_acquire)
+    conn = await governor.acquire(pool)
+    await governor.release(pool, conn)
+    clock.now += 10
+    conn = await governor.acquire(pool)
+    await governor.release(pool, conn)
+    assert governor.limit == 3
+
+    pool.acquire = AsyncMock(side_effect=lambda timeout=None: Mock())
+    for _ in range(3):
+        clock.now += 10
+        conn = await governor.acquire(pool)
+        await governor.release(pool, conn)
+    assert governor.limit == 2
@@ -0,0 +1,97 @@
+# tests/unit/test_jwks_store.py
+
+import asyncio
+
+import httpx
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.core.jwks import JWKSKeyStore
+
+
+def _rsa_pair(kid: str):
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk.update({"kid": kid, "use": "sig"})
+    return private_pem, public_jwk
+
+
+class _JWKSServer:
+    """Local stand-in for an IdP's /.well-known/jwks.json."""
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.requests = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(
+            200,
+            json={"keys": self.keys},
+            headers={"Cache-Control": "public, max-age=600"},
+        )
+
+
+def _store(server: _JWKSServer, **kwargs) -> JWKSKeyStore:
+    return JWKSKeyStore(
+        jwks_url="https://idp.test/.well-known/jwks.json",
+        transport=httpx.MockTransport(server.handler),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_keys_are_fetched_once_and_verify_tokens():
+    private_pem, public_jwk = _rsa_pair("k1")
+    server = _JWKSServer([public_jwk])
+    store = _store(server)
+
+    token = jwt.encode({"sub": "u1"}, private_pem, algorithm="RS256", headers={"kid": "k1"})
+
+    for _ in range(3):
+        key = await store.get_key("k1")
+        assert jwt.decode(token, key, algorithms=["RS256"])["sub"] == "u1"
+
+    assert server.requests == 1
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_triggers_single_flight_refetch():
+    _, old_jwk = _rsa_pair("old")
+    _, new_jwk = _rsa_pair("new")
+    server = _JWKSServer([old_jwk])
+    store = _store(server, min_refetch_interval_seconds=0)
+
+    await store.get_key("old")
+    server.keys.append(new_jwk)  # IdP rotates keys
+
+    keys = await asyncio.gather(*(store.get_key("new") for _ in range(10)))
+
+    assert all(k is not None for k in keys)
+    assert server.requests == 2
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetch_is_rate_limited():
+    _, public_jwk = _rsa_pair("k1")
+    server = _JWKSServer([public_jwk])
+    store = _store(server, min_refetch_interval_seconds=60)
+
+    await store.get_key("k1")
+    assert await store.get_key("bogus") is None
+    assert server.requests == 1
+    await store.close()
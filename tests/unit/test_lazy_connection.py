@@ -0,0 +1,158 @@
+# tests/unit/test_lazy_connection.py
+
+import pytest
+from unittest.mock import AsyncMock, Mock, call
+
+from app.core.database import (
+    SET_TENANT_SQL,
+    Database,
+    LazyTenantConnection,
+    release_early,
+    set_tenant_context,
+)
+
+T1 = "11111111-1111-1111-1111-111111111111"
+T2 = "22222222-2222-2222-2222-222222222222"
+BEGIN_T1 = f"BEGIN; SELECT set_config('app.current_tenant_id', '{T1}', true)"
+
+
+def _database():
+    raw = Mock()
+    raw.execute = AsyncMock(return_value="SELECT 1")
+    raw.fetchval = AsyncMock(return_value=42)
+
+    database = Database()
+    database.pool = Mock()
+    database.pool.acquire = AsyncMock(return_value=raw)
+    database.pool.release = AsyncMock()
+    return database, raw
+
+
+@pytest.mark.asyncio
+async def test_nothing_acquired_until_first_query():
+    database, raw = _database()
+
+    async with database.lazy_connection(T1) as conn:
+        assert not conn.acquired
+        database.pool.acquire.assert_not_awaited()
+
+        assert await conn.fetchval("SELECT 42") == 42
+        assert await conn.fetchval("SELECT 42") == 42
+
+    database.pool.acquire.assert_awaited_once()
+    # BEGIN + tenant context in one message, then COMMIT; nothing else
+    assert raw.execute.await_args_list == [call(BEGIN_T1), call("COMMIT")]
+    database.pool.release.assert_awaited_once_with(raw)
+
+
+@pytest.mark.asyncio
+async def test_unused_connection_never_touches_pool():
+    database, _ = _database()
+
+    async with database.lazy_connection(T1):
+        pass
+
+    database.pool.acquire.assert_not_awaited()
+    database.pool.release.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_exception_rolls_back_and_releases():
+    database, raw = _database()
+
+    with pytest.raises(RuntimeError):
+        async with database.lazy_connection(T1) as conn:
+            await conn.fetchval("SELECT 42")
+            raise RuntimeError("boom")
+
+    assert raw.execute.await_args_list[-1] == call("ROLLBACK")
+    database.pool.release.assert_awaited_once_with(raw)
+
+
+@pytest.mark.asyncio
+async def test_nested_transaction_is_a_savepoint():
+    database, raw = _database()
+
+    async with database.lazy_connection(T1) as conn:
+        with pytest.raises(ValueError):
+            async with conn.transaction():
+                raise ValueError("inner")
+
+    assert raw.execute.await_args_list == [
+        call(BEGIN_T1),
+        call("SAVEPOINT lazy_sp_1"),
+        call("ROLLBACK TO SAVEPOINT lazy_sp_1"),
+        call("RELEASE SAVEPOINT lazy_sp_1"),
+        call("COMMIT"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_release_early_returns_slot_and_reacquires_on_next_query():
+    database, _ = _database()
+
+    async with database.lazy_connection(T1) as conn:
+        await conn.fetchval("SELECT 42")
+        await release_early(conn)
+        assert not conn.acquired
+        assert database.pool.release.await_count == 1
+
+        await conn.fetchval("SELECT 42")
+        assert conn.acquired
+
+    assert database.pool.acquire.await_count == 2
+    assert database.pool.release.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_set_tenant_context_before_first_query_costs_no_round_trip():
+    database, raw = _database()
+
+    async with database.lazy_connection(T1) as conn:
+        await set_tenant_context(conn, T2)
+        raw.execute.assert_not_awaited()
+        await conn.fetchval("SELECT 42")
+
+        await set_tenant_context(conn, T1)
+
+    assert raw.execute.await_args_list == [
+        call(f"BEGIN; SELECT set_config('app.current_tenant_id', '{T2}', true)"),
+        call(SET_TENANT_SQL, T1),
+        call("COMMIT"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_helpers_on_plain_connections():
+    plain = Mock(spec=["execute"])
+    plain.execute = AsyncMock()
+
+    await release_early(plain)
+    await set_tenant_context(plain, T1)
+
+    plain.execute.assert_awaited_once_with(SET_TENANT_SQL, T1)
+    assert not LazyTenantConnection(Database(), T1).acquired
+
+
+def test_every_route_commits_its_connection_before_responding():
+    from fastapi import APIRouter
+
+    from app import main
+    from app.dependencies.database import get_db_connection, get_tenant_db_connection
+
+    def walk(dependant):
+        for sub in dependant.dependencies:
+            yield sub
+            yield from walk(sub)
+
+    routers = [main.app.router] + [r for r in vars(main).values() if isinstance(r, APIRouter)]
+    checked = 0
+    for route in (route for router in routers for route in router.routes):
+        dependant = getattr(route, "dependant", None)
+        if dependant is None:
+            continue
+        for sub in walk(dependant):
+            if sub.call in (get_db_connection, get_tenant_db_connection):
+                assert sub.scope == "function", f"{route.path}: {sub.call.__name__} without scope='function'"
+                checked += 1
+    assert checked
@@ -0,0 +1,73 @@
+# tests/unit/test_login_lockout.py
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock, patch
+
+from fastapi import HTTPException
+
+from app.modules.auth.lockout import LoginLockout
+from app.modules.auth.schemas import LoginRequest
+from app.modules.auth.service import AuthService
+
+
+@pytest.mark.asyncio
+async def test_locked_account_short_circuits_before_db_and_bcrypt():
+    conn = Mock()
+    conn.execute = AsyncMock()
+    service = AuthService(conn)
+    service.auth_repo.get_user_for_login = AsyncMock()
+
+    payload = LoginRequest(tenant_id=uuid4(), email="a@b.com", password="wrong-pass")
+
+    with patch("app.modules.auth.lockout.cache") as mock_cache, patch(
+        "app.modules.auth.service.password_hasher"
+    ) as mock_hasher:
+        mock_cache.ttl = AsyncMock(side_effect=[120, -2])
+        mock_hasher.verify = AsyncMock()
+
+        with pytest.raises(HTTPException) as exc:
+            await service.login(payload, ip_address="10.0.0.1")
+
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "120"
+    conn.execute.assert_not_called()
+    service.auth_repo.get_user_for_login.assert_not_called()
+    mock_hasher.verify.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failures_past_threshold_set_progressive_lock():
+    lockout = LoginLockout()
+    tenant_id = uuid4()
+
+    with patch("app.modules.auth.lockout.cache") as mock_cache, patch(
+        "app.modules.auth.lockout.settings"
+    ) as mock_settings:
+        mock_settings.LOGIN_FAILURE_WINDOW_SECONDS = 900
+        mock_settings.LOGIN_LOCKOUT_THRESHOLD = 3
+        mock_settings.LOGIN_LOCKOUT_BASE_SECONDS = 30
+        mock_settings.LOGIN_LOCKOUT_MAX_SECONDS = 100
+        mock_cache.set = AsyncMock()
+
+        mock_cache.incr = AsyncMock(return_value=2)
+        await lockout.record_failure(tenant_id, "A@B.com")
+        mock_cache.set.assert_not_called()
+
+        mock_cache.incr = AsyncMock(return_value=4)
+        await lockout.record_failure(tenant_id, "A@B.com")
+        key, _ = mock_cache.set.call_args.args
+        assert key == f"login_lock:acct:{tenant_id}:a@b.com"
+        assert mock_cache.set.call_args.kwargs["ttl"] == 60
+
+        mock_cache.incr = AsyncMock(return_value=10)
+        await lockout.record_failure(tenant_id, "a@b.com")
+        assert mock_cache.set.call_args.kwargs["ttl"] == 100
+
+
+@pytest.mark.asyncio
+async def test_check_fails_open_when_cache_down():
+    lockout = LoginLockout()
+    with patch("app.modules.auth.lockout.cache") as mock_cache:
+        mock_cache.ttl = AsyncMock(side_effect=ConnectionError("down"))
+        await lockout.check(uuid4(), "a@b.com", "10.0.0.1")
@@ -0,0 +1,77 @@
+# tests/unit/test_pagination.py
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from fastapi import HTTPException
+
+from app.core.pagination import MAX_PAGE_SIZE, PageParams, created_keyset, fetch_page
+from app.modules.roles.service import ROLE_KEYSET, RoleService
+
+KEYSET = created_keyset("role_id")
+T0 = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def _rows(n):
+    # Newest first, as the list statements order them
+    return [
+        {"role_id": uuid4(), "name": f"r{i}", "description": None,
+         "created_at": T0 - timedelta(minutes=i), "permissions": []}
+        for i in range(n)
+    ]
+
+
+async def _walk(table, page_size):
+    """Page through `table` the way a client following X-Next-Cursor would."""
+    async def fetch(limit, after):
+        rows = table
+        if after is not None:
+            rows = [r for r in rows if (r["created_at"], r["role_id"]) < after]
+        return rows[:limit]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        items, cursor = await fetch_page(fetch, PageParams(limit=page_size, cursor=cursor), KEYSET)
+        seen.extend(items)
+        pages += 1
+        if cursor is None:
+            return seen, pages
+
+
+@pytest.mark.asyncio
+async def test_walking_pages_returns_every_row_once():
+    table = _rows(7)
+    seen, pages = await _walk(table, 3)
+    assert [r["name"] for r in seen] == [r["name"] for r in table]
+    assert pages == 3
+
+
+@pytest.mark.asyncio
+async def test_exact_multiple_has_no_trailing_empty_page():
+    _, pages = await _walk(_rows(6), 3)
+    assert pages == 2
+
+
+@pytest.mark.asyncio
+async def test_limit_is_capped_and_one_extra_row_probed():
+    fetch = AsyncMock(return_value=[])
+    await fetch_page(fetch, PageParams(limit=10_000), KEYSET)
+    assert fetch.call_args.args == (MAX_PAGE_SIZE + 1, None)
+
+
+@pytest.mark.asyncio
+async def test_cursor_from_model_rows_and_bad_cursor():
+    conn = Mock()
+    rows = _rows(3)
+    conn.fetch = AsyncMock(return_value=rows)
+    roles, next_cursor = await RoleService(conn).list_roles(PageParams(limit=2))
+
+    assert [r.name for r in roles] == ["r0", "r1"]
+    assert ROLE_KEYSET.decode(next_cursor) == (rows[1]["created_at"], rows[1]["role_id"])
+    assert conn.fetch.call_args.args[1:] == (None, None, 3)
+
+    with pytest.raises(HTTPException) as exc:
+        await RoleService(conn).list_roles(PageParams(cursor="%%%"))
+    assert exc.value.status_code == 400
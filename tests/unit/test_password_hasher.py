@@ -0,0 +1,41 @@
+# tests/unit/test_password_hasher.py
+
+import asyncio
+
+import pytest
+
+from app.core.password_hasher import PasswordHasher
+from app.core.security import get_password_hash, verify_password
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_round_trip_in_process_pool():
+    hasher = PasswordHasher(workers=1, max_concurrency=1)
+    try:
+        hashed = await hasher.hash("s3cret!")
+        assert verify_password("s3cret!", hashed)
+        assert await hasher.verify("s3cret!", hashed) is True
+        assert await hasher.verify("wrong", hashed) is False
+    finally:
+        hasher.shutdown()
+
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["max_latency_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_queues_excess_jobs():
+    hasher = PasswordHasher(workers=0, max_concurrency=1)
+    hashed = get_password_hash("pw")
+
+    tasks = [asyncio.create_task(hasher.verify("pw", hashed)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    assert hasher.stats()["in_flight"] == 1
+    assert hasher.stats()["queue_depth"] == 2
+
+    assert all(await asyncio.gather(*tasks))
+    assert hasher.stats()["queue_depth"] == 0
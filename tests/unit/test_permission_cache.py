@@ -0,0 +1,145 @@
+# tests/unit/test_permission_cache.py
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.core.database import Database
+from app.modules.roles.permission_cache import PermissionCache
+from app.modules.roles.repository import RoleRepository
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=3600):
+        self.data[key] = value
+
+    async def set_if_absent(self, key, value, ttl=3600):
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    async def incr(self, key, ttl):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+@pytest.mark.asyncio
+async def test_loader_runs_once_until_tenant_version_bumps():
+    store = PermissionCache(local_size=100, ttl_seconds=60)
+    tenant_id, user_id = uuid4(), uuid4()
+    loader = AsyncMock(return_value=["user.read"])
+
+    with patch("app.modules.roles.permission_cache.cache", _FakeRedis()):
+        assert await store.get_permissions(tenant_id, user_id, loader) == {"user.read"}
+        assert await store.get_permissions(tenant_id, user_id, loader) == {"user.read"}
+        assert loader.await_count == 1
+
+        await store.bump_tenant(tenant_id)
+        loader.return_value = ["user.read", "user.update"]
+        assert await store.get_permissions(tenant_id, user_id, loader) == {
+            "user.read",
+            "user.update",
+        }
+        assert loader.await_count == 2
+
+    stats = store.stats()
+    assert stats["local_hits"] == 1
+    assert stats["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_shared_between_workers():
+    redis = _FakeRedis()
+    worker_a = PermissionCache(local_size=100, ttl_seconds=60)
+    worker_b = PermissionCache(local_size=100, ttl_seconds=60)
+    tenant_id, user_id = uuid4(), uuid4()
+    loader = AsyncMock(return_value=["role.read"])
+
+    with patch("app.modules.roles.permission_cache.cache", redis):
+        await worker_a.get_permissions(tenant_id, user_id, loader)
+        assert await worker_b.get_permissions(tenant_id, user_id, loader) == {"role.read"}
+
+    assert loader.await_count == 1
+    assert worker_b.stats()["redis_hits"] == 1
+
+
+def _database(fetchval):
+    raw = Mock(spec=["execute", "prepare"])
+    raw.execute = AsyncMock(return_value="SELECT 1")
+    stmt = Mock()
+    stmt.fetchval = AsyncMock(return_value=fetchval)
+    raw.prepare = AsyncMock(return_value=stmt)
+    database = Database()
+    database.pool = Mock()
+    database.pool.acquire = AsyncMock(return_value=raw)
+    database.pool.release = AsyncMock()
+    return database
+
+
+@pytest.mark.asyncio
+async def test_remove_role_bumps_tenant_version_after_commit():
+    tenant_id = uuid4()
+    redis = _FakeRedis()
+    store = PermissionCache(local_size=100, ttl_seconds=60)
+    database = _database(tenant_id)
+
+    with patch("app.modules.roles.permission_cache.cache", redis), patch(
+        "app.modules.roles.repository.permission_cache", store
+    ):
+        before = await store.tenant_version(tenant_id)
+        async with database.lazy_connection(str(tenant_id)) as conn:
+            assert await RoleRepository(conn).remove_role(uuid4(), uuid4()) is True
+            assert await store.tenant_version(tenant_id) == before  # not before COMMIT
+        assert await store.tenant_version(tenant_id) == before + 1
+
+        with pytest.raises(ValueError):
+            async with database.lazy_connection(str(tenant_id)) as conn:
+                await RoleRepository(conn).remove_role(uuid4(), uuid4())
+                raise ValueError("request failed")
+        assert await store.tenant_version(tenant_id) == before + 1  # rolled back: no bump
+
+
+@pytest.mark.asyncio
+async def test_lost_version_counter_never_repeats_an_old_version():
+    redis = _FakeRedis()
+    store = PermissionCache(local_size=100, ttl_seconds=60)
+    tenant_id = uuid4()
+
+    with patch("app.modules.roles.permission_cache.cache", redis):
+        seeded = await store.tenant_version(tenant_id)
+        assert seeded > 0
+        await store.bump_tenant(tenant_id)
+        old = await store.tenant_version(tenant_id)
+
+        redis.data.clear()  # flush / eviction / expiry
+        assert await store.tenant_version(tenant_id) > old
+
+        redis.data.clear()
+        await store.bump_tenant(tenant_id)  # INCR must not restart at 1
+        assert await store.tenant_version(tenant_id) > old
+
+
+@pytest.mark.asyncio
+async def test_failed_bump_leaves_tenant_untrusted_until_retried():
+    redis = _FakeRedis()
+    store = PermissionCache(local_size=100, ttl_seconds=60)
+    tenant_id = uuid4()
+
+    with patch("app.modules.roles.permission_cache.cache", redis):
+        before = await store.tenant_version(tenant_id)
+        working_incr = redis.incr
+        redis.incr = AsyncMock(side_effect=ConnectionError("redis down"))
+
+        await store.bump_tenant(tenant_id)
+        assert await store.tenant_version(tenant_id) is None
+
+        redis.incr = working_incr
+        assert await store.tenant_version(tenant_id) == before + 1
+        assert await store.tenant_version(tenant_id) == before + 1
@@ -0,0 +1,89 @@
+# tests/unit/test_permission_registry.py
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.core.database import Database
+from app.modules.roles.permission_registry import PermissionRegistry
+
+T1 = "11111111-1111-1111-1111-111111111111"
+
+CATALOG = ["audit.read", "role.read", "role.update", "user.create", "user.read", "user.update"]
+
+
+def _registry() -> PermissionRegistry:
+    registry = PermissionRegistry()
+    registry.load_keys(CATALOG)
+    return registry
+
+
+def test_bit_layout_is_deterministic_and_versioned():
+    a, b = _registry(), _registry()
+    assert a.index == b.index
+    assert a.version == b.version
+
+    c = PermissionRegistry()
+    c.load_keys(CATALOG + ["sso.manage"])
+    assert c.version != a.version
+
+
+def test_exact_grants_single_and_check():
+    registry = _registry()
+    grants = {"user.read", "user.update"}
+    mask = registry.compile(grants)
+
+    assert registry.missing(mask, grants, ["user.read", "user.update"]) == []
+    assert registry.missing(mask, grants, ["user.read", "user.create"]) == ["user.create"]
+    assert registry.decode(mask) == grants
+
+
+def test_wildcards_compile_into_mask_for_multi_permission_checks():
+    registry = _registry()
+
+    prefix = {"user.*"}
+    mask = registry.compile(prefix)
+    assert registry.missing(mask, prefix, ["user.read", "user.create"]) == []
+    assert registry.missing(mask, prefix, ["user.read", "role.read"]) == ["role.read"]
+
+    everything = {"*"}
+    mask = registry.compile(everything)
+    assert registry.missing(mask, everything, CATALOG) == []
+
+
+def test_unknown_keys_mark_registry_stale():
+    registry = _registry()
+    grants = {"user.read"}
+    mask = registry.compile(grants)
+
+    assert registry.missing(mask, grants, ["billing.read"]) == ["billing.read"]
+    assert registry.stale is True
+
+    # Outside the catalog, only a wildcard grant can satisfy the key
+    assert registry.missing(registry.compile({"*"}), {"*"}, ["billing.read"]) == []
+
+
+@pytest.mark.asyncio
+async def test_new_keys_reload_the_registry_only_after_commit():
+    registry = _registry()
+    version = registry.version
+    raw = Mock(spec=["execute"])
+    raw.execute = AsyncMock(return_value="SELECT 1")
+    database = Database()
+    database.pool = Mock()
+    database.pool.acquire = AsyncMock(return_value=raw)
+    database.pool.release = AsyncMock()
+
+    with patch.object(registry, "load", AsyncMock()) as load:
+        with pytest.raises(ValueError):
+            async with database.lazy_connection(T1) as conn:
+                await conn.execute("INSERT INTO permissions ...")
+                registry.reload_on_commit(conn)
+                raise ValueError("role update failed")
+        load.assert_not_awaited()  # rolled back: nothing to load
+        assert registry.version == version
+
+        async with database.lazy_connection(T1) as conn:
+            await conn.execute("INSERT INTO permissions ...")
+            registry.reload_on_commit(conn)
+            load.assert_not_awaited()
+        load.assert_awaited_once_with()  # from the pool, committed state only
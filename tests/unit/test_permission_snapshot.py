@@ -0,0 +1,69 @@
+# tests/unit/test_permission_snapshot.py
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.dependencies.auth_context import AuthContext
+from app.modules.roles.permission_registry import PermissionRegistry
+from app.modules.roles.permission_snapshot import (
+    build_permission_claims,
+    decode_mask,
+    encode_mask,
+    trusted_snapshot_mask,
+)
+
+
+def test_mask_round_trips_through_compact_encoding():
+    for mask in (0, 1, 0b1011, (1 << 200) | 5):
+        assert decode_mask(encode_mask(mask)) == mask
+
+
+@pytest.mark.asyncio
+async def test_snapshot_trusted_until_tenant_version_changes():
+    registry = PermissionRegistry()
+    registry.load_keys(["role.read", "user.read", "user.update"])
+    tenant_id, user_id = uuid4(), uuid4()
+
+    with patch("app.modules.roles.permission_snapshot.permission_registry", registry), patch(
+        "app.modules.roles.permission_snapshot.permission_cache"
+    ) as mock_cache:
+        mock_cache.tenant_version = AsyncMock(return_value=3)
+        mock_cache.get_permissions = AsyncMock(return_value={"user.read", "user.update"})
+
+        claims = await build_permission_claims(Mock(), tenant_id, user_id)
+        assert claims["pv"] == f"{registry.version}:3"
+
+        mask = await trusted_snapshot_mask(claims, tenant_id)
+        assert registry.decode(mask) == {"user.read", "user.update"}
+
+        mock_cache.tenant_version = AsyncMock(return_value=4)
+        assert await trusted_snapshot_mask(claims, tenant_id) is None
+
+        mock_cache.tenant_version = AsyncMock(return_value=None)
+        assert await trusted_snapshot_mask(claims, tenant_id) is None
+
+
+@pytest.mark.asyncio
+async def test_auth_context_uses_snapshot_without_database():
+    registry = PermissionRegistry()
+    registry.load_keys(["role.read", "user.read"])
+    tenant_id = uuid4()
+    claims = {
+        "sub": str(uuid4()),
+        "tid": str(tenant_id),
+        "pm": encode_mask(registry.compile({"user.read"})),
+        "pv": f"{registry.version}:7",
+    }
+    ctx = AuthContext("tok", claims)
+
+    with patch("app.modules.roles.permission_registry.permission_registry", registry), patch(
+        "app.modules.roles.permission_snapshot.permission_registry", registry
+    ), patch("app.modules.roles.permission_snapshot.permission_cache") as mock_cache, patch(
+        "app.modules.users.repository.UserRepository"
+    ) as mock_repo:
+        mock_cache.tenant_version = AsyncMock(return_value=7)
+
+        assert await ctx.get_permissions(Mock()) == {"user.read"}
+        assert await ctx.get_permission_mask(Mock()) == registry.compile({"user.read"})
+        mock_repo.assert_not_called()
@@ -0,0 +1,81 @@
+# tests/unit/test_query_log.py
+
+import logging
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.query_log import (
+    QueryMetrics,
+    RequestQueryStats,
+    current_request_queries,
+    instrumented,
+    query_metrics,
+    redact,
+)
+from app.core.statements import Query
+
+
+def test_redact_hides_values():
+    out = redact(("secret@example.com", 42, None, uuid4()))
+    assert "secret" not in out
+    assert out == "$1=<str len=18>, $2=<int>, $3=NULL, $4=<UUID>"
+
+
+@pytest.mark.asyncio
+async def test_instrumented_attributes_to_request_and_logs_slow(caplog):
+    metrics = QueryMetrics(slow_query_ms=0, default_budget=10, budgets={})
+    stats = RequestQueryStats("req-1")
+    token = current_request_queries.set(stats)
+    try:
+        with patch("app.core.query_log.query_metrics", metrics), caplog.at_level(logging.WARNING, "uvicorn"):
+            q = Query("users.get_by_id", "SELECT 1 WHERE $1")
+            result = await instrumented("fetch", q, ("hunter2",), AsyncMock(return_value=[1, 2])())
+    finally:
+        current_request_queries.reset(token)
+
+    assert result == [1, 2]
+    assert stats.count == 1
+    assert metrics.stats()["top_by_total_time"]["users.get_by_id"]["rows"] == 2
+    assert "users.get_by_id" in caplog.text
+    assert "hunter2" not in caplog.text
+    assert "req-1" in caplog.text
+
+
+def test_budget_flags_hot_call_site(caplog):
+    metrics = QueryMetrics(slow_query_ms=1000, default_budget=2, budgets={"GET /x": 5})
+    stats = RequestQueryStats("req-2")
+    for _ in range(4):
+        stats.record("app/modules/users/repository.py:10 list_users_for_tenant", 0.001)
+
+    with caplog.at_level(logging.WARNING, "uvicorn"):
+        assert metrics.check_budget("GET /y", stats) is True
+        assert metrics.check_budget("GET /x", stats) is False
+
+    assert metrics.stats()["over_budget"] == {"GET /y": 1}
+    assert "list_users_for_tenant" in caplog.text
+
+
+def test_middleware_sets_request_id_and_query_count():
+    from app.main import add_request_id_and_log
+
+    app = FastAPI()
+    app.middleware("http")(add_request_id_and_log)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: str):
+        for _ in range(3):
+            await instrumented("fetchval", "SELECT 1", (), AsyncMock(return_value=1)())
+        return {"ok": True}
+
+    with patch.object(query_metrics, "budgets", {"GET /items/{item_id}": 2}):
+        before = query_metrics.stats()["over_budget"].get("GET /items/{item_id}", 0)
+        response = TestClient(app).get("/items/1", headers={"X-Request-ID": "abc"})
+        after = query_metrics.stats()["over_budget"]["GET /items/{item_id}"]
+
+    assert response.headers["X-Request-ID"] == "abc"
+    assert response.headers["X-Query-Count"] == "3"
+    assert after == before + 1
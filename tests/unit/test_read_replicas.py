@@ -0,0 +1,237 @@
+# tests/unit/test_read_replicas.py
+
+import time
+
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.core.database import Database, read_only
+from app.core.replicas import ReplicaSet
+
+T1 = "11111111-1111-1111-1111-111111111111"
+SESSION = f"{T1}:user"
+
+
+def _conn(name):
+    conn = Mock(name=name)
+    conn.execute = AsyncMock(return_value="OK")
+    conn.fetch = AsyncMock(return_value=[name])
+    return conn
+
+
+def _replica_set(primary_lsn=100, replay_lsn=100):
+    replicas = ReplicaSet(
+        dsns=["postgresql://replica"],
+        max_lag_seconds=5.0,
+        check_interval_seconds=1.0,
+        pool_options={},
+        governor_options={"min_size": 1, "max_size": 2, "acquire_timeout_seconds": 1.0},
+    )
+    replica = replicas.replicas[0]
+    replica.pool = Mock()
+    replica.pool.acquire = AsyncMock(return_value=_conn("replica"))
+    replica.pool.release = AsyncMock()
+    replica.pool.get_size = Mock(return_value=1)
+    replica.pool.get_idle_size = Mock(return_value=1)
+    replica.healthy = True
+    replica.synced_at = time.time()
+    return replicas, replica
+
+
+def _database(replicas):
+    database = Database()
+    database.pool = Mock()
+    database.pool.acquire = AsyncMock(return_value=_conn("primary"))
+    database.pool.release = AsyncMock()
+    database.replicas = replicas
+    return database
+
+
+class _Repo:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @read_only
+    async def list_things(self):
+        return await self.conn.fetch("SELECT 1")
+
+    async def insert_thing(self):
+        return await self.conn.fetch("INSERT ... RETURNING 1")
+
+
+@pytest.mark.asyncio
+async def test_read_only_methods_use_replica_until_request_writes():
+    replicas, _ = _replica_set()
+    database = _database(replicas)
+
+    with patch("app.core.replicas.cache") as mock_cache:
+        mock_cache.get = AsyncMock(return_value=None)
+        mock_cache.set = AsyncMock()
+
+        async with database.lazy_connection(T1, session=SESSION) as conn:
+            repo = _Repo(conn)
+            assert await repo.list_things() == ["replica"]
+            assert not conn.acquired
+
+            assert await repo.insert_thing() == ["primary"]
+            # After a write the request stays on the primary
+            assert await repo.list_things() == ["primary"]
+
+        mock_cache.set.assert_awaited_once()
+        assert mock_cache.set.await_args.args[0] == f"last_write:{SESSION}"
+
+
+@pytest.mark.asyncio
+async def test_session_reads_its_own_writes_from_primary():
+    replicas, replica = _replica_set()
+    database = _database(replicas)
+    replica.synced_at = time.time() - 1
+
+    with patch("app.core.replicas.cache") as mock_cache:
+        mock_cache.get = AsyncMock(return_value=repr(time.time()))
+
+        async with database.lazy_connection(T1, session=SESSION) as conn:
+            assert await _Repo(conn).list_things() == ["primary"]
+
+    assert replicas.fallbacks == 1
+
+
+@pytest.mark.asyncio
+async def test_anonymous_and_lagging_reads_use_primary():
+    replicas, replica = _replica_set()
+    database = _database(replicas)
+
+    async with database.lazy_connection(T1) as conn:
+        assert await _Repo(conn).list_things() == ["primary"]
+
+    replica.synced_at = time.time() - 60
+    async with database.lazy_connection(T1, session=SESSION) as conn:
+        assert await _Repo(conn).list_things() == ["primary"]
+
+
+@pytest.mark.asyncio
+async def test_lag_check_tracks_replayed_primary_position():
+    replicas, replica = _replica_set()
+    replica.synced_at = 0.0
+
+    primary_conn = _conn("primary")
+    primary = Mock()
+    primary.acquire = Mock(return_value=AsyncMock(
+        __aenter__=AsyncMock(return_value=primary_conn),
+        __aexit__=AsyncMock(return_value=False),
+    ))
+    replica_conn = _conn("replica")
+    replica.pool.acquire = Mock(return_value=AsyncMock(
+        __aenter__=AsyncMock(return_value=replica_conn),
+        __aexit__=AsyncMock(return_value=False),
+    ))
+
+    primary_conn.fetchval = AsyncMock(return_value=100)
+    replica_conn.fetchval = AsyncMock(return_value=50)
+    await replicas.check(primary)
+    assert replica.synced_at == 0.0
+    assert replica.lag_bytes == 50
+
+    primary_conn.fetchval = AsyncMock(return_value=200)
+    replica_conn.fetchval = AsyncMock(return_value=150)
+    await replicas.check(primary)
+    # Caught up with the first sample but not the second
+    assert replica.synced_at == replicas._samples[0][0]
+    assert replica.lag_bytes == 50
+
+
+@pytest.mark.asyncio
+async def test_write_markers_of_idle_sessions_are_pruned():
+    replicas, _ = _replica_set()
+
+    with patch("app.core.replicas.cache") as mock_cache, patch("app.core.replicas.time") as clock:
+        mock_cache.set = AsyncMock()
+        clock.time = Mock(return_value=1000.0)
+        for i in range(100):
+            await replicas.note_write(f"{T1}:user{i}")  # never read again
+        assert len(replicas._local_writes) == 100
+
+        clock.time = Mock(return_value=1000.0 + replicas.max_lag_seconds + 2)
+        await replicas.note_write(SESSION)
+
+    assert list(replicas._local_writes) == [SESSION]
+
+
+@pytest.mark.asyncio
+async def test_lag_sample_is_timestamped_before_reading_the_primary_lsn():
+    replicas, replica = _replica_set()
+    replica.synced_at = 0.0
+    now = [1000.0]
+
+    async def primary_lsn(sql):
+        # A write commits (and is marked) after this LSN was read, while
+        # the sample is still being taken
+        now[0] = 1001.0
+        return 100
+
+    primary_conn = _conn("primary")
+    primary_conn.fetchval = AsyncMock(side_effect=primary_lsn)
+    primary = Mock()
+    primary.acquire = Mock(return_value=AsyncMock(
+        __aenter__=AsyncMock(return_value=primary_conn),
+        __aexit__=AsyncMock(return_value=False),
+    ))
+    replica_conn = _conn("replica")
+    replica_conn.fetchval = AsyncMock(return_value=100)  # replayed only that LSN
+    replica.pool.acquire = Mock(return_value=AsyncMock(
+        __aenter__=AsyncMock(return_value=replica_conn),
+        __aexit__=AsyncMock(return_value=False),
+    ))
+
+    with patch("app.core.replicas.time") as clock, patch("app.core.replicas.cache") as mock_cache:
+        clock.time = Mock(side_effect=lambda: now[0])
+        await replicas.check(primary)
+        mock_cache.get = AsyncMock(return_value=repr(1000.5))
+
+        assert replica.synced_at == 1000.0
+        assert await replicas.pick(SESSION) is None  # not caught up with the write
+
+
+@pytest.mark.asyncio
+async def test_write_marker_is_published_before_the_response_is_sent():
+    from types import SimpleNamespace
+
+    from fastapi import Depends, FastAPI
+
+    from app.dependencies import database as database_dependency
+    from app.dependencies.auth_context import get_auth_context
+    from app.dependencies.database import get_tenant_db_connection
+
+    replicas, _ = _replica_set()
+    database = _database(replicas)
+    events = []
+
+    api = FastAPI()
+
+    @api.post("/things")
+    async def create_thing(conn=Depends(get_tenant_db_connection, scope="function")):
+        await conn.execute("INSERT INTO things DEFAULT VALUES")
+        return {"ok": True}
+
+    api.dependency_overrides[get_auth_context] = lambda: SimpleNamespace(tenant_id=T1, user_id="user")
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        events.append(message["type"])
+
+    async def note_write(session):
+        events.append(f"note_write:{session}")
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/things", "raw_path": b"/things", "root_path": "",
+        "query_string": b"", "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+    with patch.object(database_dependency, "db", database), patch.object(
+        replicas, "note_write", side_effect=note_write
+    ):
+        await api(scope, receive, send)
+
+    assert events == [f"note_write:{SESSION}", "http.response.start", "http.response.body"]
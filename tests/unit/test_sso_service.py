@@ -50,5 +50,5 @@ async def test_sso_create_masks_only_on_list():
     assert out.config["client_secret"] == "SUPER_SECRET_VALUE_123"
 
     # List → should return masked
-    listed = await svc.list_providers()
+    listed, _ = await svc.list_providers()
     assert listed[0].config["client_secret"] == "********"
@@ -0,0 +1,104 @@
+# tests/unit/test_statements.py
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+from app.core.statements import Query, StatementRegistry
+
+
+def _connection():
+    conn = Mock(spec=["prepare", "fetch"])
+    conn.fetch = AsyncMock(return_value=["adhoc"])
+
+    async def prepare(sql):
+        stmt = Mock()
+        stmt.sql = sql
+        stmt.fetch = AsyncMock(return_value=["prepared"])
+        stmt.fetchval = AsyncMock(return_value=1)
+        stmt.get_statusmsg = Mock(return_value="UPDATE 1")
+        return stmt
+
+    conn.prepare = AsyncMock(side_effect=prepare)
+    return conn
+
+
+@pytest.mark.asyncio
+async def test_registered_queries_prepared_at_init_and_reused():
+    registry = StatementRegistry(per_connection_limit=10)
+    q = registry.define("t.list", "SELECT 1")
+    assert isinstance(q, Query) and q == "SELECT 1" and q.name == "t.list"
+
+    conn = _connection()
+    await registry.prepare_all(conn)
+    conn.prepare.assert_awaited_once_with("SELECT 1")
+
+    assert await registry.run(conn, "fetch", q, (), {}) == ["prepared"]
+    assert await registry.run(conn, "fetch", q, (), {}) == ["prepared"]
+    conn.prepare.assert_awaited_once()
+    conn.fetch.assert_not_awaited()
+
+    stats = registry.stats()
+    assert stats["statements"]["t.list"]["hits"] == 2
+    assert stats["misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_execute_returns_status_and_miss_prepares_on_demand():
+    registry = StatementRegistry(per_connection_limit=10)
+    q = registry.define("t.update", "UPDATE t SET x = $1")
+    conn = _connection()
+
+    assert await registry.run(conn, "execute", q, (1,), {}) == "UPDATE 1"
+    assert registry.stats()["statements"]["t.update"]["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_per_connection_lru_evicts_and_counts():
+    registry = StatementRegistry(per_connection_limit=1)
+    a = registry.define("t.a", "SELECT 'a'")
+    b = registry.define("t.b", "SELECT 'b'")
+    conn = _connection()
+
+    await registry.run(conn, "fetch", a, (), {})
+    await registry.run(conn, "fetch", b, (), {})
+
+    assert registry.stats()["statements"]["t.a"]["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_adhoc_sql_passes_through_and_is_tallied():
+    registry = StatementRegistry(per_connection_limit=10)
+    conn = _connection()
+
+    assert await registry.run(conn, "fetch", "SELECT 2", (), {}) == ["adhoc"]
+    assert await registry.run(conn, "fetch", "SELECT   2", (), {}) == ["adhoc"]
+
+    stats = registry.stats()
+    assert stats["adhoc_executions"] == 2
+    assert stats["adhoc_distinct"] == 1
+
+
+def test_redefining_with_different_sql_is_rejected():
+    registry = StatementRegistry(per_connection_limit=10)
+    registry.define("t.a", "SELECT 1")
+    registry.define("t.a", "SELECT 1")
+    with pytest.raises(ValueError):
+        registry.define("t.a", "SELECT 2")
+
+
+@pytest.mark.asyncio
+async def test_update_user_profile_uses_one_statement_for_any_field_set():
+    from app.modules.users.repository import UserRepository, _UPDATE_USER_PROFILE
+
+    conn = Mock()
+    conn.fetchrow = AsyncMock(return_value={"user_id": "u"})
+    repo = UserRepository(conn)
+    user_id = uuid4()
+
+    await repo.update_user_profile(user_id, display_name="A")
+    await repo.update_user_profile(user_id, locale="fr", timezone="UTC")
+
+    sqls = {call.args[0] for call in conn.fetchrow.await_args_list}
+    assert sqls == {_UPDATE_USER_PROFILE}
+    assert conn.fetchrow.await_args_list[1].args[1:] == (user_id, None, "fr", "UTC")
@@ -0,0 +1,121 @@
+# tests/unit/test_streaming.py
+
+import ipaddress
+import json
+import pytest
+from datetime import datetime, timezone
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from app.core.database import Database
+from app.core.query_log import query_metrics, statement_key
+from app.core.streaming import ndjson_chunks, ndjson_response, wants_ndjson
+from app.modules.users.service import UserService
+
+T1 = "11111111-1111-1111-1111-111111111111"
+
+
+class _Cursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __aiter__(self):
+        return self._gen()
+
+    async def _gen(self):
+        for row in self.rows:
+            yield row
+
+
+async def _rows(items):
+    for item in items:
+        yield item
+
+
+def _request(accept):
+    request = Mock()
+    request.headers = {"accept": accept} if accept is not None else {}
+    return request
+
+
+def test_ndjson_is_opt_in_via_accept():
+    assert wants_ndjson(_request("application/x-ndjson"))
+    assert wants_ndjson(_request("application/json;q=0.5, application/x-ndjson"))
+    assert not wants_ndjson(_request("application/json"))
+    assert not wants_ndjson(_request(None))
+
+
+@pytest.mark.asyncio
+async def test_first_row_flushed_alone_then_chunked():
+    user_id = uuid4()
+    items = [
+        {"n": i, "id": user_id, "at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+         "ip": ipaddress.ip_address("10.0.0.1")}
+        for i in range(5)
+    ]
+
+    chunks = [c async for c in ndjson_chunks(_rows(items), chunk_rows=2)]
+
+    assert [c.count(b"\n") for c in chunks] == [1, 2, 2]
+    first = json.loads(chunks[0])
+    assert first == {"n": 0, "id": str(user_id), "at": "2026-01-01T00:00:00+00:00", "ip": "10.0.0.1"}
+
+
+@pytest.mark.asyncio
+async def test_cursor_runs_inside_request_transaction():
+    raw = Mock()
+    raw.execute = AsyncMock(return_value="SELECT 1")
+    raw.cursor = Mock(return_value=_Cursor([{"a": 1}, {"a": 2}]))
+    database = Database()
+    database.pool = Mock()
+    database.pool.acquire = AsyncMock(return_value=raw)
+    database.pool.release = AsyncMock()
+
+    async with database.lazy_connection(T1) as conn:
+        got = [r async for r in conn.cursor("SELECT a", prefetch=50)]
+
+    assert got == [{"a": 1}, {"a": 2}]
+    raw.cursor.assert_called_once_with("SELECT a", prefetch=50)
+    # BEGIN (with tenant context) precedes the cursor, COMMIT follows it
+    assert raw.execute.await_args_list[0].args[0].startswith("BEGIN;")
+    assert raw.execute.await_args_list[-1].args[0] == "COMMIT"
+    assert query_metrics.stats()["top_by_total_time"][statement_key("SELECT a")]["rows"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_stream_users_projects_fields():
+    tenant_id = uuid4()
+    record = {
+        "user_id": uuid4(), "email": "a@firm.com", "display_name": "A",
+        "tenant_id": tenant_id, "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        "roles": None, "permissions": None, "persona": None, "tenant_email": "a@firm.com",
+    }
+    conn = Mock()
+    conn.cursor = Mock(return_value=_Cursor([record]))
+    service = UserService(conn, tenant_id=tenant_id)
+
+    rows = [r async for r in service.stream_users(fields={"email", "user_id"})]
+
+    assert rows == [{"email": "a@firm.com", "user_id": record["user_id"]}]
+    args = conn.cursor.call_args.args
+    # no limit, and roles/permissions not resolved for this projection
+    assert args[4] is None and args[5] is False
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_releases_its_own_connection_after_the_body():
+    conn = Mock()
+    conn.release = AsyncMock()
+
+    response = ndjson_response(_rows([{"a": 1}, {"a": 2}]), conn=conn)
+    body = [chunk async for chunk in response.body_iterator]
+
+    assert b"".join(body) == b'{"a":1}\n{"a":2}\n'
+    conn.release.assert_awaited_once_with()
+
+    conn.release.reset_mock()
+    response = ndjson_response(_rows([{"a": 1}, {"a": 2}]), conn=conn)
+    iterator = response.body_iterator
+    await iterator.__anext__()
+    await iterator.aclose()  # client went away
+    conn.release.assert_awaited_once_with(rollback=True)
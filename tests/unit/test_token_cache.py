@@ -0,0 +1,65 @@
+# tests/unit/test_token_cache.py
+
+import time
+from unittest.mock import patch
+
+from jose import jwt
+
+from app.core.security import (
+    VerifiedTokenCache,
+    create_access_token,
+    decode_token,
+    hash_access_token,
+    verified_token_cache,
+)
+
+
+def test_decode_token_verifies_signature_once_then_serves_cache():
+    verified_token_cache.clear()
+    token = create_access_token({"sub": "u1", "tid": "t1"})
+
+    with patch("app.core.security.jwt.decode", wraps=jwt.decode) as mock_decode:
+        first = decode_token(token)
+        second = decode_token(token)
+
+    assert first["sub"] == second["sub"] == "u1"
+    assert mock_decode.call_count == 1
+    stats = verified_token_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+    # Mutating a returned payload must not leak into the cache
+    second["tenant_id"] = "x"
+    assert "tenant_id" not in decode_token(token)
+
+
+def test_entries_expire_at_exp_and_can_be_evicted():
+    cache = VerifiedTokenCache(max_size=10)
+    cache.put("expired", {"sub": "u", "exp": time.time() - 1})
+    cache.put("live", {"sub": "u", "exp": time.time() + 60})
+
+    assert cache.get("expired") is None
+    assert cache.get("live") is not None
+
+    cache.evict("live")
+    assert cache.get("live") is None
+
+
+def test_lru_bound_drops_least_recently_used():
+    cache = VerifiedTokenCache(max_size=2)
+    exp = time.time() + 60
+    cache.put("a", {"exp": exp})
+    cache.put("b", {"exp": exp})
+    cache.get("a")
+    cache.put("c", {"exp": exp})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_invalid_tokens_are_not_cached():
+    verified_token_cache.clear()
+    assert decode_token("not.a.jwt") is None
+    assert verified_token_cache.stats()["size"] == 0
+    assert verified_token_cache.get(hash_access_token("not.a.jwt")) is None
@@ -0,0 +1,62 @@
+# tests/unit/test_token_revocation.py
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock, patch
+
+from app.core.security import hash_access_token
+from app.modules.auth.revocation import TokenRevocationStore
+
+
+@pytest.mark.asyncio
+async def test_revoke_writes_postgres_and_redis_with_exp_ttl():
+    store = TokenRevocationStore()
+    conn = Mock()
+    conn.execute = AsyncMock()
+
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=10)
+
+    with patch("app.modules.auth.revocation.cache") as mock_cache:
+        mock_cache.set = AsyncMock()
+        await store.revoke(conn, "digest123", expires_at, tenant_id="t", user_id="u")
+
+        conn.execute.assert_awaited_once()
+        args = conn.execute.call_args.args
+        assert args[1] == "digest123"
+
+        key, value = mock_cache.set.call_args.args
+        ttl = mock_cache.set.call_args.kwargs["ttl"]
+        assert key == "revoked:digest123"
+        assert 590 <= ttl <= 600
+
+
+@pytest.mark.asyncio
+async def test_is_token_revoked_answers_from_redis_by_digest():
+    store = TokenRevocationStore()
+    conn = Mock()
+    conn.fetchrow = AsyncMock()
+
+    with patch("app.modules.auth.revocation.cache") as mock_cache:
+        mock_cache.exists = AsyncMock(return_value=True)
+        assert await store.is_token_revoked("some.jwt.token", conn=conn) is True
+
+        mock_cache.exists.assert_awaited_once_with(
+            "revoked:" + hash_access_token("some.jwt.token")
+        )
+        conn.fetchrow.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_is_revoked_falls_back_to_postgres_when_redis_down():
+    store = TokenRevocationStore()
+    conn = Mock()
+    conn.fetchrow = AsyncMock(return_value={"?column?": 1})
+
+    with patch("app.modules.auth.revocation.cache") as mock_cache:
+        mock_cache.exists = AsyncMock(side_effect=ConnectionError("down"))
+        assert await store.is_revoked("digest123", conn=conn) is True
+
+        sql, jti = conn.fetchrow.call_args.args
+        assert "WHERE jti = $1" in sql
+        assert "crypt(" not in sql
+        assert jti == "digest123"
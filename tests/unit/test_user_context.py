@@ -0,0 +1,52 @@
+# tests/unit/test_user_context.py
+
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from app.modules.users.repository import UserRepository
+
+
+def _row(user_tenant_id, permissions):
+    return {
+        "user_id": uuid4(),
+        "email": "a@b.com",
+        "display_name": "A",
+        "tenant_id": uuid4(),
+        "tenant_name": "T",
+        "user_tenant_id": user_tenant_id,
+        "roles": ["member"],
+        "permissions": permissions,
+        "persona": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_user_context_reads_effective_permission_store():
+    conn = Mock()
+    conn.fetchrow = AsyncMock(return_value=_row(uuid4(), ["user.read"]))
+    conn.execute = AsyncMock()
+
+    ctx = await UserRepository(conn).get_user_context(uuid4(), uuid4())
+
+    assert ctx.permissions == ["user.read"]
+    sql = conn.fetchrow.call_args.args[0]
+    assert "user_effective_permissions" in sql
+    assert "ARRAY_AGG" not in sql
+    conn.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_user_context_builds_missing_entry():
+    user_tenant_id = uuid4()
+    conn = Mock()
+    conn.fetchrow = AsyncMock(return_value=_row(user_tenant_id, None))
+    conn.execute = AsyncMock()
+    conn.fetchval = AsyncMock(return_value=["role.read"])
+
+    ctx = await UserRepository(conn).get_user_context(uuid4(), uuid4())
+
+    assert ctx.permissions == ["role.read"]
+    sql, arg = conn.execute.call_args.args
+    assert "refresh_user_effective_permissions" in sql
+    assert arg == user_tenant_id
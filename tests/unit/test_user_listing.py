@@ -0,0 +1,95 @@
+# tests/unit/test_user_listing.py
+
+import pytest
+from datetime import datetime, timezone
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from fastapi import HTTPException
+
+from app.core.pagination import PageParams, decode_cursor, encode_cursor, parse_fields
+from app.modules.users.schemas import UserResponse
+from app.modules.users.service import UserService
+
+
+def _row(tenant_id, i):
+    return {
+        "user_id": uuid4(),
+        "email": f"u{i}@firm.com",
+        "display_name": f"U{i}",
+        "tenant_id": tenant_id,
+        "tenant_email": f"u{i}@firm.com",
+        "persona": None,
+        "tenant_status": "active",
+        "is_verified": True,
+        "mfa_enabled": False,
+        "created_at": datetime(2026, 1, 1, 0, 0, i, tzinfo=timezone.utc),
+        "updated_at": None,
+        "roles": ["member", "paralegal"],
+        "permissions": ["user.read"],
+    }
+
+
+def _service(rows):
+    tenant_id = rows[0]["tenant_id"] if rows else uuid4()
+    conn = Mock()
+    conn.fetch = AsyncMock(return_value=rows)
+    return UserService(conn, tenant_id=tenant_id), conn
+
+
+@pytest.mark.asyncio
+async def test_list_users_is_one_statement_per_page():
+    tenant_id = uuid4()
+    rows = [_row(tenant_id, i) for i in range(3)]
+    service, conn = _service(rows)
+
+    users, next_cursor = await service.list_users(PageParams(limit=2))
+
+    conn.fetch.assert_awaited_once()
+    args = conn.fetch.call_args.args
+    assert args[1:] == (tenant_id, None, None, 3, True)
+    assert [u.email for u in users] == ["u0@firm.com", "u1@firm.com"]
+    assert users[0].roles == ["member", "paralegal"]
+    assert decode_cursor(next_cursor, (datetime.fromisoformat, type(rows[1]["user_id"]))) == (
+        rows[1]["created_at"],
+        rows[1]["user_id"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_users_continues_from_cursor_and_ends():
+    tenant_id = uuid4()
+    rows = [_row(tenant_id, 5)]
+    service, conn = _service(rows)
+    anchor_ts, anchor_id = datetime(2026, 1, 1, tzinfo=timezone.utc), uuid4()
+
+    users, next_cursor = await service.list_users(
+        PageParams(limit=2, cursor=encode_cursor(anchor_ts, anchor_id))
+    )
+
+    assert conn.fetch.call_args.args[2:4] == (anchor_ts, anchor_id)
+    assert len(users) == 1
+    assert next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_projection_without_access_fields_skips_role_resolution():
+    tenant_id = uuid4()
+    row = _row(tenant_id, 1)
+    row["roles"], row["permissions"] = [], []
+    service, conn = _service([row])
+
+    await service.list_users(fields={"user_id", "email"})
+
+    assert conn.fetch.call_args.args[-1] is False
+
+
+def test_bad_cursor_and_unknown_fields_are_rejected():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor", (datetime.fromisoformat,))
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        parse_fields("email,password", UserResponse)
+    assert exc.value.status_code == 400
+    assert parse_fields("email, roles", UserResponse) == {"email", "roles"}